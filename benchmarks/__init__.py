@@ -0,0 +1,43 @@
+"""
+Standalone performance benchmarks.
+
+Every module in this package is runnable with ``python -m benchmarks.<name>``
+from the project root. They work on a throw-away SQLite database, so they
+never touch ``db.sqlite3``.
+"""
+import os
+import statistics
+import tempfile
+import time
+
+
+def setup_django(db_name=None, migrate=True):
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings')
+    os.environ.setdefault('SECRET_KEY', 'benchmark')
+
+    import django
+    from django.conf import settings
+    from django.core.management import call_command
+    from django.test.utils import setup_test_environment
+
+    if db_name is None:
+        db_name = os.path.join(tempfile.mkdtemp(prefix='lookedu-bench-'), 'bench.sqlite3')
+    from config.db import sqlite_databases
+
+    settings.DATABASES.update(sqlite_databases(db_name, settings.DATABASE_PROFILE))
+
+    django.setup()
+    setup_test_environment()
+    if migrate:
+        call_command('migrate', verbosity=0)
+    return db_name
+
+
+def measure(func, repeat=20):
+    """ Runs ``func`` ``repeat`` times and returns the median wall time in ms. """
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append((time.perf_counter() - start) * 1000)
+    return statistics.median(timings)
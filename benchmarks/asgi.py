@@ -0,0 +1,153 @@
+"""
+Read endpoints under gunicorn (WSGI, threads) and uvicorn (ASGI), with and
+without the async read views, driven by a keep-alive HTTP client at high
+concurrency. Reports requests/s and latency percentiles.
+
+The servers are not project dependencies, install them first:
+
+    pip install gunicorn uvicorn
+    python -m benchmarks.asgi --concurrency 64 --duration 10
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+from benchmarks import setup_django
+
+SETTINGS = '''
+from config.settings import *  # noqa: F401,F403
+
+DATABASES['default']['NAME'] = {db_name!r}
+SECURE_SSL_REDIRECT = False
+'''
+
+SERVERS = {
+    'gunicorn threads': (['gunicorn', 'config.wsgi', '--workers', '{workers}', '--threads', '{threads}',
+                          '--bind', '127.0.0.1:{port}'], {}),
+    'uvicorn': (['uvicorn', 'config.asgi:application', '--workers', '{workers}', '--port', '{port}',
+                 '--no-access-log'], {'ASYNC_READ_VIEWS': 'False'}),
+    'uvicorn async views': (['uvicorn', 'config.asgi:application', '--workers', '{workers}', '--port', '{port}',
+                             '--no-access-log'], {'ASYNC_READ_VIEWS': 'True'}),
+}
+
+
+def seed():
+    """ Creates the benchmark user, some centers, courses and applications; returns an access token. """
+    from learning_centers.models import Application, Courses, Educenters
+    from rest_framework_simplejwt.tokens import AccessToken
+    from users_control.models import CustomUser
+
+    user = CustomUser.objects.create_user(username='student', password='pass12345', phone_number='+998900000000')
+    courses = Courses.objects.bulk_create(Courses(title=f'Course {i}', slug=f'course-{i}') for i in range(20))
+    centers = Educenters.objects.bulk_create(
+        Educenters(name=f'Center {i}', slug=f'center-{i}', info='Benchmark center', cost=100 + i) for i in range(200)
+    )
+    for center in centers[:20]:
+        center.courses.set(courses[:5])
+    Application.objects.bulk_create(
+        Application(owner=user, center=centers[i % 20], course=courses[i % 5], index=i, content='Call me')
+        for i in range(100)
+    )
+    return str(AccessToken.for_user(user))
+
+
+async def client(host, port, requests, token, deadline, latencies):
+    """ One keep-alive connection sending the ``requests`` paths round-robin until ``deadline``. """
+    reader, writer = await asyncio.open_connection(host, port)
+    headers = f'Host: localhost\r\nAuthorization: Bearer {token}\r\nAccept: application/json\r\n\r\n'
+    i = 0
+    try:
+        while time.perf_counter() < deadline:
+            started = time.perf_counter()
+            writer.write(f'GET {requests[i % len(requests)]} HTTP/1.1\r\n{headers}'.encode())
+            status = (await reader.readline()).split()[1]
+            length = 0
+            while (line := await reader.readline()) != b'\r\n':
+                name, _, value = line.partition(b':')
+                if name.lower() == b'content-length':
+                    length = int(value)
+            await reader.readexactly(length)
+            assert status == b'200', status
+            latencies.append(time.perf_counter() - started)
+            i += 1
+    finally:
+        writer.close()
+
+
+async def load(port, paths, token, concurrency, duration):
+    latencies = []
+    deadline = time.perf_counter() + duration
+    await asyncio.gather(*(
+        client('127.0.0.1', port, paths[n % len(paths):] + paths[:n % len(paths)], token, deadline, latencies)
+        for n in range(concurrency)
+    ))
+    return latencies
+
+
+def wait_for(port, timeout=30):
+    import socket
+
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            socket.create_connection(('127.0.0.1', port), timeout=1).close()
+            return
+        except OSError:
+            time.sleep(0.2)
+    raise RuntimeError(f'server on port {port} did not start')
+
+
+def run(name, args, env, token):
+    command, extra_env = SERVERS[name]
+    command = [part.format(workers=args.workers, threads=args.threads, port=args.port) for part in command]
+    server = subprocess.Popen(command, env={**env, **extra_env}, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    try:
+        wait_for(args.port)
+        asyncio.run(load(args.port, args.paths, token, args.concurrency, 1))  # warm up
+        latencies = asyncio.run(load(args.port, args.paths, token, args.concurrency, args.duration))
+    finally:
+        server.terminate()
+        server.wait()
+
+    latencies.sort()
+    p99 = latencies[int(len(latencies) * 0.99) - 1]
+    print(f'{name:>20} {len(latencies) / args.duration:>8.0f} {statistics.median(latencies) * 1000:>8.1f} '
+          f'{p99 * 1000:>8.1f}')
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--paths', nargs='+', default=['/api/educenters/', '/api/my-applications/', '/api/me/'])
+    parser.add_argument('--concurrency', type=int, default=64)
+    parser.add_argument('--duration', type=float, default=10)
+    parser.add_argument('--workers', type=int, default=1)
+    parser.add_argument('--threads', type=int, default=8)
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--servers', nargs='+', choices=SERVERS, default=list(SERVERS))
+    args = parser.parse_args()
+
+    db_name = setup_django()
+    token = seed()
+
+    settings_dir = tempfile.mkdtemp(prefix='lookedu-bench-')
+    with open(os.path.join(settings_dir, 'bench_settings.py'), 'w') as f:
+        f.write(SETTINGS.format(db_name=db_name))
+    env = {
+        **os.environ,
+        'DJANGO_SETTINGS_MODULE': 'bench_settings',
+        'PYTHONPATH': os.pathsep.join([settings_dir, os.getcwd(), os.environ.get('PYTHONPATH', '')]),
+        'PATH': os.pathsep.join([os.path.dirname(sys.executable), os.environ.get('PATH', '')]),
+    }
+
+    print(f'{"server":>20} {"req/s":>8} {"p50 ms":>8} {"p99 ms":>8}')
+    for name in args.servers:
+        run(name, args, env, token)
+
+
+if __name__ == '__main__':
+    main()
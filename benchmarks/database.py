@@ -0,0 +1,120 @@
+"""
+Mixed read/write load on the plain and the tuned SQLite profile (see
+config/db.py): threads reading the center list and a center page, a share
+of them submitting applications. Reports reads/s, writes/s, p99 latency
+and "database is locked" errors.
+
+    python -m benchmarks.database --threads 16 --write-ratio 0.2 --duration 10
+"""
+import argparse
+import os
+import random
+import subprocess
+import sys
+import threading
+import time
+
+from benchmarks import setup_django
+
+PROFILES = ('default', 'tuned')
+
+
+def seed():
+    from learning_centers.models import Courses, Educenters
+    from users_control.models import CustomUser
+
+    students = CustomUser.objects.bulk_create(
+        CustomUser(username=f'student-{i}', phone_number=f'+99890{i:07d}') for i in range(100)
+    )
+    courses = Courses.objects.bulk_create(Courses(title=f'Course {i}', slug=f'course-{i}') for i in range(20))
+    centers = Educenters.objects.bulk_create(
+        Educenters(name=f'Center {i}', slug=f'center-{i}', info='Benchmark center', cost=100 + i) for i in range(500)
+    )
+    for center in centers[:50]:
+        center.courses.set(courses[:5])
+    return [s.id for s in students], [c.id for c in centers[:50]], [c.id for c in courses[:5]]
+
+
+def worker(seed_ids, write_ratio, deadline, results, n):
+    from django.db import OperationalError, connections, transaction
+
+    from learning_centers.models import Application, Educenters
+
+    students, centers, courses = seed_ids
+    rng = random.Random(n)
+    reads, writes, errors, latencies = 0, 0, 0, []
+    try:
+        while time.perf_counter() < deadline:
+            started = time.perf_counter()
+            try:
+                if rng.random() < write_ratio:
+                    with transaction.atomic():
+                        Application.objects.create(
+                            owner_id=rng.choice(students), center_id=rng.choice(centers),
+                            course_id=rng.choice(courses), content='Call me',
+                        )
+                    writes += 1
+                else:
+                    list(Educenters.objects.order_by('-id').values('id', 'name', 'slug', 'cost')[:20])
+                    center = Educenters.objects.prefetch_related('courses').get(id=rng.choice(centers))
+                    list(center.courses.all())
+                    reads += 1
+            except OperationalError:
+                errors += 1
+                continue
+            latencies.append(time.perf_counter() - started)
+    finally:
+        connections.close_all()
+    results.append((reads, writes, errors, latencies))
+
+
+def run(args):
+    """ Runs the load on the profile in ``DATABASE_PROFILE`` and prints one result line. """
+    setup_django()
+    seed_ids = seed()
+
+    from django.db import connections
+    connections.close_all()
+
+    results = []
+    deadline = time.perf_counter() + args.duration
+    threads = [
+        threading.Thread(target=worker, args=(seed_ids, args.write_ratio, deadline, results, n))
+        for n in range(args.threads)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    reads, writes, errors = (sum(result[i] for result in results) for i in range(3))
+    latencies = sorted(latency for result in results for latency in result[3])
+    p99 = latencies[int(len(latencies) * 0.99) - 1] if latencies else float('nan')
+    print(f'{os.environ["DATABASE_PROFILE"]:>8} {reads / args.duration:>8.0f} {writes / args.duration:>8.0f} '
+          f'{p99 * 1000:>8.1f} {errors:>7}')
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--threads', type=int, default=16)
+    parser.add_argument('--write-ratio', type=float, default=0.2)
+    parser.add_argument('--duration', type=float, default=10)
+    parser.add_argument('--profile', choices=PROFILES, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.profile:
+        run(args)
+        return
+
+    print(f'{"profile":>8} {"reads/s":>8} {"writes/s":>8} {"p99 ms":>8} {"locked":>7}')
+    for profile in PROFILES:
+        # settings pick the profile up at import time, every profile gets a fresh process
+        subprocess.run(
+            [sys.executable, '-m', 'benchmarks.database', '--profile', profile, '--threads', str(args.threads),
+             '--write-ratio', str(args.write_ratio), '--duration', str(args.duration)],
+            env={**os.environ, 'DATABASE_PROFILE': profile}, check=True,
+        )
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,83 @@
+"""
+Streaming application export: time to first byte, total time and peak
+Python memory for growing result sets. Peak memory should stay flat.
+
+    python -m benchmarks.export --rows 10000 100000
+"""
+import argparse
+import time
+import tracemalloc
+
+from benchmarks import setup_django
+
+
+def seed(rows, center, course, students):
+    """ Tops the applications table up to ``rows`` rows. """
+    from learning_centers.models import Application
+
+    batch = 5000
+    for start in range(Application.objects.count(), rows, batch):
+        Application.objects.bulk_create(
+            Application(owner=students[i % len(students)], center=center, course=course, index=i,
+                        content='Please call me back in the evening')
+            for i in range(start, min(start + batch, rows))
+        )
+
+
+def export(owner, export_format):
+    """ Returns (first byte s, total s, bytes) of one export. """
+    from django.test import Client
+    from rest_framework_simplejwt.tokens import AccessToken
+
+    client = Client(HTTP_AUTHORIZATION=f'Bearer {AccessToken.for_user(owner)}')
+
+    started = time.perf_counter()
+    response = client.get('/api/received-applications/export/', {'format': export_format}, secure=True)
+
+    first_byte, size = None, 0
+    for chunk in response.streaming_content:
+        if first_byte is None:
+            first_byte = time.perf_counter() - started
+        size += len(chunk)
+    return first_byte, time.perf_counter() - started, size
+
+
+def peak_memory(owner, export_format):
+    """ Peak traced Python memory of one export, run apart since tracing slows it down several times. """
+    tracemalloc.start()
+    export(owner, export_format)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return peak
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', type=int, nargs='+', default=[10_000, 100_000])
+    args = parser.parse_args()
+
+    setup_django()
+
+    from learning_centers.models import Courses, Educenters
+    from users_control.models import CustomUser
+
+    owner = CustomUser.objects.create_user(username='owner', password='pass12345', phone_number='+998900000000')
+    center = Educenters.objects.create(name='Benchmark center', slug='benchmark', owner=owner)
+    course = Courses.objects.create(title='Math', slug='math')
+    students = CustomUser.objects.bulk_create(
+        CustomUser(username=f'student-{i}', phone_number=f'+99891{i:07d}', first_name='Student', last_name=str(i))
+        for i in range(1000)
+    )
+
+    print(f'{"rows":>8} {"format":>7} {"first byte ms":>14} {"total s":>8} {"peak MiB":>9} {"output MiB":>11}')
+    for rows in sorted(args.rows):
+        seed(rows, center, course, students)
+        for export_format in ('csv', 'ndjson'):
+            first_byte, total, size = export(owner, export_format)
+            peak = peak_memory(owner, export_format)
+            print(f'{rows:>8} {export_format:>7} {first_byte * 1000:>14.1f} {total:>8.2f} '
+                  f'{peak / 2 ** 20:>9.1f} {size / 2 ** 20:>11.1f}')
+
+
+if __name__ == '__main__':
+    main()
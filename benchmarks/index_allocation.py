@@ -0,0 +1,114 @@
+"""
+Concurrent Application creation with the legacy MAX(index) retry loop vs
+the sequence allocator.
+
+    python -m benchmarks.index_allocation --writers 8 --per-writer 200
+
+Every writer is a separate process with its own database connection. The
+run reports throughput, failed saves and whether any index was handed out
+twice.
+"""
+import argparse
+import multiprocessing
+import os
+import time
+
+from benchmarks import setup_django
+
+
+def legacy_save(application):
+    """ The pre-sequence Application.save: SELECT MAX(index) + 1 with 5 retries. """
+    from django.db import transaction, IntegrityError
+    from django.db.models import Max
+
+    from learning_centers.models import Application
+
+    for _ in range(5):
+        try:
+            with transaction.atomic():
+                max_index = Application.objects.aggregate(max_i=Max('index'))['max_i'] or 0
+                application.index = max_index + 1
+                return application.save_base()
+        except IntegrityError:
+            continue
+    raise IntegrityError('Could not assign a unique index after several retries')
+
+
+def writer(db_name, strategy, block_size, count, owner_id, center_id, course_id, start_event, results):
+    os.environ['APPLICATION_INDEX_BLOCK_SIZE'] = str(block_size)
+    setup_django(db_name, migrate=False)
+
+    from django.db import OperationalError, IntegrityError
+
+    from learning_centers.models import Application
+
+    start_event.wait()
+    failures = 0
+    for _ in range(count):
+        application = Application(owner_id=owner_id, center_id=center_id, course_id=course_id)
+        try:
+            if strategy == 'legacy':
+                legacy_save(application)
+            else:
+                application.save()
+        except (OperationalError, IntegrityError):
+            failures += 1
+    results.put(failures)
+
+
+def run(db_name, strategy, args):
+    from django.db import connections
+
+    from learning_centers.models import Educenters, Courses, Application, Sequence
+    from users_control.models import CustomUser
+
+    Application.objects.all().delete()
+    Sequence.objects.filter(name='application_index').update(value=0)
+    owner, _ = CustomUser.objects.get_or_create(username='bench', phone_number='+998900000000')
+    center, _ = Educenters.objects.get_or_create(name='Bench center')
+    course, _ = Courses.objects.get_or_create(title='Bench course')
+    connections.close_all()
+
+    context = multiprocessing.get_context('spawn')
+    start_event, results = context.Event(), context.Queue()
+    processes = [
+        context.Process(target=writer, args=(
+            db_name, strategy, args.block_size, args.per_writer, owner.id, center.id, course.id, start_event, results
+        ))
+        for _ in range(args.writers)
+    ]
+    for process in processes:
+        process.start()
+    time.sleep(2)  # let every writer finish booting Django
+
+    started = time.perf_counter()
+    start_event.set()
+    failures = sum(results.get() for _ in processes)
+    elapsed = time.perf_counter() - started
+    for process in processes:
+        process.join()
+
+    indexes = list(Application.objects.values_list('index', flat=True))
+    created = len(indexes)
+    collisions = created - len(set(indexes))
+    print(f'{strategy:>10} {created:>8} {failures:>8} {collisions:>10} {created / elapsed:>10.0f}')
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--writers', type=int, default=8)
+    parser.add_argument('--per-writer', type=int, default=200)
+    parser.add_argument('--block-size', type=int, default=1)
+    parser.add_argument('--strategy', choices=['legacy', 'sequence', 'both'], default='both')
+    args = parser.parse_args()
+
+    db_name = setup_django()
+
+    print(f'{args.writers} writers x {args.per_writer} applications, block size {args.block_size}')
+    print(f'{"strategy":>10} {"created":>8} {"failed":>8} {"collisions":>10} {"rows/s":>10}')
+    for strategy in (['legacy', 'sequence'] if args.strategy == 'both' else [args.strategy]):
+        run(db_name, strategy, args)
+
+
+if __name__ == '__main__':
+    main()
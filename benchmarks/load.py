@@ -0,0 +1,211 @@
+"""
+In-process load test: worker threads replay a weighted mix of JWT logins,
+center list/retrieve, course list and application submissions through
+Django's test client, then throughput and p50/p95/p99 are reported per
+endpoint.
+
+    python -m benchmarks.load                              # seeds a small database first
+    python -m benchmarks.load --db /tmp/lookedu.sqlite3    # reuses one from benchmarks.seed
+    python -m benchmarks.load --save-baseline              # stores the results as the new baseline
+
+Results are compared with the stored baseline (``benchmarks/baseline.json``
+by default, taken on a database seeded with ``benchmarks.seed``'s defaults). An endpoint whose p95 got more than ``--tolerance`` slower or
+whose throughput dropped by more than that is flagged, and the command
+exits with status 1.
+"""
+import argparse
+import json
+import os
+import random
+import statistics
+import threading
+import time
+from collections import defaultdict
+
+from benchmarks import setup_django
+from benchmarks.seed import PASSWORD, seed
+
+BASELINE = os.path.join(os.path.dirname(__file__), 'baseline.json')
+
+# endpoint: share of the requests
+MIX = {
+    'login': 2,
+    'centers-list': 35,
+    'center-retrieve': 30,
+    'courses-list': 20,
+    'application-create': 13,
+}
+
+
+class Worker:
+    """ One simulated user: logs in once, then sends requests from ``MIX`` until the deadline. """
+
+    def __init__(self, ids, seed):
+        from django.test import Client
+
+        self.ids = ids
+        self.rng = random.Random(seed)
+        self.username = f'user-{self.rng.randrange(len(ids["users"]))}'
+        self.client = Client()
+        self.latencies = defaultdict(list)
+        self.errors = defaultdict(int)
+
+    def login(self):
+        response = self.client.post(
+            '/api/token/', {'username': self.username, 'password': PASSWORD}, content_type='application/json', secure=True
+        )
+        if response.status_code == 200:
+            self.client.defaults['HTTP_AUTHORIZATION'] = f'Bearer {response.json()["access"]}'
+        return response
+
+    def request(self, endpoint):
+        if endpoint == 'login':
+            return self.login()
+        if endpoint == 'centers-list':
+            return self.client.get('/api/educenters/', {'page_size': self.rng.choice([10, 20, 50])}, secure=True)
+        if endpoint == 'center-retrieve':
+            return self.client.get(f'/api/educenters/center-{self.rng.randrange(len(self.ids["centers"]))}/', secure=True)
+        if endpoint == 'courses-list':
+            return self.client.get('/api/courses/', secure=True)
+
+        center_id, course_ids = self.rng.choice(self.center_items)
+        return self.client.post(
+            '/api/my-applications/', {'center_id': center_id, 'course_id': self.rng.choice(course_ids), 'content': 'Call me'},
+            content_type='application/json', secure=True,
+        )
+
+    def run(self, deadline):
+        from django.db import connections
+
+        self.center_items = list(self.ids['centers'].items())
+        endpoints, weights = list(MIX), list(MIX.values())
+        try:
+            self.login()
+            while time.perf_counter() < deadline:
+                endpoint = self.rng.choices(endpoints, weights)[0]
+                started = time.perf_counter()
+                response = self.request(endpoint)
+                elapsed = time.perf_counter() - started
+                if response.status_code >= 400:
+                    self.errors[endpoint] += 1
+                else:
+                    self.latencies[endpoint].append(elapsed)
+        finally:
+            connections.close_all()
+
+
+def percentile(values, q):
+    return values[min(len(values) - 1, int(len(values) * q))]
+
+
+def report(workers, duration):
+    latencies, errors = defaultdict(list), defaultdict(int)
+    for worker in workers:
+        for endpoint, values in worker.latencies.items():
+            latencies[endpoint] += values
+        for endpoint, count in worker.errors.items():
+            errors[endpoint] += count
+
+    results = {}
+    for endpoint in MIX:
+        values = sorted(latencies[endpoint])
+        if not values:
+            continue
+        results[endpoint] = {
+            'rps': round(len(values) / duration, 1),
+            'p50': round(statistics.median(values) * 1000, 2),
+            'p95': round(percentile(values, 0.95) * 1000, 2),
+            'p99': round(percentile(values, 0.99) * 1000, 2),
+            'errors': errors[endpoint],
+        }
+    return results
+
+
+def compare(results, baseline, tolerance):
+    """ Returns a message per endpoint that got slower or slower to serve than ``baseline`` allows. """
+    regressions = []
+    for endpoint, old in baseline.items():
+        new = results.get(endpoint)
+        if new is None:
+            regressions.append(f'{endpoint}: no successful requests')
+            continue
+        if new['p95'] > old['p95'] * (1 + tolerance):
+            regressions.append(f'{endpoint}: p95 {old["p95"]} -> {new["p95"]} ms')
+        if new['rps'] < old['rps'] * (1 - tolerance):
+            regressions.append(f'{endpoint}: throughput {old["rps"]} -> {new["rps"]} req/s')
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--db', help='database seeded by benchmarks.seed, a small one is seeded when missing')
+    parser.add_argument('--threads', type=int, default=4)
+    parser.add_argument('--duration', type=float, default=20)
+    parser.add_argument('--baseline', default=BASELINE)
+    parser.add_argument('--save-baseline', action='store_true')
+    parser.add_argument('--tolerance', type=float, default=0.25)
+    args = parser.parse_args()
+
+    # every simulated user comes from the same address, the throttles would
+    # turn most of the mix into 429s (benchmarks.throttle measures them)
+    os.environ.setdefault('THROTTLING', 'False')
+    if args.db:
+        setup_django(args.db)
+        from django.contrib.auth import get_user_model
+        from learning_centers.models import Application, Courses, Educenters
+
+        centers = {}
+        for center_id, course_id in Educenters.courses.through.objects.values_list('educenters_id', 'courses_id').iterator():
+            centers.setdefault(center_id, []).append(course_id)
+        ids = {
+            'users': list(get_user_model().objects.values_list('id', flat=True)),
+            'courses': list(Courses.objects.values_list('id', flat=True)),
+            'centers': dict(sorted(centers.items())),
+        }
+        scale = {
+            'users': len(ids['users']), 'centers': Educenters.objects.count(), 'applications': Application.objects.count(),
+        }
+    else:
+        setup_django()
+        ids = seed(users=1000, courses=100, centers=10_000, applications=100_000)
+        scale = {'users': 1000, 'centers': 10_000, 'applications': 100_000}
+
+    workers = [Worker(ids, n) for n in range(args.threads)]
+    deadline = time.perf_counter() + args.duration
+    threads = [threading.Thread(target=worker.run, args=(deadline, )) for worker in workers]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    results = report(workers, args.duration)
+    print(f'{"endpoint":>20} {"req/s":>7} {"p50 ms":>8} {"p95 ms":>8} {"p99 ms":>8} {"errors":>7}')
+    for endpoint, row in results.items():
+        print(f'{endpoint:>20} {row["rps"]:>7} {row["p50"]:>8} {row["p95"]:>8} {row["p99"]:>8} {row["errors"]:>7}')
+    total = sum(row['rps'] for row in results.values())
+    print(f'{"total":>20} {total:>7.1f}')
+
+    params = {'threads': args.threads, 'duration': args.duration, **scale}
+    if args.save_baseline:
+        with open(args.baseline, 'w') as f:
+            json.dump({'params': params, 'endpoints': results}, f, indent=2)
+            f.write('\n')
+        print(f'Saved the baseline to {args.baseline}')
+        return
+
+    if not os.path.exists(args.baseline):
+        return
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+    if baseline['params'] != params:
+        print(f'The baseline was taken with {baseline["params"]}, this run used {params}')
+    regressions = compare(results, baseline['endpoints'], args.tolerance)
+    for regression in regressions:
+        print(f'REGRESSION {regression}')
+    if regressions:
+        raise SystemExit(1)
+    print(f'No regressions against {args.baseline}')
+
+
+if __name__ == '__main__':
+    main()
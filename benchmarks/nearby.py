@@ -0,0 +1,90 @@
+"""
+"Centers near me" through the geohash cell ranges (learning_centers/geo.py)
+vs a naive scan computing the distance to every center.
+
+    python -m benchmarks.nearby --rows 100000
+"""
+import argparse
+import random
+
+from benchmarks import setup_django, measure
+
+
+# Most centers are in the cities, the rest anywhere in the country
+CITIES = [(41.3111, 69.2797, 0.6), (39.6542, 66.9597, 0.3), (40.7821, 72.3442, 0.3), (40.1039, 65.3739, 0.2)]
+COUNTRY = (37.2, 45.6, 56.0, 73.1)  # south, north, west, east
+
+
+def seed(rows):
+    from learning_centers import geo
+    from learning_centers.models import Educenters
+
+    rng = random.Random(1)
+    batch = 5000
+    for start in range(0, rows, batch):
+        centers = []
+        for i in range(start, min(start + batch, rows)):
+            if rng.random() < 0.8:
+                lat, lng, spread = rng.choice(CITIES)
+                lat, lng = lat + rng.gauss(0, spread / 4), lng + rng.gauss(0, spread / 4)
+            else:
+                south, north, west, east = COUNTRY
+                lat, lng = rng.uniform(south, north), rng.uniform(west, east)
+            centers.append(Educenters(name=f'Center {i}', slug=f'center-{i}', latitude=lat, longitude=lng,
+                                      geohash=geo.encode(lat, lng)))
+        Educenters.objects.bulk_create(centers)
+
+
+def scan(lat, lng, limit, radius_km=None):
+    """ Every center with a location, sorted by distance. """
+    from learning_centers import geo
+    from learning_centers.models import Educenters
+
+    rows = []
+    for row in Educenters.objects.exclude(latitude=None).values('slug', 'latitude', 'longitude'):
+        row['distance_km'] = geo.distance_km(lat, lng, row['latitude'], row['longitude'])
+        if radius_km is None or row['distance_km'] <= radius_km:
+            rows.append(row)
+    rows.sort(key=lambda row: row['distance_km'])
+    return rows[:limit]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', type=int, default=100_000)
+    parser.add_argument('--repeat', type=int, default=10)
+    args = parser.parse_args()
+
+    setup_django()
+
+    from django.db import connection
+
+    from learning_centers import geo
+    from learning_centers.models import Educenters
+
+    seed(args.rows)
+    with connection.cursor() as cursor:
+        cursor.execute('ANALYZE')
+
+    tashkent, village = (41.3111, 69.2797), (43.2, 59.5)
+    cases = [
+        ('city, 1 km', tashkent, 20, 1),
+        ('city, 5 km', tashkent, 20, 5),
+        ('city, 25 km', tashkent, 100, 25),
+        ('city, 10 nearest', tashkent, 10, None),
+        ('remote, 10 nearest', village, 10, None),
+        ('remote, 100 km', village, 100, 100),
+    ]
+    print(f'{args.rows} centers')
+    print(f'{"query":>20} {"found":>6} {"cells ms":>10} {"scan ms":>10}')
+    for label, (lat, lng), limit, radius in cases:
+        found = geo.nearby(Educenters.objects.all(), lat, lng, limit, radius, fields=('slug', ))
+        assert [row['slug'] for row in found] == [row['slug'] for row in scan(lat, lng, limit, radius)]
+
+        cells_ms = measure(lambda: geo.nearby(Educenters.objects.all(), lat, lng, limit, radius, fields=('slug', )), args.repeat)
+        scan_ms = measure(lambda: scan(lat, lng, limit, radius), args.repeat)
+        print(f'{label:>20} {len(found):>6} {cells_ms:>10.2f} {scan_ms:>10.2f}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,84 @@
+"""
+Offset vs cursor pagination on the center list.
+
+    python -m benchmarks.pagination --rows 100000
+
+Seeds ``--rows`` centers and fetches one page at increasing depths with
+DRF's ``LimitOffsetPagination``, with the same offset page without its
+``COUNT(*)``, and with our ``CentersPagination``.
+"""
+import argparse
+from urllib.parse import urlparse, parse_qs
+
+from benchmarks import setup_django, measure
+
+
+def seed(rows):
+    from learning_centers.models import Educenters
+
+    batch = 5000
+    for start in range(0, rows, batch):
+        Educenters.objects.bulk_create(
+            Educenters(name=f'Center {i}', slug=f'center-{i}', info='Benchmark center', cost=i % 5000)
+            for i in range(start, min(start + batch, rows))
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', type=int, default=100_000)
+    parser.add_argument('--page-size', type=int, default=20)
+    parser.add_argument('--repeat', type=int, default=20)
+    args = parser.parse_args()
+
+    setup_django()
+
+    from rest_framework.pagination import LimitOffsetPagination, Cursor
+    from rest_framework.request import Request
+    from rest_framework.test import APIRequestFactory
+
+    from learning_centers.models import Educenters
+    from learning_centers.pagination import CentersPagination
+
+    class UncountedPagination(LimitOffsetPagination):
+        """ Only the ``LIMIT``/``OFFSET`` query of ``LimitOffsetPagination``. """
+        def paginate_queryset(self, queryset, request, view=None):
+            self.limit, self.offset = self.get_limit(request), self.get_offset(request)
+            return list(queryset[self.offset:self.offset + self.limit])
+
+    seed(args.rows)
+    factory = APIRequestFactory()
+    queryset = Educenters.objects.all()
+    ids = list(queryset.order_by('-id').values_list('id', flat=True))
+
+    print(f'{args.rows} centers, page size {args.page_size}')
+    print(f'{"depth":>10} {"offset ms":>12} {"no count ms":>12} {"cursor ms":>12}')
+
+    for fraction in (0, 0.01, 0.25, 0.5, 0.99):
+        depth = int((len(ids) - args.page_size) * fraction)
+
+        offset_request = Request(factory.get('/api/educenters/', {'limit': args.page_size, 'offset': depth}))
+
+        # the page size is read from the request on every call
+        cursor_paginator = CentersPagination()
+        cursor_paginator.base_url = '/api/educenters/'
+        params = {'page_size': args.page_size}
+        if depth:
+            cursor = Cursor(offset=0, reverse=False, position=str(ids[depth - 1]))
+            params.update(parse_qs(urlparse(cursor_paginator.encode_cursor(cursor)).query))
+        cursor_request = Request(factory.get('/api/educenters/', params))
+
+        timings = []
+        for paginator, request, pages in (
+            (LimitOffsetPagination(), offset_request, queryset.order_by('-id')),
+            (UncountedPagination(), offset_request, queryset.order_by('-id')),
+            (cursor_paginator, cursor_request, queryset),
+        ):
+            page = paginator.paginate_queryset(pages, request)
+            assert [center.id for center in page] == ids[depth:depth + args.page_size]
+            timings.append(measure(lambda: paginator.paginate_queryset(pages, request), args.repeat))
+        print(f'{depth:>10}' + ''.join(f' {ms:>12.2f}' for ms in timings))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,74 @@
+"""
+Render time and bytes on the wire of the center list: DRF's JSONRenderer vs
+FastJSONRenderer (config/renderers.py), then the compression applied on the
+request path, by the middleware or once per response cache entry and
+encoding, and the harder one of the schema compressed at startup
+(config/compression.py).
+
+    python -m benchmarks.rendering --rows 1000 10000
+"""
+import argparse
+import time
+
+from benchmarks import setup_django, measure
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', type=int, nargs='+', default=[1000, 10_000])
+    parser.add_argument('--repeat', type=int, default=10)
+    args = parser.parse_args()
+
+    setup_django()
+
+    from rest_framework.renderers import JSONRenderer
+    from rest_framework.request import Request
+    from rest_framework.test import APIRequestFactory
+
+    from config import compression
+    from config.renderers import FastJSONRenderer, orjson
+    from learning_centers.models import Educenters
+    from learning_centers.serializers import CentersListSerializer, CentersFastListSerializer
+
+    print(f'orjson {"installed" if orjson else "missing, FastJSONRenderer falls back to DRF"}, '
+          f'encodings: {", ".join(compression.ENCODINGS)}')
+    context = {'request': Request(APIRequestFactory().get('/api/educenters/'))}
+    created = 0
+    for rows in sorted(args.rows):
+        Educenters.objects.bulk_create(
+            Educenters(
+                name=f'Center {i}', slug=f'center-{i}', info='Benchmark center teaching languages and math', cost=i,
+                phone_number='+998901112233', picture=f'educenter_images/center-{i}.png' if i % 2 else None,
+            )
+            for i in range(created, rows)
+        )
+        created = rows
+        queryset = Educenters.objects.order_by('-id').values(*CentersFastListSerializer.VALUES)
+        data = {'next': None, 'previous': None, 'results': CentersListSerializer(queryset, many=True, context=context).data}
+
+        content = JSONRenderer().render(data)
+        assert FastJSONRenderer().render(data) == content
+
+        print(f'\n{rows} centers, {len(content) / 1024:.0f} kB of JSON')
+        print(f'{"step":>28} {"ms":>9} {"kB sent":>9}')
+        for label, renderer in (('render, DRF JSONRenderer', JSONRenderer()), ('render, FastJSONRenderer', FastJSONRenderer())):
+            print(f'{label:>28} {measure(lambda: renderer.render(data), args.repeat):>9.2f} {len(content) / 1024:>9.0f}')
+
+        for encoding in compression.ENCODINGS:
+            for label, level in (('request', compression.LEVELS[encoding]), ('startup', compression.STORED_LEVELS[encoding])):
+                ms = measure(lambda: compression.compress(content, encoding, level), args.repeat)
+                size = len(compression.compress(content, encoding, level))
+                print(f'{f"{encoding} {level}, {label}":>28} {ms:>9.2f} {size / 1024:>9.1f}')
+
+        # a cache hit only looks the stored copy up
+        encoding = compression.negotiate('gzip, deflate, br')
+        stored = compression.precompress(content, 'application/json', encoding)
+        started = time.perf_counter()
+        for _ in range(args.repeat):
+            stored.get(compression.negotiate('gzip, deflate, br'))
+        print(f'{"cache hit, stored copy":>28} {(time.perf_counter() - started) / args.repeat * 1000:>9.3f} '
+              f'{len(stored[encoding]) / 1024:>9.1f}')
+
+
+if __name__ == '__main__':
+    main()
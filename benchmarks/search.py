@@ -0,0 +1,74 @@
+"""
+Center search through the FTS5 index vs a naive icontains scan.
+
+    python -m benchmarks.search --rows 100000
+"""
+import argparse
+import random
+
+from benchmarks import setup_django, measure
+
+
+# Course words show up in a few percent of the centers, the long tail of
+# VOCABULARY keeps the index from degenerating into a handful of terms.
+VOCABULARY = [f'topic{n}' for n in range(5000)]
+WORDS = ['python', 'english', 'math', 'ielts', 'robotics', 'design', 'music', 'chess', 'biology', 'physics',
+         'korean', 'german', 'frontend', 'backend', 'sat', 'olympiad', 'drawing', 'accounting', 'arabic', 'history']
+
+
+def seed(rows):
+    from learning_centers.models import Educenters, Courses
+
+    courses = Courses.objects.bulk_create(Courses(title=f'{word} course', slug=word) for word in WORDS)
+    Through = Educenters.courses.through
+    rng = random.Random(1)
+
+    batch = 5000
+    for start in range(0, rows, batch):
+        centers = Educenters.objects.bulk_create(
+            Educenters(
+                name=f'{rng.choice(WORDS).title()} academy {i}', slug=f'academy-{i}', cost=rng.randrange(100, 5000),
+                info=' '.join(rng.choices(WORDS, k=2) + rng.choices(VOCABULARY, k=30)),
+            )
+            for i in range(start, min(start + batch, rows))
+        )
+        Through.objects.bulk_create(
+            Through(educenters_id=center.id, courses_id=course.id)
+            for center in centers for course in rng.sample(courses, 2)
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', type=int, default=100_000)
+    parser.add_argument('--repeat', type=int, default=10)
+    args = parser.parse_args()
+
+    setup_django()
+
+    from django.core.management import call_command
+
+    from learning_centers.search import CenterSearch
+
+    seed(args.rows)
+    call_command('rebuild_search_index')
+
+    cases = [
+        ('rare word', {'query': 'topic4242'}),
+        ('common word', {'query': 'python'}),
+        ('two words', {'query': 'python ielts'}),
+        ('prefix', {'query': 'robot'}),
+        ('with filters', {'query': 'math', 'cost_max': 1000, 'course': 'chess'}),
+    ]
+    print(f'{args.rows} centers, first page of 20')
+    print(f'{"query":>14} {"matches":>10} {"fts ms":>10} {"scan ms":>10}')
+    for label, params in cases:
+        search = CenterSearch(**params)
+        fts_ms = measure(lambda: search[0:20], args.repeat)
+        scan_ms = measure(lambda: list(search._fallback()[0:20]), args.repeat)
+        matches = search._fallback().count()
+        print(f'{label:>14} {matches:>10} {fts_ms:>10.2f} {scan_ms:>10.2f}')
+
+
+if __name__ == '__main__':
+    main()
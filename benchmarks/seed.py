@@ -0,0 +1,127 @@
+"""
+Synthetic data for load tests: roles, users, courses, centers with their
+courses and applications, written with bulk inserts in batches.
+
+    python -m benchmarks.seed --db /tmp/lookedu.sqlite3
+    python -m benchmarks.seed --db /tmp/lookedu.sqlite3 --centers 10000 --applications 100000
+
+Every user's password is ``PASSWORD``. The database is migrated first and
+can then be reused by ``python -m benchmarks.load --db ...``.
+"""
+import argparse
+import itertools
+import random
+import time
+
+from benchmarks import setup_django
+
+PASSWORD = 'pass12345'
+
+DEFAULTS = {'users': 10_000, 'courses': 500, 'centers': 100_000, 'applications': 1_000_000}
+
+
+def batches(objects, size):
+    objects = iter(objects)
+    while batch := list(itertools.islice(objects, size)):
+        yield batch
+
+
+def seed(users, courses, centers, applications, batch_size=5000, courses_per_center=3, seed=0, verbose=False):
+    """
+    Fills an empty database, returns the ids needed by the load driver:
+    ``{'users': [...], 'owners': [...], 'courses': [...], 'centers': {center id: [course ids]}}``.
+    One user in ten owns centers.
+    """
+    from django.contrib.auth.hashers import make_password
+    from django.db import connection, transaction
+    from django.utils import timezone
+
+    from learning_centers import counters, search, stats
+    from learning_centers.models import Application, Courses, Educenters
+    from users_control.models import CustomUser, Roles
+
+    rng = random.Random(seed)
+    started = time.perf_counter()
+
+    def step(name, count):
+        if verbose:
+            print(f'{name:>14} {count:>9} rows {time.perf_counter() - started:>7.1f} s')
+
+    roles = {role.name: role for role in Roles.objects.bulk_create(Roles(name=name) for name, _ in Roles.ROLE_NAME)}
+    password = make_password(PASSWORD)  # hashing once per user would take hours
+    for batch in batches(range(users), batch_size):
+        CustomUser.objects.bulk_create(
+            CustomUser(username=f'user-{i}', password=password, phone_number=f'+998{i:09d}', first_name='User',
+                       last_name=str(i), role=roles['edu_owner' if i % 10 == 0 else 'user'], have_right_to_add=i % 10 == 0)
+            for i in batch
+        )
+    user_ids = list(CustomUser.objects.order_by('id').values_list('id', flat=True))
+    owner_ids = user_ids[::10]
+    step('users', users)
+
+    Courses.objects.bulk_create(
+        (Courses(title=f'Course {i}', slug=f'course-{i}') for i in range(courses)), batch_size=batch_size
+    )
+    course_ids = list(Courses.objects.order_by('id').values_list('id', flat=True))
+    step('courses', courses)
+
+    Through = Educenters.courses.through
+    center_courses = {}
+    for batch in batches(range(centers), batch_size):
+        with transaction.atomic():
+            created = Educenters.objects.bulk_create(
+                Educenters(name=f'Center {i}', slug=f'center-{i}', owner_id=rng.choice(owner_ids), cost=rng.randint(100, 2000),
+                           info=f'Courses for every level, center number {i}', phone_number=f'+998{i:09d}')
+                for i in batch
+            )
+            links = []
+            for center in created:
+                center_courses[center.id] = rng.sample(course_ids, min(courses_per_center, len(course_ids)))
+                links += [Through(educenters_id=center.id, courses_id=course_id) for course_id in center_courses[center.id]]
+            Through.objects.bulk_create(links)
+    step('centers', centers)
+
+    center_ids = list(center_courses)
+    for batch in batches(range(applications), batch_size):
+        indexes = Application.index_allocator.take(len(batch))
+        with transaction.atomic():
+            rows = []
+            for index in indexes:
+                center_id = rng.choice(center_ids)
+                rows.append(Application(owner_id=rng.choice(user_ids), center_id=center_id, index=index,
+                                        course_id=rng.choice(center_courses[center_id]), content='Please call me back'))
+            Application.objects.bulk_create(rows)
+
+    # auto_now_add can't be set through bulk_create, spread the rows over the last year afterwards
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "UPDATE learning_centers_application SET created_date = datetime(%s, '-' || (id % 365) || ' days')",
+            [timezone.now().strftime('%Y-%m-%d %H:%M:%S')],
+        )
+    step('applications', applications)
+
+    # bulk_create skips the signals keeping these up to date
+    stats.rebuild()
+    search.rebuild_index()
+    counters.reconcile()
+    with connection.cursor() as cursor:
+        cursor.execute('ANALYZE')
+    step('rebuilds', centers)
+
+    return {'users': user_ids, 'owners': owner_ids, 'courses': course_ids, 'centers': center_courses}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--db', required=True, help='SQLite file to create')
+    for name, default in DEFAULTS.items():
+        parser.add_argument(f'--{name}', type=int, default=default)
+    parser.add_argument('--batch-size', type=int, default=5000)
+    args = parser.parse_args()
+
+    setup_django(args.db)
+    seed(args.users, args.courses, args.centers, args.applications, args.batch_size, verbose=True)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,53 @@
+"""
+Rows/second of the center list serialization, per-row serializer vs the
+fast ``.values()`` path.
+
+    python -m benchmarks.serialization --rows 10000
+"""
+import argparse
+
+from benchmarks import setup_django, measure
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', type=int, default=10_000)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    setup_django()
+
+    from rest_framework import serializers
+    from rest_framework.request import Request
+    from rest_framework.test import APIRequestFactory
+
+    from learning_centers.models import Educenters
+    from learning_centers.serializers import CentersListSerializer, CentersFastListSerializer
+
+    Educenters.objects.bulk_create(
+        Educenters(
+            name=f'Center {i}', slug=f'center-{i}', info='Benchmark center', cost=i, phone_number='+998901112233',
+            picture=f'educenter_images/center-{i}.png' if i % 2 else None,
+        )
+        for i in range(args.rows)
+    )
+    context = {'request': Request(APIRequestFactory().get('/api/educenters/'))}
+    queryset = Educenters.objects.order_by('-id')
+
+    def per_row():
+        return serializers.ListSerializer(child=CentersListSerializer(), instance=queryset.all(), context=context).data
+
+    def fast():
+        return CentersListSerializer(queryset.values(*CentersFastListSerializer.VALUES), many=True, context=context).data
+
+    assert per_row() == fast()
+
+    print(f'{args.rows} centers, query + serialization')
+    print(f'{"path":>10} {"ms":>10} {"rows/s":>12}')
+    for label, func in (('per-row', per_row), ('fast', fast)):
+        ms = measure(func, args.repeat)
+        print(f'{label:>10} {ms:>10.1f} {args.rows / ms * 1000:>12.0f}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,87 @@
+"""
+Owner dashboard statistics: the daily rollup vs GROUP BY over the whole
+applications table, as the table grows.
+
+    python -m benchmarks.stats --rows 10000 100000 1000000
+"""
+import argparse
+import random
+from datetime import timedelta
+
+from benchmarks import setup_django, measure
+
+
+def seed(rows, center, courses, student):
+    """ Tops the applications table up to ``rows`` rows spread over the last year. """
+    from django.db import connection
+
+    from learning_centers.models import Application
+
+    existing = Application.objects.count()
+    rng = random.Random(rows)
+    batch = 10_000
+    for start in range(existing, rows, batch):
+        Application.objects.bulk_create(
+            Application(owner=student, center=center, course=rng.choice(courses), index=i)
+            for i in range(start, min(start + batch, rows))
+        )
+
+    # auto_now_add can't be set through bulk_create, move the new rows back afterwards
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "UPDATE learning_centers_application SET created_date = datetime(created_date, '-' || (id % 365) || ' days') "
+            "WHERE id > %s", [existing]
+        )
+
+
+def group_by_stats(center, days):
+    """ The same numbers as ``center_stats`` straight from the applications table. """
+    from django.db.models import Count
+    from django.db.models.functions import TruncDate
+    from django.utils import timezone
+
+    from learning_centers.models import Application
+
+    since = timezone.localdate() - timedelta(days=days - 1)
+    applications = Application.objects.filter(center=center)
+    return {
+        'total': applications.count(),
+        'daily': list(
+            applications.filter(created_date__date__gte=since).annotate(day=TruncDate('created_date'))
+            .values('day').annotate(count=Count('id')).order_by('day')
+        ),
+        'courses': list(
+            applications.filter(created_date__date__gte=since).values('course__title').annotate(count=Count('id'))
+        ),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', type=int, nargs='+', default=[10_000, 100_000, 1_000_000])
+    parser.add_argument('--repeat', type=int, default=10)
+    args = parser.parse_args()
+
+    setup_django()
+
+    from learning_centers.models import Courses, Educenters
+    from learning_centers.stats import center_stats, rebuild
+    from users_control.models import CustomUser
+
+    student = CustomUser.objects.create_user(username='student', password='pass12345', phone_number='+998900000000')
+    center = Educenters.objects.create(name='Benchmark center', slug='benchmark')
+    courses = Courses.objects.bulk_create(Courses(title=f'Course {i}', slug=f'course-{i}') for i in range(10))
+
+    print(f'{"rows":>9} {"rollup ms":>10} {"group by ms":>12}')
+    for rows in sorted(args.rows):
+        seed(rows, center, courses, student)
+        rebuild()
+
+        assert center_stats(center, 30)['total'] == group_by_stats(center, 30)['total']
+        rollup = measure(lambda: center_stats(center, 30), args.repeat)
+        group_by = measure(lambda: group_by_stats(center, 30), args.repeat)
+        print(f'{rows:>9} {rollup:>10.2f} {group_by:>12.2f}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,106 @@
+"""
+Refresh token blacklist: table size and refresh latency before and after
+pruning, with the plain database check and with the fast negative check.
+
+    python -m benchmarks.token_blacklist --tokens 200000
+"""
+import argparse
+import statistics
+import time
+from datetime import timedelta
+
+from benchmarks import setup_django
+
+
+def seed(tokens, user):
+    from rest_framework_simplejwt.token_blacklist.models import OutstandingToken, BlacklistedToken
+    from rest_framework_simplejwt.utils import aware_utcnow
+
+    now = aware_utcnow()
+    batch = 5000
+    for start in range(0, tokens, batch):
+        # The oldest 60% are expired, 90% of all tokens were rotated or logged out
+        outstanding = OutstandingToken.objects.bulk_create(
+            OutstandingToken(
+                user=user, jti=f'seed-{i}', token='x' * 250, created_at=now,
+                expires_at=now + timedelta(days=-1 if i < tokens * 0.6 else 7),
+            )
+            for i in range(start, min(start + batch, tokens))
+        )
+        BlacklistedToken.objects.bulk_create(
+            BlacklistedToken(token=token) for i, token in enumerate(outstanding) if i % 10
+        )
+
+
+def table_sizes():
+    from django.db import connection
+    from rest_framework_simplejwt.token_blacklist.models import OutstandingToken, BlacklistedToken
+
+    with connection.cursor() as cursor:
+        page_count = cursor.execute('PRAGMA page_count').fetchone()[0]
+        free_pages = cursor.execute('PRAGMA freelist_count').fetchone()[0]
+        page_size = cursor.execute('PRAGMA page_size').fetchone()[0]
+    used = (page_count - free_pages) * page_size / 2 ** 20
+    return OutstandingToken.objects.count(), BlacklistedToken.objects.count(), used
+
+
+def refresh_latency(user, repeat):
+    from django.test.utils import override_settings
+
+    from users_control.blacklist import FastRefreshToken, token_blacklist
+    from users_control.serializers import TokenRefreshSerializer
+
+    results = {}
+    for fast in (False, True):
+        with override_settings(TOKEN_BLACKLIST_FAST_CHECK=fast):
+            token_blacklist.reset()
+            token_blacklist.might_contain('warm-up')
+
+            checks, refreshes = [], []
+            for _ in range(repeat):
+                token = str(FastRefreshToken.for_user(user))
+
+                parsed = FastRefreshToken(token, verify=False)
+                started = time.perf_counter()
+                parsed.check_blacklist()
+                checks.append((time.perf_counter() - started) * 1000)
+
+                started = time.perf_counter()
+                serializer = TokenRefreshSerializer(data={'refresh': token})
+                serializer.is_valid(raise_exception=True)
+                refreshes.append((time.perf_counter() - started) * 1000)
+            results['fast' if fast else 'db'] = (statistics.median(checks), statistics.median(refreshes))
+    return results
+
+
+def report(label, user, repeat):
+    outstanding, blacklisted, size = table_sizes()
+    print(f'{label}: {outstanding} outstanding, {blacklisted} blacklisted, {size:.1f} MiB of pages in use')
+    for check, (check_ms, refresh_ms) in refresh_latency(user, repeat).items():
+        print(f'  {check:>5} check: membership {check_ms:.3f} ms, full refresh {refresh_ms:.2f} ms')
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--tokens', type=int, default=200_000)
+    parser.add_argument('--repeat', type=int, default=50)
+    args = parser.parse_args()
+
+    setup_django()
+
+    from django.core.management import call_command
+
+    from users_control.models import CustomUser
+
+    user = CustomUser.objects.create_user(username='bench', password='pass12345', phone_number='+998900000000')
+    seed(args.tokens, user)
+
+    report('Before pruning', user, args.repeat)
+    started = time.perf_counter()
+    call_command('prune_token_blacklist', batch_size=5000)
+    print(f'Pruned in {time.perf_counter() - started:.1f}s')
+    report('After pruning', user, args.repeat)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,210 @@
+"""
+Async read path served under ASGI (see config/asgi.py).
+
+Read endpoints that are hit the most get an ``AsyncAPIView`` twin of their
+DRF view. ``serve_reads_async`` swaps them into the URL patterns when
+``ASYNC_READ_VIEWS`` is on: JSON GETs run on the event loop, every other
+request still goes to the DRF view.
+"""
+import functools
+
+from asgiref.sync import sync_to_async
+from django.contrib.auth import middleware as auth
+from django.core.cache.backends.locmem import LocMemCache
+from django.http import Http404
+from django.middleware import clickjacking, common, csrf, security
+from django.urls import URLPattern
+
+from rest_framework import exceptions, permissions
+from rest_framework.request import Request
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+
+from .renderers import FastJSONRenderer
+
+# Permissions that only look at request.user, checked on the event loop
+INLINE_PERMISSIONS = (
+    permissions.AllowAny, permissions.IsAuthenticated, permissions.IsAdminUser, permissions.IsAuthenticatedOrReadOnly,
+)
+
+
+async def cache_call(cache, method, *args, **kwargs):
+    """
+    Calls ``cache.<method>`` from async code. In-process caches are called
+    directly, they never block; the async twins of Django's other backends
+    hop to a thread.
+    """
+    if isinstance(cache, LocMemCache):
+        return getattr(cache, method)(*args, **kwargs)
+    return await getattr(cache, f'a{method}')(*args, **kwargs)
+
+
+class AsyncAPIView:
+    """
+    Minimal async counterpart of a read-only DRF ``APIView``.
+
+    The request is wrapped in a DRF ``Request`` for ``query_params`` and
+    absolute URLs. Authenticators with an ``aauthenticate`` method run on
+    the event loop, the others are skipped; users forced by DRF's test
+    client are honoured like ``Request`` does. ``permission_classes`` are
+    checked like DRF does, in a thread unless they are all
+    ``INLINE_PERMISSIONS`` or only have object checks. ``get`` returns a
+    DRF ``Response``, rendered as JSON; API exceptions are turned into the
+    same responses DRF would send.
+    """
+    renderer = FastJSONRenderer()
+    permission_classes = api_settings.DEFAULT_PERMISSION_CLASSES
+
+    @classmethod
+    def as_view(cls):
+        async def view(request, *args, **kwargs):
+            return await cls().dispatch(request, *args, **kwargs)
+        view.csrf_exempt = True
+        return view
+
+    async def dispatch(self, request, *args, **kwargs):
+        self.request = Request(request, authenticators=())
+        self.authenticators = [auth() for auth in api_settings.DEFAULT_AUTHENTICATION_CLASSES]
+        self.args, self.kwargs = args, kwargs
+        try:
+            await self.authenticate(self.request)
+            await self.check_permissions(self.request)
+            response = await self.respond(self.request, *args, **kwargs)
+        except Http404 as exc:
+            response = self.handle_exception(exceptions.NotFound(*exc.args))
+        except exceptions.APIException as exc:
+            response = self.handle_exception(exc)
+        return self.finalize_response(response)
+
+    async def authenticate(self, request):
+        request.user, request.auth = api_settings.UNAUTHENTICATED_USER(), None
+        forced_user = getattr(request._request, '_force_auth_user', None)  # APIClient.force_authenticate
+        if forced_user is not None:
+            request.user, request.auth = forced_user, getattr(request._request, '_force_auth_token', None)
+            return
+        for authenticator in self.authenticators:
+            if hasattr(authenticator, 'aauthenticate'):
+                result = await authenticator.aauthenticate(request)
+                if result is not None:
+                    request.user, request.auth = result
+                    return
+
+    def get_permissions(self):
+        return [permission() for permission in self.permission_classes]
+
+    async def check_permissions(self, request):
+        checks = self.get_permissions()
+        if all(
+            isinstance(permission, INLINE_PERMISSIONS)
+            or type(permission).has_permission is permissions.BasePermission.has_permission
+            for permission in checks
+        ):
+            self.run_permission_checks(checks, request)
+        else:
+            await sync_to_async(self.run_permission_checks)(checks, request)
+
+    def run_permission_checks(self, checks, request):
+        for permission in checks:
+            if not permission.has_permission(request, self):
+                self.permission_denied(
+                    request, getattr(permission, 'message', None), getattr(permission, 'code', None)
+                )
+
+    def permission_denied(self, request, message=None, code=None):
+        if not request.user.is_authenticated:
+            raise exceptions.NotAuthenticated()
+        raise exceptions.PermissionDenied(detail=message, code=code)
+
+    def handle_exception(self, exc):
+        if isinstance(exc, (exceptions.NotAuthenticated, exceptions.AuthenticationFailed)):
+            auth_header = self.authenticators[0].authenticate_header(self.request) if self.authenticators else None
+            if auth_header:
+                exc.auth_header = auth_header
+            else:
+                exc.status_code = 403
+
+        response = api_settings.EXCEPTION_HANDLER(exc, {'view': self, 'request': self.request})
+        if response is None:
+            raise exc
+        return response
+
+    async def respond(self, request, *args, **kwargs):
+        return await self.get(request, *args, **kwargs)
+
+    def finalize_response(self, response):
+        if not isinstance(response, Response) or response.is_rendered:
+            return response
+        response.accepted_renderer = self.renderer
+        response.accepted_media_type = self.renderer.media_type
+        response.renderer_context = {'view': self, 'request': self.request, 'response': response}
+        return response.render()
+
+    async def get(self, request, *args, **kwargs):
+        raise NotImplementedError
+
+
+def wants_json(request, format=None):
+    return (
+        (format or request.GET.get(api_settings.URL_FORMAT_OVERRIDE, 'json')) == 'json'
+        and 'text/html' not in request.headers.get('Accept', '')
+    )
+
+
+def read_async(sync_view, async_view):
+    """ A view that sends JSON GETs to ``async_view`` and everything else to ``sync_view``. """
+    sync_handler = sync_to_async(sync_view)
+
+    @functools.wraps(sync_view)  # keeps .cls/.actions for the schema generator
+    async def view(request, *args, **kwargs):
+        if request.method == 'GET' and wants_json(request, kwargs.get('format')):
+            kwargs.pop('format', None)
+            return await async_view(request, *args, **kwargs)
+        return await sync_handler(request, *args, **kwargs)
+
+    return view
+
+
+def serve_reads_async(urlpatterns, async_views):
+    """ Returns ``urlpatterns`` with the patterns named in ``async_views`` routed through ``read_async``. """
+    return [
+        URLPattern(pattern.pattern, read_async(pattern.callback, async_views[pattern.name]),
+                   pattern.default_args, pattern.name)
+        if isinstance(pattern, URLPattern) and pattern.name in async_views else pattern
+        for pattern in urlpatterns
+    ]
+
+
+class InlineHooksMixin:
+    """
+    Runs a ``MiddlewareMixin`` middleware's ``process_request`` and
+    ``process_response`` on the event loop. Django sends each of them to a
+    thread under ASGI, which is only needed for hooks that can reach the
+    database, like the session and messages ones.
+    """
+    async def __acall__(self, request):
+        response = self.process_request(request) if hasattr(self, 'process_request') else None
+        response = response or await self.get_response(request)
+        if hasattr(self, 'process_response'):
+            response = self.process_response(request, response)
+        return response
+
+
+class SecurityMiddleware(InlineHooksMixin, security.SecurityMiddleware):
+    pass
+
+
+class CommonMiddleware(InlineHooksMixin, common.CommonMiddleware):
+    pass
+
+
+class CsrfViewMiddleware(InlineHooksMixin, csrf.CsrfViewMiddleware):
+    pass
+
+
+class AuthenticationMiddleware(InlineHooksMixin, auth.AuthenticationMiddleware):
+    pass
+
+
+class XFrameOptionsMiddleware(InlineHooksMixin, clickjacking.XFrameOptionsMiddleware):
+    pass
+
@@ -12,5 +12,7 @@ import os
 from django.core.asgi import get_asgi_application
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings')
+# JSON reads run on the event loop instead of a thread each, see config/aio.py
+os.environ.setdefault('ASYNC_READ_VIEWS', 'True')
 
 application = get_asgi_application()
@@ -0,0 +1,127 @@
+"""
+Response compression.
+
+``CompressionMiddleware`` sends responses to GET and HEAD requests with
+brotli (when the ``brotli`` package is installed) or gzip, whichever the
+client prefers in ``Accept-Encoding``, when they are of a compressible type
+and at least ``COMPRESSION_MIN_BYTES`` long. Streamed and already encoded
+responses (the OpenAPI schema) pass through. Responses to other methods,
+such as the token pair of a login, are never compressed, so secrets are
+never compressed next to data the client chose (BREACH).
+
+A response can carry ``precompressed = {encoding: bytes}``: the response
+cache (learning_centers/caching.py) stores the ``precompress`` copy of each
+encoding clients asked for next to its entries, so a cache hit goes out
+without compressing anything.
+"""
+import functools
+import gzip
+import re
+
+from asgiref.sync import iscoroutinefunction
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.utils.cache import patch_vary_headers
+from django.utils.decorators import sync_and_async_middleware
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+# The server's preference when the client weighs them the same
+ENCODINGS = ('br', 'gzip') if brotli else ('gzip', )
+
+# Compression levels on the request path, and of the OpenAPI schema, compressed once at startup
+LEVELS = {'br': 4, 'gzip': 6}
+STORED_LEVELS = {'br': 9, 'gzip': 9}
+
+COMPRESSIBLE_TYPES = re.compile(
+    r'^(text/|application/(json|[\w.-]+\+json|x-ndjson|javascript|xml|[\w.-]+\+xml|vnd\.oai\.openapi))'
+)
+
+
+def compress(content, encoding, level=None):
+    level = level or LEVELS[encoding]
+    if encoding == 'br':
+        return brotli.compress(content, quality=level)
+    return gzip.compress(content, compresslevel=level, mtime=0)
+
+
+@functools.lru_cache(maxsize=128)
+def negotiate(accept_encoding):
+    """ The encoding to answer an ``Accept-Encoding`` header with, None for none. """
+    weights = {}
+    for coding in accept_encoding.lower().split(','):
+        name, _, params = coding.partition(';')
+        weight = 1.0
+        for param in params.split(';'):
+            key, _, value = param.strip().partition('=')
+            if key == 'q':
+                try:
+                    weight = float(value)
+                except ValueError:
+                    weight = 0.0
+        weights[name.strip()] = weight
+
+    best = max(ENCODINGS, key=lambda encoding: weights.get(encoding, weights.get('*', 0)))
+    return best if weights.get(best, weights.get('*', 0)) > 0 else None
+
+
+def compressible(content, content_type):
+    return (
+        settings.COMPRESS_RESPONSES and len(content) >= settings.COMPRESSION_MIN_BYTES
+        and COMPRESSIBLE_TYPES.match(content_type) is not None
+    )
+
+
+def precompress(content, content_type, encoding):
+    """ ``{encoding: bytes}`` of ``content``, {} without an encoding or when it isn't worth it. """
+    if encoding is None or not compressible(content, content_type):
+        return {}
+    return {encoding: compress(content, encoding)}
+
+
+def accepted_encoding(request):
+    """ The encoding the response to ``request`` would be compressed with, if any. """
+    if request.method not in ('GET', 'HEAD') or not settings.COMPRESS_RESPONSES:
+        return None
+    return negotiate(request.META.get('HTTP_ACCEPT_ENCODING', ''))
+
+
+def compress_response(request, response):
+    if response.streaming or response.has_header('Content-Encoding') or request.method not in ('GET', 'HEAD'):
+        return response
+    if not compressible(response.content, response.get('Content-Type', '')):
+        return response
+
+    patch_vary_headers(response, ('Accept-Encoding', ))
+    encoding = negotiate(request.META.get('HTTP_ACCEPT_ENCODING', ''))
+    if encoding is None:
+        return response
+
+    content = getattr(response, 'precompressed', {}).get(encoding) or compress(response.content, encoding)
+    if len(content) >= len(response.content):
+        return response
+
+    response.content = content
+    response['Content-Length'] = str(len(content))
+    response['Content-Encoding'] = encoding
+    # the ETag of the uncompressed bytes, equivalent but not byte-for-byte identical
+    etag = response.get('ETag')
+    if etag and etag.startswith('"'):
+        response['ETag'] = f'W/{etag}'
+    return response
+
+
+@sync_and_async_middleware
+def CompressionMiddleware(get_response):
+    if not settings.COMPRESS_RESPONSES:
+        raise MiddlewareNotUsed
+    if iscoroutinefunction(get_response):
+        async def middleware(request):
+            return compress_response(request, await get_response(request))
+    else:
+        def middleware(request):
+            return compress_response(request, get_response(request))
+    return middleware
@@ -0,0 +1,127 @@
+"""
+Database profiles and read/write routing.
+
+``sqlite_databases`` builds ``settings.DATABASES`` for one of the SQLite
+profiles. The ``tuned`` profile adds a read-only ``replica`` alias on the
+same file, and ``ReplicaRouter`` with ``ReplicaMiddleware`` send the reads
+of safe requests there. When the project moves to a server database,
+point ``replica`` at the real replica, the routing stays the same.
+"""
+import contextlib
+import contextvars
+from pathlib import Path
+
+from asgiref.sync import iscoroutinefunction
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.utils.decorators import sync_and_async_middleware
+
+
+REPLICA_DB_ALIAS = 'replica'
+
+# WAL lets readers and the writer work at the same time, synchronous=NORMAL is
+# durable enough with WAL, busy_timeout waits for the lock instead of failing
+TUNED_PRAGMAS = {
+    'journal_mode': 'WAL',
+    'synchronous': 'NORMAL',
+    'busy_timeout': 5000,
+    'mmap_size': 256 * 2 ** 20,
+    'cache_size': -64 * 2 ** 10,  # KiB
+    'temp_store': 'MEMORY',
+}
+
+
+def init_command(pragmas):
+    return ';'.join(f'PRAGMA {name}={value}' for name, value in pragmas.items())
+
+
+def sqlite_databases(path, profile='default', conn_max_age=600):
+    """
+    ``DATABASES`` for the SQLite file at ``path``.
+
+    ``default`` is Django's plain sqlite3 setup. ``tuned`` applies
+    ``TUNED_PRAGMAS`` on every new connection, keeps connections open for
+    ``conn_max_age`` seconds, starts write transactions with ``BEGIN
+    IMMEDIATE`` (a deferred transaction that later needs the write lock
+    fails at once instead of waiting) and adds the read-only ``replica``
+    alias.
+    """
+    if profile == 'default':
+        return {DEFAULT_DB_ALIAS: {'ENGINE': 'django.db.backends.sqlite3', 'NAME': path}}
+    if profile != 'tuned':
+        raise ValueError(f'Unknown database profile {profile!r}, use "default" or "tuned"')
+
+    tuned = {
+        'ENGINE': 'django.db.backends.sqlite3',
+        'CONN_MAX_AGE': conn_max_age,
+        'CONN_HEALTH_CHECKS': True,
+    }
+    read_pragmas = {name: value for name, value in TUNED_PRAGMAS.items() if name not in ('journal_mode', 'synchronous')}
+    return {
+        DEFAULT_DB_ALIAS: {
+            **tuned,
+            'NAME': path,
+            'OPTIONS': {'init_command': init_command(TUNED_PRAGMAS), 'transaction_mode': 'IMMEDIATE'},
+        },
+        REPLICA_DB_ALIAS: {
+            **tuned,
+            'NAME': f'{Path(path).absolute().as_uri()}?mode=ro',
+            'OPTIONS': {'init_command': init_command({**read_pragmas, 'query_only': 1})},
+            'TEST': {'MIRROR': DEFAULT_DB_ALIAS},
+        },
+    }
+
+
+_use_primary = contextvars.ContextVar('use_primary', default=False)
+
+
+@contextlib.contextmanager
+def use_primary():
+    """ Sends every read inside the block to the primary. """
+    token = _use_primary.set(True)
+    try:
+        yield
+    finally:
+        _use_primary.reset(token)
+
+
+class ReplicaRouter:
+    """
+    Reads go to ``replica`` unless they run inside ``use_primary`` (every
+    unsafe request, see ``ReplicaMiddleware``) or inside a transaction on
+    the primary, so a request always reads its own writes. Writes and
+    migrations go to the primary.
+    """
+
+    def db_for_read(self, model, **hints):
+        if _use_primary.get() or connections[DEFAULT_DB_ALIAS].in_atomic_block:
+            return DEFAULT_DB_ALIAS
+        return REPLICA_DB_ALIAS
+
+    def db_for_write(self, model, **hints):
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        return db == DEFAULT_DB_ALIAS
+
+
+@sync_and_async_middleware
+def ReplicaMiddleware(get_response):
+    """ Runs requests that are not GET, HEAD or OPTIONS inside ``use_primary``. """
+    safe_methods = ('GET', 'HEAD', 'OPTIONS')
+
+    if iscoroutinefunction(get_response):
+        async def middleware(request):
+            if request.method in safe_methods:
+                return await get_response(request)
+            with use_primary():
+                return await get_response(request)
+    else:
+        def middleware(request):
+            if request.method in safe_methods:
+                return get_response(request)
+            with use_primary():
+                return get_response(request)
+    return middleware
@@ -0,0 +1,109 @@
+"""
+Sparse fieldsets and on-demand expansion of related objects.
+
+``?fields=index,center.name,course.title`` renders only the listed fields,
+a dotted name picks fields of an expanded relation (just ``center`` keeps
+all of its fields). ``?expand=center,course`` embeds the relations listed
+in the serializer's ``Meta.expandable_fields``, the others stay primary
+keys. Nested relations expand the same way: ``?expand=center.courses``.
+
+Fields left out aren't computed at all, and views ask
+``Fieldset.from_request`` which relations to load so they only join and
+prefetch what is rendered. Unknown names are ignored. Writable fields left
+out are still accepted, they are only not rendered.
+"""
+from rest_framework import serializers
+
+
+def parse(value):
+    """ 'a,b.c,b.d' -> {'a': {}, 'b': {'c': {}, 'd': {}}} """
+    tree = {}
+    for path in value.split(','):
+        node = tree
+        for name in path.strip().split('.'):
+            if name:
+                node = node.setdefault(name, {})
+    return tree
+
+
+class Fieldset:
+    """ The fields (None: all of them) and expanded relations of one serializer, with those of its relations. """
+
+    def __init__(self, fields=None, expand=None):
+        self.fields = fields
+        self.expand = expand or {}
+
+    @classmethod
+    def from_request(cls, request):
+        params = getattr(request, 'query_params', request.GET)
+        fields = parse(params['fields']) if params.get('fields') else None
+        return cls(fields or None, parse(params.get('expand', '')))
+
+    def wants(self, name):
+        return self.fields is None or name in self.fields
+
+    def expands(self, name):
+        """ Whether the relation ``name`` is rendered and expanded. """
+        return name in self.expand and self.wants(name)
+
+    def child(self, name):
+        return Fieldset(self.fields and self.fields.get(name) or None, self.expand.get(name))
+
+
+class FieldsetMixin:
+    """
+    Applies the request's ``Fieldset`` to a serializer, declare the
+    relations it can embed as ``Meta.expandable_fields = {name: (serializer
+    class, kwargs)}`` next to the primary key fields rendered otherwise.
+
+    A serializer nested by an expansion gets its part of the fieldset, the
+    outermost one (or the child of the outermost list) reads the request
+    from the context.
+    """
+
+    def __init__(self, *args, fieldset=None, **kwargs):
+        self._fieldset = fieldset
+        super().__init__(*args, **kwargs)
+
+    @property
+    def fieldset(self):
+        if self._fieldset is None:
+            parent = self.parent
+            if isinstance(parent, serializers.ListSerializer):
+                parent = parent.parent
+            request = self.context.get('request') if parent is None else None
+            self._fieldset = Fieldset.from_request(request) if request is not None else Fieldset()
+        return self._fieldset
+
+    def get_fields(self):
+        fields = super().get_fields()
+        fieldset = self.fieldset
+
+        for name, (serializer_class, kwargs) in getattr(getattr(self, 'Meta', None), 'expandable_fields', {}).items():
+            if name in fields and fieldset.expands(name):
+                fields[name] = serializer_class(read_only=True, fieldset=fieldset.child(name), **kwargs)
+
+        for name, field in list(fields.items()):
+            if fieldset.wants(name):
+                continue
+            if field.read_only:
+                del fields[name]
+            else:
+                field.write_only = True
+        return fields
+
+
+def schema_parameters(serializer_class):
+    """ OpenAPI parameters of ``?fields=`` and ``?expand=`` for the views rendering ``serializer_class``. """
+    from drf_spectacular.utils import OpenApiParameter
+
+    expandable = list(getattr(serializer_class.Meta, 'expandable_fields', {}))
+    parameters = [OpenApiParameter(
+        'fields', str, description='Comma-separated fields to render, `relation.field` for fields of an expanded relation',
+    )]
+    if expandable:
+        parameters.append(OpenApiParameter(
+            'expand', str,
+            description=f'Comma-separated relations to embed instead of their ids: {", ".join(expandable)}',
+        ))
+    return parameters
@@ -0,0 +1,81 @@
+"""
+Keeping what most requests never use out of worker startup.
+
+``lazy_view`` imports a view on its first request, so the schema views
+(drf-spectacular's, PyYAML) never load in a worker that doesn't serve them.
+With ``LEAN_BOOT`` on:
+
+* the admin is installed with ``SimpleAdminConfig`` and mounted with
+  ``LazyAdminResolver``, the ``admin.py`` modules are discovered and the
+  admin URLs built on the first admin request;
+* the OpenAPI extensions in ``users_control/schema.py`` load with the first
+  schema generation through a preprocessing hook instead of ``ready()``.
+
+Pillow is imported where pictures are rendered (see learning_centers/images.py).
+``manage.py profile_startup`` measures the difference.
+"""
+import functools
+
+from django.urls.resolvers import RoutePattern, URLResolver
+from django.utils.functional import cached_property
+from django.utils.module_loading import import_string
+
+
+def lazy_view(path, **initkwargs):
+    """
+    A view that imports ``path``, a view function or a class-based view
+    (called with ``as_view(**initkwargs)``), on its first request. Only for
+    safe methods: the wrapper doesn't carry ``csrf_exempt`` of the real view.
+    """
+    @functools.cache
+    def load():
+        view = import_string(path)
+        return view.as_view(**initkwargs) if isinstance(view, type) else view
+
+    def view(request, *args, **kwargs):
+        return load()(request, *args, **kwargs)
+
+    return view
+
+
+class LazyAdminURLconf:
+    """ Stands in for an URLconf module, the admin is discovered when the resolver asks for ``urlpatterns``. """
+
+    @cached_property
+    def urlpatterns(self):
+        from django.contrib import admin
+
+        admin.autodiscover()
+        return admin.site.get_urls()
+
+
+class LazyAdminResolver(URLResolver):
+    """
+    ``path(route, admin.site.urls)`` that builds the admin URLs on the first
+    request under ``route`` or the first ``reverse('admin:...')``.
+    """
+
+    def __init__(self, route):
+        super().__init__(RoutePattern(route, is_endpoint=False), LazyAdminURLconf(), app_name='admin', namespace='admin')
+        self.wanted = False
+
+    def _populate(self):
+        # The root resolver populates every resolver under it on the first
+        # reverse(), of a namespaced one it only keeps the namespace
+        if self.wanted:
+            super()._populate()
+
+    @property
+    def reverse_dict(self):
+        self.wanted = True
+        return super().reverse_dict
+
+    @property
+    def namespace_dict(self):
+        self.wanted = True
+        return super().namespace_dict
+
+    @property
+    def app_dict(self):
+        self.wanted = True
+        return super().app_dict
@@ -0,0 +1,110 @@
+"""
+The OpenAPI document, built once per process instead of on every request.
+
+``SpectacularAPIView`` introspects every viewset and serializer on each hit
+of ``/api/schema/``. ``schema_view`` builds the document the first time it
+is asked for, or reads it from ``OPENAPI_SCHEMA_FILE`` (the committed
+``schema.json``, written by ``manage.py check_schema --write`` at deploy
+time), and then serves the bytes from memory with copies compressed in
+every encoding ``config.compression`` offers, each with an ETag of its own.
+``check_schema`` fails when the stored file no longer matches the code.
+"""
+import functools
+import hashlib
+
+import yaml
+from django.conf import settings
+from django.http import HttpResponse, HttpResponseNotModified
+from django.utils.cache import patch_vary_headers
+from django.utils.http import parse_etags, quote_etag
+from django.views.decorators.http import require_safe
+from drf_spectacular.drainage import GENERATOR_STATS
+from drf_spectacular.renderers import OpenApiJsonRenderer, OpenApiYamlRenderer
+from drf_spectacular.settings import spectacular_settings
+
+from .compression import ENCODINGS, STORED_LEVELS, compress, negotiate
+
+# format: (renderer, content type), YAML first like SpectacularAPIView
+FORMATS = {
+    'yaml': (OpenApiYamlRenderer, 'application/vnd.oai.openapi'),
+    'json': (OpenApiJsonRenderer, 'application/vnd.oai.openapi+json'),
+}
+
+
+def generate_schema():
+    """ Introspects the API the same way ``manage.py spectacular`` does. """
+    generator = spectacular_settings.DEFAULT_GENERATOR_CLASS()
+    return generator.get_schema(request=None, public=True)
+
+
+def render_schema(schema, format='yaml'):
+    renderer, _ = FORMATS[format]
+    return renderer().render(schema, renderer_context={})
+
+
+class SchemaDocument:
+    """ One rendering of the schema, with what the responses need precomputed. """
+
+    def __init__(self, content, content_type, filename):
+        self.content = content
+        self.encoded = {encoding: compress(content, encoding, STORED_LEVELS[encoding]) for encoding in ENCODINGS}
+        self.content_type = content_type
+        self.filename = filename
+        # strong ETags, so every encoding's bytes get their own
+        digest = hashlib.sha256(content).hexdigest()[:32]
+        self.etags = {None: quote_etag(digest), **{encoding: quote_etag(f'{digest}-{encoding}') for encoding in ENCODINGS}}
+
+
+@functools.cache
+def load_schema():
+    path = settings.OPENAPI_SCHEMA_FILE
+    if path:
+        with open(path, 'rb') as f:
+            return yaml.safe_load(f)
+    # the generation warnings are check_schema's business, not every worker's stderr
+    with GENERATOR_STATS.silence():
+        return generate_schema()
+
+
+@functools.cache
+def get_document(format):
+    if format == 'yaml' and settings.OPENAPI_SCHEMA_FILE:
+        with open(settings.OPENAPI_SCHEMA_FILE, 'rb') as f:
+            content = f.read()
+    else:
+        content = render_schema(load_schema(), format)
+    return SchemaDocument(content, FORMATS[format][1], f'{spectacular_settings.TITLE or "schema"}.{format}')
+
+
+def clear():
+    """ Drops the documents built so far, the next request builds them again. """
+    load_schema.cache_clear()
+    get_document.cache_clear()
+
+
+def negotiate_format(request):
+    format = request.GET.get('format')
+    if format in FORMATS:
+        return format
+    return 'json' if 'json' in request.headers.get('Accept', '') else 'yaml'
+
+
+@require_safe
+def schema_view(request):
+    document = get_document(negotiate_format(request))
+    encoding = negotiate(request.headers.get('Accept-Encoding', ''))
+
+    if document.etags[encoding] in parse_etags(request.headers.get('If-None-Match', '')):
+        response = HttpResponseNotModified()
+    elif encoding:
+        response = HttpResponse(document.encoded[encoding], content_type=document.content_type)
+        response['Content-Encoding'] = encoding
+    else:
+        response = HttpResponse(document.content, content_type=document.content_type)
+
+    response['ETag'] = document.etags[encoding]
+    response['Content-Disposition'] = f'inline; filename="{document.filename}"'
+    # the document only changes with a deploy, but clients should still revalidate
+    response['Cache-Control'] = 'no-cache'
+    patch_vary_headers(response, ('Accept', 'Accept-Encoding'))
+    return response
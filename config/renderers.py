@@ -0,0 +1,35 @@
+"""
+JSON rendering through orjson when it is installed.
+
+``FastJSONRenderer`` is DRF's ``JSONRenderer`` with compact output encoded
+by orjson, several times faster on big lists. Anything orjson doesn't
+encode natively (datetimes included, so they keep DRF's format) goes
+through DRF's ``JSONEncoder``. Indented output (the browsable API,
+``Accept: application/json; indent=2``) and installs without orjson use
+DRF's path. The values are the same, the bytes can differ in float
+spelling (``1e16`` vs ``1e+16``) and NaN, which orjson writes as null
+where DRF refuses it.
+"""
+from rest_framework.renderers import JSONRenderer
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+class FastJSONRenderer(JSONRenderer):
+    if orjson:
+        options = orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_NON_STR_KEYS
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if orjson is None or data is None or not self.compact or self.ensure_ascii:
+            return super().render(data, accepted_media_type, renderer_context)
+        if self.get_indent(accepted_media_type, renderer_context or {}) is not None:
+            return super().render(data, accepted_media_type, renderer_context)
+
+        content = orjson.dumps(data, default=self.encoder_class().default, option=self.options)
+        # like DRF, for JSON embedded in <script>
+        if b'\xe2\x80\xa8' in content or b'\xe2\x80\xa9' in content:
+            content = content.replace(b'\xe2\x80\xa8', b'\\u2028').replace(b'\xe2\x80\xa9', b'\\u2029')
+        return content
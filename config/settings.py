@@ -15,6 +15,8 @@ import os
 from pathlib import Path
 from dotenv import load_dotenv
 
+from config.db import REPLICA_DB_ALIAS, sqlite_databases
+
 load_dotenv()
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
@@ -66,14 +68,50 @@ INSTALLED_APPS = [
     'corsheaders',
 ]
 
+# Token-bucket throttling of login, registration and application creation
+# (see config/throttling.py), off for load tests from a single address
+THROTTLING = os.getenv('THROTTLING', 'True') == 'True'
+
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': (
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        'users_control.authentication.CachedJWTAuthentication',
     ),
 
     'DEFAULT_SCHEMA_CLASS': 'drf_spectacular.openapi.AutoSchema',
+
+    # orjson when it is installed, see config/renderers.py
+    'DEFAULT_RENDERER_CLASSES': (
+        'config.renderers.FastJSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ),
+
+    # '<throttle_scope>_user' is per signed-in user, '<throttle_scope>_ip' per
+    # client address, 'N/period' allows bursts of N refilled over the period
+    'DEFAULT_THROTTLE_RATES': {
+        'login_ip': '30/min',
+        'register_ip': '10/min',
+        'applications_user': '20/min',
+        'applications_ip': '120/min',
+    } if THROTTLING else {},
+
+    # Proxies in front of the app appending the client to X-Forwarded-For,
+    # 0 identifies clients by REMOTE_ADDR so the header can't be spoofed to
+    # get a fresh throttle bucket per request
+    'NUM_PROXIES': int(os.getenv('NUM_PROXIES', 0)),
 }
 
+# Default page size of the cursor-paginated list endpoints, clients can ask
+# for up to 100 rows with ?page_size=
+API_PAGE_SIZE = int(os.getenv('API_PAGE_SIZE', 20))
+
+# How many Application.index values a worker reserves at once. 1 keeps the
+# indexes dense, bigger blocks skip a database round-trip per application
+# but leave gaps when a worker exits
+APPLICATION_INDEX_BLOCK_SIZE = int(os.getenv('APPLICATION_INDEX_BLOCK_SIZE', 1))
+
+# Most applications accepted by one POST /api/my-applications/bulk/
+APPLICATION_BULK_MAX_ITEMS = int(os.getenv('APPLICATION_BULK_MAX_ITEMS', 50))
+
 SPECTACULAR_SETTINGS = {
     'TITLE': 'lookedu API',
     'DESCRIPTION': 'API for my starup project',
@@ -81,6 +119,19 @@ SPECTACULAR_SETTINGS = {
     'SERVE_INCLUDE_SCHEMA': False,
 }
 
+# Lean boot keeps the admin registry and the OpenAPI extensions out of
+# worker startup, they load on the first admin request and the first schema
+# generation (see config/lean.py, measure with `manage.py profile_startup`)
+LEAN_BOOT = os.getenv('LEAN_BOOT', 'False') == 'True'
+
+if LEAN_BOOT:
+    INSTALLED_APPS[INSTALLED_APPS.index('django.contrib.admin')] = 'django.contrib.admin.apps.SimpleAdminConfig'
+    SPECTACULAR_SETTINGS['PREPROCESSING_HOOKS'] = ['users_control.schema.load_extensions']
+
+# /api/schema/ serves this file (the committed schema.json, kept in sync with
+# `manage.py check_schema`) instead of introspecting the API once per process
+OPENAPI_SCHEMA_FILE = os.getenv('OPENAPI_SCHEMA_FILE', '')
+
 from datetime import timedelta
 
 SIMPLE_JWT = {
@@ -90,10 +141,14 @@ SIMPLE_JWT = {
     "ROTATE_REFRESH_TOKENS": True,
     "BLACKLIST_AFTER_ROTATION": True,
 
-    "AUTH_HEADER_TYPES": ("Bearer", )
+    "AUTH_HEADER_TYPES": ("Bearer", ),
+
+    "TOKEN_REFRESH_SERIALIZER": "users_control.serializers.TokenRefreshSerializer",
 }
 
 MIDDLEWARE = [
+    'config.timing.TimingMiddleware',
+    'config.compression.CompressionMiddleware',
     'corsheaders.middleware.CorsMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
@@ -104,8 +159,55 @@ MIDDLEWARE = [
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
 
+# gzip/brotli compression of GET responses of at least COMPRESSION_MIN_BYTES,
+# the response cache stores compressed copies (see config/compression.py).
+# Turn it off when a proxy in front compresses
+COMPRESS_RESPONSES = os.getenv('COMPRESS_RESPONSES', 'True') == 'True'
+COMPRESSION_MIN_BYTES = int(os.getenv('COMPRESSION_MIN_BYTES', 1024))
+
+# Share of requests timed by config.timing.TimingMiddleware (0 turns it off,
+# 1 times every request). Timed requests get Server-Timing headers, the ones
+# slower than PERF_SLOW_REQUEST_MS are written to the "config.timing" logger
+PERF_SAMPLE_RATE = float(os.getenv('PERF_SAMPLE_RATE', 0))
+PERF_SLOW_REQUEST_MS = float(os.getenv('PERF_SLOW_REQUEST_MS', 500))
+
+# The slow request log goes to PERF_SLOW_LOG_FILE, or to stderr when unset
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'handlers': {
+        'slow_requests': {
+            'class': 'logging.FileHandler', 'filename': os.getenv('PERF_SLOW_LOG_FILE'),
+        } if os.getenv('PERF_SLOW_LOG_FILE') else {
+            'class': 'logging.StreamHandler',
+        },
+    },
+    'loggers': {
+        'config.timing': {'handlers': ['slow_requests'], 'level': 'WARNING', 'propagate': False},
+    },
+}
+
 ROOT_URLCONF = 'config.urls'
 
+# Serve the hottest JSON reads from async views (see config/aio.py).
+# config/asgi.py turns it on, under WSGI each async view would get an event
+# loop of its own
+ASYNC_READ_VIEWS = os.getenv('ASYNC_READ_VIEWS', 'False') == 'True'
+
+if ASYNC_READ_VIEWS:
+    # The same middleware, with the hooks that never touch the database run on
+    # the event loop instead of a thread each (see config/aio.py)
+    MIDDLEWARE = [
+        {
+            'django.middleware.security.SecurityMiddleware': 'config.aio.SecurityMiddleware',
+            'django.middleware.common.CommonMiddleware': 'config.aio.CommonMiddleware',
+            'django.middleware.csrf.CsrfViewMiddleware': 'config.aio.CsrfViewMiddleware',
+            'django.contrib.auth.middleware.AuthenticationMiddleware': 'config.aio.AuthenticationMiddleware',
+            'django.middleware.clickjacking.XFrameOptionsMiddleware': 'config.aio.XFrameOptionsMiddleware',
+        }.get(middleware, middleware)
+        for middleware in MIDDLEWARE
+    ]
+
 TEMPLATES = [
     {
         'BACKEND': 'django.template.backends.django.DjangoTemplates',
@@ -127,13 +229,64 @@ WSGI_APPLICATION = 'config.wsgi.application'
 # Database
 # https://docs.djangoproject.com/en/6.0/ref/settings/#databases
 
-DATABASES = {
-    'default': {
-        'ENGINE': 'django.db.backends.sqlite3',
-        'NAME': BASE_DIR / 'db.sqlite3',
-    }
+# "default" is plain sqlite3. "tuned" turns on WAL and the other pragmas in
+# config/db.py, persistent connections (DB_CONN_MAX_AGE seconds) and a
+# read-only "replica" alias that safe requests read from
+DATABASE_PROFILE = os.getenv('DATABASE_PROFILE', 'default')
+DATABASES = sqlite_databases(BASE_DIR / 'db.sqlite3', DATABASE_PROFILE, int(os.getenv('DB_CONN_MAX_AGE', 600)))
+
+if REPLICA_DB_ALIAS in DATABASES:
+    DATABASE_ROUTERS = ['config.db.ReplicaRouter']
+    MIDDLEWARE = ['config.db.ReplicaMiddleware', *MIDDLEWARE]
+
+
+# Cache
+# https://docs.djangoproject.com/en/5.2/topics/cache/
+
+CACHE_BACKENDS = {
+    'locmem': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    },
+    'file': {
+        'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+        'LOCATION': os.getenv('CACHE_LOCATION', BASE_DIR / 'cache'),
+    },
+    'db': {  # needs `python manage.py createcachetable`
+        'BACKEND': 'django.core.cache.backends.db.DatabaseCache',
+        'LOCATION': os.getenv('CACHE_LOCATION', 'django_cache'),
+    },
 }
 
+CACHE_BACKEND = os.getenv('CACHE_BACKEND', 'locmem')
+
+CACHES = {
+    'default': CACHE_BACKENDS[CACHE_BACKEND],
+}
+
+# Cache alias and timeout (seconds) of the versioned list/retrieve response
+# cache, see learning_centers/caching.py. A write bumps the versions in the
+# cache of the worker handling it, with the local-memory cache the other
+# workers keep serving their entries until they expire, so they only live a
+# few seconds there. A shared backend (CACHE_BACKEND=db/file) invalidates
+# them everywhere and keeps them for an hour.
+RESPONSE_CACHE_ALIAS = 'default'
+RESPONSE_CACHE_TIMEOUT = int(os.getenv('RESPONSE_CACHE_TIMEOUT', 10 if CACHE_BACKEND == 'locmem' else 60 * 60))
+
+# Cache alias and timeout (seconds) of the users resolved from JWTs, see
+# users_control/authentication.py
+AUTH_USER_CACHE_ALIAS = 'default'
+AUTH_USER_CACHE_TIMEOUT = int(os.getenv('AUTH_USER_CACHE_TIMEOUT', 60))
+
+# Bloom filter + cache markers in front of the refresh token blacklist, see
+# users_control/blacklist.py. Only turn it on with a cache shared by all
+# workers, otherwise a token rotated in one worker stays usable in the others
+TOKEN_BLACKLIST_CACHE_ALIAS = 'default'
+TOKEN_BLACKLIST_FAST_CHECK = os.getenv('TOKEN_BLACKLIST_FAST_CHECK', 'False') == 'True'
+
+# Cache the throttle buckets are shared through, empty keeps them in each
+# worker's memory (every worker then allows the full rate on its own)
+THROTTLE_CACHE_ALIAS = os.getenv('THROTTLE_CACHE_ALIAS', '')
+
 
 # Password validation
 # https://docs.djangoproject.com/en/6.0/ref/settings/#auth-password-validators
@@ -175,9 +328,14 @@ STATIC_ROOT = BASE_DIR / "staticfiles"
 MEDIA_URL = 'media/'
 MEDIA_ROOT =  BASE_DIR / 'media'
 
+# Threads rendering the thumbnail/WebP variants of uploaded center pictures
+PICTURE_VARIANT_WORKERS = int(os.getenv('PICTURE_VARIANT_WORKERS', 2))
+
 
 AUTH_USER_MODEL = 'users_control.CustomUser'
 
+DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
+
 # Security Settings for Production
 if not DEBUG:
     SECURE_BROWSER_XSS_FILTER = True
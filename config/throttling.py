@@ -0,0 +1,152 @@
+"""
+Token-bucket throttling for the expensive endpoints.
+
+A view opts in with ``throttle_scope`` and the throttle classes. Its rates
+come from ``REST_FRAMEWORK['DEFAULT_THROTTLE_RATES']`` under
+``<scope>_user`` (``UserBucketThrottle``: the signed-in user, the address
+for anonymous requests) and ``<scope>_ip`` (``IPBucketThrottle``: the client
+address). A scope without a rate isn't throttled.
+
+A rate ``N/period`` is a bucket of ``N`` tokens refilled at ``N`` per
+period: a client can burst ``N`` requests, then gets one more every
+``period / N``. A check is one dict (or cache) read and write, unlike DRF's
+``SimpleRateThrottle`` which keeps every request time of the window.
+Rejected requests get a 429 with ``Retry-After``.
+
+A request creating several objects costs a token each: the view's
+``get_throttle_cost(request)``. It needs a full enough bucket (at most
+``N`` tokens) and may take it below zero, so a bulk larger than the burst
+still goes through and the client then waits until it is paid back.
+
+Clients are told apart by ``REMOTE_ADDR``, or the ``X-Forwarded-For``
+address ``NUM_PROXIES`` trusted proxies in front of the app appended.
+
+The buckets live in process memory, so every worker counts on its own,
+unless ``THROTTLE_CACHE_ALIAS`` names a cache shared by the workers.
+"""
+import functools
+import math
+import threading
+import time
+
+from django.conf import settings
+from django.core.cache import caches
+
+from rest_framework.settings import api_settings
+from rest_framework.throttling import BaseThrottle
+
+# buckets kept in memory per process, the least recently used are dropped
+LOCAL_MAX_KEYS = 100_000
+
+PERIODS = {'s': 1, 'm': 60, 'h': 3600, 'd': 86400}
+
+
+@functools.lru_cache
+def parse_rate(rate):
+    """ '10/min' -> (capacity 10, 10 / 60 tokens per second) """
+    count, period = rate.split('/')
+    return int(count), int(count) / PERIODS[period[0]]
+
+
+def take_tokens(tokens, cost, capacity):
+    """ Whether ``cost`` tokens can be taken, and the tokens left. """
+    allowed = tokens >= min(cost, capacity)
+    return allowed, tokens - cost if allowed else tokens
+
+
+def refill(state, capacity, per_second, now):
+    tokens, updated = state if state else (capacity, now)
+    return min(capacity, tokens + (now - updated) * per_second)
+
+
+class LocalBuckets:
+    def __init__(self, max_keys=LOCAL_MAX_KEYS):
+        self.max_keys = max_keys
+        self.buckets = {}  # key: (tokens, updated), in least recently used order
+        self.lock = threading.Lock()
+
+    def take(self, key, capacity, per_second, now, cost=1):
+        """ Takes ``cost`` tokens from the bucket, returns whether there were enough and the tokens left. """
+        with self.lock:
+            tokens = refill(self.buckets.pop(key, None), capacity, per_second, now)
+            allowed, tokens = take_tokens(tokens, cost, capacity)
+            self.buckets[key] = (tokens, now)
+            if len(self.buckets) > self.max_keys:
+                del self.buckets[next(iter(self.buckets))]
+        return allowed, tokens
+
+    def clear(self):
+        with self.lock:
+            self.buckets.clear()
+
+
+class CacheBuckets:
+    """
+    Buckets in a Django cache. Concurrent requests of one client can both
+    read the same state, so a burst may get a token or two more, like with
+    DRF's own throttles.
+    """
+
+    def __init__(self, alias):
+        self.alias = alias
+
+    def take(self, key, capacity, per_second, now, cost=1):
+        cache = caches[self.alias]
+        allowed, tokens = take_tokens(refill(cache.get(key), capacity, per_second, now), cost, capacity)
+        # a bucket left alone this long is full again, just like a missing one
+        cache.set(key, (tokens, now), math.ceil((capacity - tokens) / per_second) + 1)
+        return allowed, tokens
+
+    def clear(self):
+        pass
+
+
+_local = LocalBuckets()
+
+
+def get_buckets():
+    alias = settings.THROTTLE_CACHE_ALIAS
+    return CacheBuckets(alias) if alias else _local
+
+
+def reset():
+    """ Refills every in-memory bucket. """
+    _local.clear()
+
+
+class BucketThrottle(BaseThrottle):
+    kind = None
+    timer = time.time
+
+    def get_ident_key(self, request):
+        return self.get_ident(request)
+
+    def allow_request(self, request, view):
+        scope = getattr(view, 'throttle_scope', None)
+        rate = api_settings.DEFAULT_THROTTLE_RATES.get(f'{scope}_{self.kind}') if scope else None
+        if rate is None:
+            return True
+
+        capacity, self.per_second = parse_rate(rate)
+        cost = view.get_throttle_cost(request) if hasattr(view, 'get_throttle_cost') else 1
+        self.needed = min(cost, capacity)
+        key = f'throttle:{scope}_{self.kind}:{self.get_ident_key(request)}'
+        allowed, self.tokens = get_buckets().take(key, capacity, self.per_second, self.timer(), cost)
+        return allowed
+
+    def wait(self):
+        """ Whole seconds until the bucket holds enough tokens again. """
+        return max(1, math.ceil((self.needed - self.tokens) / self.per_second))
+
+
+class UserBucketThrottle(BucketThrottle):
+    kind = 'user'
+
+    def get_ident_key(self, request):
+        if request.user and request.user.is_authenticated:
+            return f'user-{request.user.pk}'
+        return self.get_ident(request)
+
+
+class IPBucketThrottle(BucketThrottle):
+    kind = 'ip'
@@ -0,0 +1,168 @@
+"""
+Per-request timing.
+
+``TimingMiddleware`` times a sampled share of requests (``PERF_SAMPLE_RATE``):
+database queries, authentication, serialization and the total, along with
+what ``mark`` notes, such as response cache hits. The timings go out as
+``Server-Timing`` headers, and requests slower than
+``PERF_SLOW_REQUEST_MS`` are written to the ``config.timing`` logger as one
+JSON line with their slowest queries. Requests that are not sampled only
+pay for a ``random()`` call, the query hook and ``timed`` blocks do nothing
+outside a timed request.
+"""
+import contextlib
+import contextvars
+import json
+import logging
+import random
+import time
+
+from asgiref.sync import iscoroutinefunction
+from django.conf import settings
+from django.db import connections
+from django.db.backends.signals import connection_created
+from django.utils.decorators import sync_and_async_middleware
+
+logger = logging.getLogger(__name__)
+
+# slowest queries written to the slow log per request
+SLOW_LOG_QUERIES = 5
+
+_timer = contextvars.ContextVar('request_timer', default=None)
+
+
+class RequestTimer:
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.phases = {}
+        self.queries = []  # (ms, sql)
+        self.marks = {}
+        self.depth = 0
+
+    def add(self, phase, ms):
+        self.phases[phase] = self.phases.get(phase, 0) + ms
+
+    @property
+    def total(self):
+        return (time.perf_counter() - self.started) * 1000
+
+    def server_timing(self, total):
+        db = sum(ms for ms, sql in self.queries)
+        metrics = [f'db;dur={db:.1f};desc="{len(self.queries)} queries"']
+        metrics += [f'{phase};dur={ms:.1f}' for phase, ms in self.phases.items()]
+        metrics += [f'{name};desc="{value}"' for name, value in self.marks.items()]
+        metrics.append(f'total;dur={total:.1f}')
+        return ', '.join(metrics)
+
+    def slow_log_record(self, request, response, total):
+        return {
+            'method': request.method,
+            'path': request.get_full_path(),
+            'status': response.status_code,
+            'total_ms': round(total, 1),
+            'db_ms': round(sum(ms for ms, sql in self.queries), 1),
+            'queries': len(self.queries),
+            **{f'{phase}_ms': round(ms, 1) for phase, ms in self.phases.items()},
+            **self.marks,
+            'slowest_queries': [
+                {'ms': round(ms, 1), 'sql': sql}
+                for ms, sql in sorted(self.queries, key=lambda query: query[0], reverse=True)[:SLOW_LOG_QUERIES]
+            ],
+        }
+
+
+@contextlib.contextmanager
+def timed(phase):
+    """
+    Adds the time spent in the block to ``phase`` of the current timed
+    request. Nested ``timed`` blocks only count once, in the outermost one.
+    """
+    timer = _timer.get()
+    if timer is None or timer.depth:
+        yield
+        return
+
+    timer.depth += 1
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        timer.depth -= 1
+        timer.add(phase, (time.perf_counter() - started) * 1000)
+
+
+def mark(name, value):
+    """ Sends ``value`` as the ``name`` metric of the current timed request, if any. """
+    timer = _timer.get()
+    if timer is not None:
+        timer.marks[name] = value
+
+
+class TimedSerializerMixin:
+    """ Counts ``to_representation`` as the "serialize" phase of a timed request. """
+
+    def to_representation(self, instance):
+        with timed('serialize'):
+            return super().to_representation(instance)
+
+
+def record_query(execute, sql, params, many, context):
+    timer = _timer.get()
+    if timer is None:
+        return execute(sql, params, many, context)
+
+    started = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        timer.queries.append(((time.perf_counter() - started) * 1000, sql))
+
+
+def install_query_hook(connection, **kwargs):
+    if record_query not in connection.execute_wrappers:
+        connection.execute_wrappers.append(record_query)
+
+
+connection_created.connect(install_query_hook)
+for _connection in connections.all(initialized_only=True):
+    install_query_hook(_connection)
+
+
+def start():
+    if settings.PERF_SAMPLE_RATE <= 0 or random.random() >= settings.PERF_SAMPLE_RATE:
+        return None, None
+    timer = RequestTimer()
+    return timer, _timer.set(timer)
+
+
+def finish(timer, request, response):
+    total = timer.total
+    response['Server-Timing'] = timer.server_timing(total)
+    if total >= settings.PERF_SLOW_REQUEST_MS:
+        logger.warning(json.dumps(timer.slow_log_record(request, response, total)))
+    return response
+
+
+@sync_and_async_middleware
+def TimingMiddleware(get_response):
+    if iscoroutinefunction(get_response):
+        async def middleware(request):
+            timer, token = start()
+            if timer is None:
+                return await get_response(request)
+            try:
+                response = await get_response(request)
+            finally:
+                _timer.reset(token)
+            return finish(timer, request, response)
+    else:
+        def middleware(request):
+            timer, token = start()
+            if timer is None:
+                return get_response(request)
+            try:
+                response = get_response(request)
+            finally:
+                _timer.reset(token)
+            return finish(timer, request, response)
+    return middleware
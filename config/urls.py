@@ -19,23 +19,24 @@ from django.urls import path, include
 from django.conf import settings
 from django.conf.urls.static import static
 
-from rest_framework_simplejwt.views import TokenRefreshView, TokenObtainPairView
+from rest_framework_simplejwt.views import TokenRefreshView
 # from users_control.views import CustomTokenObtainPairView
+from users_control.views import ThrottledTokenObtainPairView
 
-from drf_spectacular.views import SpectacularAPIView, SpectacularRedocView, SpectacularSwaggerView
+from config.lean import LazyAdminResolver, lazy_view
 
 
 urlpatterns = [
-    path('admin-secure-panel/', admin.site.urls),
-    path('api/token/', TokenObtainPairView.as_view(), name='token_obtain_pair'),
+    LazyAdminResolver('admin-secure-panel/') if settings.LEAN_BOOT else path('admin-secure-panel/', admin.site.urls),
+    path('api/token/', ThrottledTokenObtainPairView.as_view(), name='token_obtain_pair'),
     path('api/token/refresh/', TokenRefreshView.as_view(), name='token_refresh'),
 
     path('api/', include('learning_centers.urls')),
     path('', include('users_control.urls')),
 
-    path('api/schema/', SpectacularAPIView.as_view(), name='schema'),
-    path('api/schema/swagger-ui/', SpectacularSwaggerView.as_view(url_name='schema'), name='swagger-ui'),
-    path('api/schema/redoc/', SpectacularRedocView.as_view(url_name='schema'), name='redoc')
+    path('api/schema/', lazy_view('config.openapi.schema_view'), name='schema'),
+    path('api/schema/swagger-ui/', lazy_view('drf_spectacular.views.SpectacularSwaggerView', url_name='schema'), name='swagger-ui'),
+    path('api/schema/redoc/', lazy_view('drf_spectacular.views.SpectacularRedocView', url_name='schema'), name='redoc')
 ]
 
 if settings.DEBUG:
@@ -1,9 +1,29 @@
 import api from './http';
 import { components } from './generated/schema';
 
+// Relations come back as ids unless they are listed in `?expand=`, this narrows them to the embedded objects.
+type Expanded<T, K extends keyof T> = Omit<T, K> & {
+    [P in K]: T[P] extends (infer U)[] ? Exclude<U, number>[] : Exclude<T[P], number>;
+};
+
 type EduceterList = components['schemas']['CentersList'];
-type EduceterDetail = components['schemas']['CentersRetrieve'];
 type UserProfile = components['schemas']['UserShort'];
+export type EduceterDetail = Expanded<components['schemas']['CentersRetrieve'], 'courses'>;
+export type Application = Expanded<components['schemas']['Applications'], 'center' | 'course'>;
+
+export type Page<T> = { next: string | null; previous: string | null; results: T[] };
+
+// List endpoints are cursor paginated, `next` is an absolute URL or null.
+const listAll = async <T>(url: string): Promise<T[]> => {
+    const items: T[] = [];
+    let next: string | null = url;
+    while (next) {
+        const { data }: { data: Page<T> } = await api.get<Page<T>>(next);
+        items.push(...data.results);
+        next = data.next;
+    }
+    return items;
+};
 
 export const apiClient = {
     auth: {
@@ -13,8 +33,9 @@ export const apiClient = {
         logout: (refresh: string) => api.post('/user/logout/', { refresh }),
     },
     educenters: {
-        list: () => api.get<EduceterList[]>('/api/educenters/'),
-        get: (slug: string) => api.get<EduceterDetail>(`/api/educenters/${slug}/`),
+        list: (cursorUrl?: string) => api.get<Page<EduceterList>>(cursorUrl || '/api/educenters/'),
+        search: (q: string) => api.get<Page<EduceterList>>('/api/educenters/search/', { params: { q } }),
+        get: (slug: string) => api.get<EduceterDetail>(`/api/educenters/${slug}/`, { params: { expand: 'courses' } }),
         create: (data: any) => api.post('/api/educenters/', data),
         delete: (slug: string) => api.delete(`/api/educenters/${slug}/`),
     },
@@ -22,13 +43,14 @@ export const apiClient = {
         me: () => api.get<UserProfile>('/api/me/'),
     },
     applications: {
-        list: () => api.get<any[]>('/api/my-applications/'),
-        get: (index: number) => api.get<any>(`/api/my-applications/${index}/`),
+        list: () => listAll<Application>('/api/my-applications/?expand=center,course'),
+        get: (index: number) =>
+            api.get<Application>(`/api/my-applications/${index}/`, { params: { expand: 'center,course' } }),
         create: (data: { center_id: number; course_id: number; content?: string }) =>
             api.post('/api/my-applications/', data),
         delete: (index: number) => api.delete(`/api/my-applications/${index}/`),
     },
     courses: {
-        list: () => api.get<any[]>('/api/courses/'),
+        list: () => listAll<any>('/api/courses/'),
     },
 };
@@ -4,6 +4,22 @@
  */
 
 export interface paths {
+    "/api/cache-stats/": {
+        parameters: {
+            query?: never;
+            header?: never;
+            path?: never;
+            cookie?: never;
+        };
+        get: operations["api_cache_stats_retrieve"];
+        put?: never;
+        post?: never;
+        delete?: never;
+        options?: never;
+        head?: never;
+        patch?: never;
+        trace?: never;
+    };
     "/api/courses/": {
         parameters: {
             query?: never;
@@ -11,8 +27,24 @@ export interface paths {
             path?: never;
             cookie?: never;
         };
+        /**
+         * @description Serves ``list``/``retrieve`` JSON responses from the response cache.
+         *
+         *     Entries are keyed by the absolute URL and the versions of
+         *     ``cache_models``, which the signals bump on every write, so they never
+         *     need to be deleted. Every cached response carries a strong ETag and a
+         *     matching ``If-None-Match`` is answered with 304.
+         */
         get: operations["api_courses_list"];
         put?: never;
+        /**
+         * @description Serves ``list``/``retrieve`` JSON responses from the response cache.
+         *
+         *     Entries are keyed by the absolute URL and the versions of
+         *     ``cache_models``, which the signals bump on every write, so they never
+         *     need to be deleted. Every cached response carries a strong ETag and a
+         *     matching ``If-None-Match`` is answered with 304.
+         */
         post: operations["api_courses_create"];
         delete?: never;
         options?: never;
@@ -27,12 +59,44 @@ export interface paths {
             path?: never;
             cookie?: never;
         };
+        /**
+         * @description Serves ``list``/``retrieve`` JSON responses from the response cache.
+         *
+         *     Entries are keyed by the absolute URL and the versions of
+         *     ``cache_models``, which the signals bump on every write, so they never
+         *     need to be deleted. Every cached response carries a strong ETag and a
+         *     matching ``If-None-Match`` is answered with 304.
+         */
         get: operations["api_courses_retrieve"];
+        /**
+         * @description Serves ``list``/``retrieve`` JSON responses from the response cache.
+         *
+         *     Entries are keyed by the absolute URL and the versions of
+         *     ``cache_models``, which the signals bump on every write, so they never
+         *     need to be deleted. Every cached response carries a strong ETag and a
+         *     matching ``If-None-Match`` is answered with 304.
+         */
         put: operations["api_courses_update"];
         post?: never;
+        /**
+         * @description Serves ``list``/``retrieve`` JSON responses from the response cache.
+         *
+         *     Entries are keyed by the absolute URL and the versions of
+         *     ``cache_models``, which the signals bump on every write, so they never
+         *     need to be deleted. Every cached response carries a strong ETag and a
+         *     matching ``If-None-Match`` is answered with 304.
+         */
         delete: operations["api_courses_destroy"];
         options?: never;
         head?: never;
+        /**
+         * @description Serves ``list``/``retrieve`` JSON responses from the response cache.
+         *
+         *     Entries are keyed by the absolute URL and the versions of
+         *     ``cache_models``, which the signals bump on every write, so they never
+         *     need to be deleted. Every cached response carries a strong ETag and a
+         *     matching ``If-None-Match`` is answered with 304.
+         */
         patch: operations["api_courses_partial_update"];
         trace?: never;
     };
@@ -43,8 +107,24 @@ export interface paths {
             path?: never;
             cookie?: never;
         };
+        /**
+         * @description Serves ``list``/``retrieve`` JSON responses from the response cache.
+         *
+         *     Entries are keyed by the absolute URL and the versions of
+         *     ``cache_models``, which the signals bump on every write, so they never
+         *     need to be deleted. Every cached response carries a strong ETag and a
+         *     matching ``If-None-Match`` is answered with 304.
+         */
         get: operations["api_educenters_list"];
         put?: never;
+        /**
+         * @description Serves ``list``/``retrieve`` JSON responses from the response cache.
+         *
+         *     Entries are keyed by the absolute URL and the versions of
+         *     ``cache_models``, which the signals bump on every write, so they never
+         *     need to be deleted. Every cached response carries a strong ETag and a
+         *     matching ``If-None-Match`` is answered with 304.
+         */
         post: operations["api_educenters_create"];
         delete?: never;
         options?: never;
@@ -59,15 +139,112 @@ export interface paths {
             path?: never;
             cookie?: never;
         };
+        /**
+         * @description Serves ``list``/``retrieve`` JSON responses from the response cache.
+         *
+         *     Entries are keyed by the absolute URL and the versions of
+         *     ``cache_models``, which the signals bump on every write, so they never
+         *     need to be deleted. Every cached response carries a strong ETag and a
+         *     matching ``If-None-Match`` is answered with 304.
+         */
         get: operations["api_educenters_retrieve"];
+        /**
+         * @description Serves ``list``/``retrieve`` JSON responses from the response cache.
+         *
+         *     Entries are keyed by the absolute URL and the versions of
+         *     ``cache_models``, which the signals bump on every write, so they never
+         *     need to be deleted. Every cached response carries a strong ETag and a
+         *     matching ``If-None-Match`` is answered with 304.
+         */
         put: operations["api_educenters_update"];
         post?: never;
+        /**
+         * @description Serves ``list``/``retrieve`` JSON responses from the response cache.
+         *
+         *     Entries are keyed by the absolute URL and the versions of
+         *     ``cache_models``, which the signals bump on every write, so they never
+         *     need to be deleted. Every cached response carries a strong ETag and a
+         *     matching ``If-None-Match`` is answered with 304.
+         */
         delete: operations["api_educenters_destroy"];
         options?: never;
         head?: never;
+        /**
+         * @description Serves ``list``/``retrieve`` JSON responses from the response cache.
+         *
+         *     Entries are keyed by the absolute URL and the versions of
+         *     ``cache_models``, which the signals bump on every write, so they never
+         *     need to be deleted. Every cached response carries a strong ETag and a
+         *     matching ``If-None-Match`` is answered with 304.
+         */
         patch: operations["api_educenters_partial_update"];
         trace?: never;
     };
+    "/api/educenters/{slug}/stats/": {
+        parameters: {
+            query?: never;
+            header?: never;
+            path?: never;
+            cookie?: never;
+        };
+        /**
+         * @description Serves ``list``/``retrieve`` JSON responses from the response cache.
+         *
+         *     Entries are keyed by the absolute URL and the versions of
+         *     ``cache_models``, which the signals bump on every write, so they never
+         *     need to be deleted. Every cached response carries a strong ETag and a
+         *     matching ``If-None-Match`` is answered with 304.
+         */
+        get: operations["api_educenters_stats_retrieve"];
+        put?: never;
+        post?: never;
+        delete?: never;
+        options?: never;
+        head?: never;
+        patch?: never;
+        trace?: never;
+    };
+    "/api/educenters/nearby/": {
+        parameters: {
+            query?: never;
+            header?: never;
+            path?: never;
+            cookie?: never;
+        };
+        /** @description Centers nearest to ``lat``/``lng``, the closest first, see geo.py. */
+        get: operations["api_educenters_nearby_list"];
+        put?: never;
+        post?: never;
+        delete?: never;
+        options?: never;
+        head?: never;
+        patch?: never;
+        trace?: never;
+    };
+    "/api/educenters/search/": {
+        parameters: {
+            query?: never;
+            header?: never;
+            path?: never;
+            cookie?: never;
+        };
+        /**
+         * @description Serves ``list``/``retrieve`` JSON responses from the response cache.
+         *
+         *     Entries are keyed by the absolute URL and the versions of
+         *     ``cache_models``, which the signals bump on every write, so they never
+         *     need to be deleted. Every cached response carries a strong ETag and a
+         *     matching ``If-None-Match`` is answered with 304.
+         */
+        get: operations["api_educenters_search_retrieve"];
+        put?: never;
+        post?: never;
+        delete?: never;
+        options?: never;
+        head?: never;
+        patch?: never;
+        trace?: never;
+    };
     "/api/me/": {
         parameters: {
             query?: never;
@@ -116,6 +293,39 @@ export interface paths {
         patch: operations["api_my_applications_partial_update"];
         trace?: never;
     };
+    "/api/my-applications/bulk/": {
+        parameters: {
+            query?: never;
+            header?: never;
+            path?: never;
+            cookie?: never;
+        };
+        get?: never;
+        put?: never;
+        post: operations["api_my_applications_bulk_create"];
+        delete?: never;
+        options?: never;
+        head?: never;
+        patch?: never;
+        trace?: never;
+    };
+    "/api/received-applications/export/": {
+        parameters: {
+            query?: never;
+            header?: never;
+            path?: never;
+            cookie?: never;
+        };
+        /** @description Streams the applications received by the user's centers as CSV (default) or NDJSON. */
+        get: operations["api_received_applications_export_retrieve"];
+        put?: never;
+        post?: never;
+        delete?: never;
+        options?: never;
+        head?: never;
+        patch?: never;
+        trace?: never;
+    };
     "/api/token/": {
         parameters: {
             query?: never;
@@ -194,9 +404,9 @@ export interface components {
     schemas: {
         Applications: {
             readonly id: number;
-            readonly owner: components["schemas"]["UserShort"];
-            readonly center: components["schemas"]["CentersRetrieve"];
-            readonly course: components["schemas"]["Courses"];
+            readonly owner: number | components["schemas"]["UserShort"];
+            readonly center: number | components["schemas"]["CentersRetrieve"];
+            readonly course: number | components["schemas"]["Courses"];
             content?: string | null;
             readonly index: number | null;
             center_id: number;
@@ -204,6 +414,46 @@ export interface components {
             /** Format: date-time */
             readonly created_date: string;
         };
+        /**
+         * @description Several applications in one request.
+         *
+         *     Centers and courses are looked up with one query per model, the indexes
+         *     are reserved as one block and the rows are inserted with a single
+         *     ``bulk_create``. Items pointing at a missing center or course are
+         *     reported in ``results`` and the others are still created.
+         */
+        ApplicationsBulk: {
+            applications: components["schemas"]["ApplicationsBulkItem"][];
+        };
+        ApplicationsBulkItem: {
+            center_id: number;
+            course_id: number;
+            content?: string | null;
+        };
+        ApplicationsBulkResult: {
+            created: number;
+            failed: number;
+            results: {
+                [key: string]: unknown;
+            }[];
+        };
+        /** @description Counts ``to_representation`` as the "serialize" phase of a timed request. */
+        CenterStats: {
+            /** Format: date */
+            since: string;
+            /** Format: date */
+            until: string;
+            total: number;
+            period_total: number;
+            previous_period_total: number;
+            /**
+             * Format: double
+             * @description Change of period_total against previous_period_total
+             */
+            trend: number | null;
+            courses: components["schemas"]["CourseCount"][];
+            daily: components["schemas"]["DailyCount"][];
+        };
         CentersList: {
             readonly id: number;
             name: string;
@@ -212,15 +462,40 @@ export interface components {
             phone_number?: string | null;
             /** Format: uri */
             picture?: string | null;
+            readonly picture_variants: components["schemas"]["PictureVariants"];
+            /** Format: int64 */
+            cost?: number | null;
+            readonly detail_url: string;
+            readonly owner: number | null;
+        };
+        CentersNearby: {
+            readonly id: number;
+            name: string;
+            slug?: string | null;
+            info?: string | null;
+            phone_number?: string | null;
+            /** Format: uri */
+            picture?: string | null;
+            readonly picture_variants: components["schemas"]["PictureVariants"];
+            /** Format: int64 */
+            cost?: number | null;
             readonly detail_url: string;
+            readonly owner: number | null;
+            /** Format: double */
+            latitude?: number | null;
+            /** Format: double */
+            longitude?: number | null;
+            /** Format: double */
+            readonly distance_km: number;
         };
         CentersRetrieve: {
             readonly id: number;
             name: string;
+            readonly slug: string | null;
             info?: string | null;
             phone_number?: string | null;
             phone_number_extra?: string | null;
-            readonly courses: components["schemas"]["Courses"][];
+            readonly courses: (number | components["schemas"]["Courses"])[];
             /** Format: int64 */
             cost?: number | null;
             /** Format: uri */
@@ -228,17 +503,78 @@ export interface components {
             /** Format: uri */
             picture?: string | null;
             course_ids: number[];
+            /** Format: double */
+            latitude?: number | null;
+            /** Format: double */
+            longitude?: number | null;
+        };
+        CourseCount: {
+            course_id: number;
+            course: string;
+            count: number;
         };
         Courses: {
             readonly id: number;
             title: string;
             slug?: string | null;
         };
+        /** @description A course with its counters, for the course endpoints (centers embed the plain one). */
+        CoursesDetail: {
+            readonly id: number;
+            title: string;
+            slug?: string | null;
+            readonly centers_count: number;
+            readonly applications_count: number;
+        };
+        DailyCount: {
+            /** Format: date */
+            day: string;
+            count: number;
+        };
+        PaginatedApplicationsList: {
+            /**
+             * Format: uri
+             * @example http://api.example.org/accounts/?cursor=cD00ODY%3D"
+             */
+            next?: string | null;
+            /**
+             * Format: uri
+             * @example http://api.example.org/accounts/?cursor=cj0xJnA9NDg3
+             */
+            previous?: string | null;
+            results: components["schemas"]["Applications"][];
+        };
+        PaginatedCentersListList: {
+            /**
+             * Format: uri
+             * @example http://api.example.org/accounts/?cursor=cD00ODY%3D"
+             */
+            next?: string | null;
+            /**
+             * Format: uri
+             * @example http://api.example.org/accounts/?cursor=cj0xJnA9NDg3
+             */
+            previous?: string | null;
+            results: components["schemas"]["CentersList"][];
+        };
+        PaginatedCoursesDetailList: {
+            /**
+             * Format: uri
+             * @example http://api.example.org/accounts/?cursor=cD00ODY%3D"
+             */
+            next?: string | null;
+            /**
+             * Format: uri
+             * @example http://api.example.org/accounts/?cursor=cj0xJnA9NDg3
+             */
+            previous?: string | null;
+            results: components["schemas"]["CoursesDetail"][];
+        };
         PatchedApplications: {
             readonly id?: number;
-            readonly owner?: components["schemas"]["UserShort"];
-            readonly center?: components["schemas"]["CentersRetrieve"];
-            readonly course?: components["schemas"]["Courses"];
+            readonly owner?: number | components["schemas"]["UserShort"];
+            readonly center?: number | components["schemas"]["CentersRetrieve"];
+            readonly course?: number | components["schemas"]["Courses"];
             content?: string | null;
             readonly index?: number | null;
             center_id?: number;
@@ -249,10 +585,11 @@ export interface components {
         PatchedCentersRetrieve: {
             readonly id?: number;
             name?: string;
+            readonly slug?: string | null;
             info?: string | null;
             phone_number?: string | null;
             phone_number_extra?: string | null;
-            readonly courses?: components["schemas"]["Courses"][];
+            readonly courses?: (number | components["schemas"]["Courses"])[];
             /** Format: int64 */
             cost?: number | null;
             /** Format: uri */
@@ -260,11 +597,27 @@ export interface components {
             /** Format: uri */
             picture?: string | null;
             course_ids?: number[];
+            /** Format: double */
+            latitude?: number | null;
+            /** Format: double */
+            longitude?: number | null;
         };
-        PatchedCourses: {
+        /** @description A course with its counters, for the course endpoints (centers embed the plain one). */
+        PatchedCoursesDetail: {
             readonly id?: number;
             title?: string;
             slug?: string | null;
+            readonly centers_count?: number;
+            readonly applications_count?: number;
+        };
+        /** @description URLs of the resized copies of the picture (images.VARIANTS), missing until they are rendered. */
+        PictureVariants: {
+            /** Format: uri */
+            thumbnail?: string;
+            /** Format: uri */
+            thumbnail_webp?: string;
+            /** Format: uri */
+            medium_webp?: string;
         };
         TokenObtainPair: {
             username: string;
@@ -287,6 +640,7 @@ export interface components {
              * Format: email
              */
             email?: string;
+            have_right_to_add?: boolean;
         };
     };
     responses: never;
@@ -297,7 +651,7 @@ export interface components {
 }
 export type $defs = Record<string, never>;
 export interface operations {
-    api_courses_list: {
+    api_cache_stats_retrieve: {
         parameters: {
             query?: never;
             header?: never;
@@ -305,13 +659,40 @@ export interface operations {
             cookie?: never;
         };
         requestBody?: never;
+        responses: {
+            /** @description No response body */
+            200: {
+                headers: {
+                    [name: string]: unknown;
+                };
+                content?: never;
+            };
+        };
+    };
+    api_courses_list: {
+        parameters: {
+            query?: {
+                /** @description The pagination cursor value. */
+                cursor?: string;
+                /** @description Comma-separated fields to render, `relation.field` for fields of an expanded relation */
+                fields?: string;
+                /** @description Number of results to return per page. */
+                page_size?: number;
+                /** @description popular: most applications first, centers: taught by the most centers first */
+                sort?: "centers" | "popular";
+            };
+            header?: never;
+            path?: never;
+            cookie?: never;
+        };
+        requestBody?: never;
         responses: {
             200: {
                 headers: {
                     [name: string]: unknown;
                 };
                 content: {
-                    "application/json": components["schemas"]["Courses"][];
+                    "application/json": components["schemas"]["PaginatedCoursesDetailList"];
                 };
             };
         };
@@ -325,9 +706,9 @@ export interface operations {
         };
         requestBody: {
             content: {
-                "application/json": components["schemas"]["Courses"];
-                "application/x-www-form-urlencoded": components["schemas"]["Courses"];
-                "multipart/form-data": components["schemas"]["Courses"];
+                "application/json": components["schemas"]["CoursesDetail"];
+                "application/x-www-form-urlencoded": components["schemas"]["CoursesDetail"];
+                "multipart/form-data": components["schemas"]["CoursesDetail"];
             };
         };
         responses: {
@@ -336,14 +717,17 @@ export interface operations {
                     [name: string]: unknown;
                 };
                 content: {
-                    "application/json": components["schemas"]["Courses"];
+                    "application/json": components["schemas"]["CoursesDetail"];
                 };
             };
         };
     };
     api_courses_retrieve: {
         parameters: {
-            query?: never;
+            query?: {
+                /** @description Comma-separated fields to render, `relation.field` for fields of an expanded relation */
+                fields?: string;
+            };
             header?: never;
             path: {
                 slug: string;
@@ -357,7 +741,7 @@ export interface operations {
                     [name: string]: unknown;
                 };
                 content: {
-                    "application/json": components["schemas"]["Courses"];
+                    "application/json": components["schemas"]["CoursesDetail"];
                 };
             };
         };
@@ -373,9 +757,9 @@ export interface operations {
         };
         requestBody: {
             content: {
-                "application/json": components["schemas"]["Courses"];
-                "application/x-www-form-urlencoded": components["schemas"]["Courses"];
-                "multipart/form-data": components["schemas"]["Courses"];
+                "application/json": components["schemas"]["CoursesDetail"];
+                "application/x-www-form-urlencoded": components["schemas"]["CoursesDetail"];
+                "multipart/form-data": components["schemas"]["CoursesDetail"];
             };
         };
         responses: {
@@ -384,7 +768,7 @@ export interface operations {
                     [name: string]: unknown;
                 };
                 content: {
-                    "application/json": components["schemas"]["Courses"];
+                    "application/json": components["schemas"]["CoursesDetail"];
                 };
             };
         };
@@ -420,9 +804,9 @@ export interface operations {
         };
         requestBody?: {
             content: {
-                "application/json": components["schemas"]["PatchedCourses"];
-                "application/x-www-form-urlencoded": components["schemas"]["PatchedCourses"];
-                "multipart/form-data": components["schemas"]["PatchedCourses"];
+                "application/json": components["schemas"]["PatchedCoursesDetail"];
+                "application/x-www-form-urlencoded": components["schemas"]["PatchedCoursesDetail"];
+                "multipart/form-data": components["schemas"]["PatchedCoursesDetail"];
             };
         };
         responses: {
@@ -431,14 +815,21 @@ export interface operations {
                     [name: string]: unknown;
                 };
                 content: {
-                    "application/json": components["schemas"]["Courses"];
+                    "application/json": components["schemas"]["CoursesDetail"];
                 };
             };
         };
     };
     api_educenters_list: {
         parameters: {
-            query?: never;
+            query?: {
+                /** @description The pagination cursor value. */
+                cursor?: string;
+                /** @description Comma-separated fields to render, `relation.field` for fields of an expanded relation */
+                fields?: string;
+                /** @description Number of results to return per page. */
+                page_size?: number;
+            };
             header?: never;
             path?: never;
             cookie?: never;
@@ -450,7 +841,7 @@ export interface operations {
                     [name: string]: unknown;
                 };
                 content: {
-                    "application/json": components["schemas"]["CentersList"][];
+                    "application/json": components["schemas"]["PaginatedCentersListList"];
                 };
             };
         };
@@ -464,9 +855,9 @@ export interface operations {
         };
         requestBody: {
             content: {
-                "application/json": components["schemas"]["CentersRetrieve"];
-                "application/x-www-form-urlencoded": components["schemas"]["CentersRetrieve"];
                 "multipart/form-data": components["schemas"]["CentersRetrieve"];
+                "application/x-www-form-urlencoded": components["schemas"]["CentersRetrieve"];
+                "application/json": components["schemas"]["CentersRetrieve"];
             };
         };
         responses: {
@@ -482,7 +873,12 @@ export interface operations {
     };
     api_educenters_retrieve: {
         parameters: {
-            query?: never;
+            query?: {
+                /** @description Comma-separated relations to embed instead of their ids: courses */
+                expand?: string;
+                /** @description Comma-separated fields to render, `relation.field` for fields of an expanded relation */
+                fields?: string;
+            };
             header?: never;
             path: {
                 slug: string;
@@ -512,9 +908,9 @@ export interface operations {
         };
         requestBody: {
             content: {
-                "application/json": components["schemas"]["CentersRetrieve"];
-                "application/x-www-form-urlencoded": components["schemas"]["CentersRetrieve"];
                 "multipart/form-data": components["schemas"]["CentersRetrieve"];
+                "application/x-www-form-urlencoded": components["schemas"]["CentersRetrieve"];
+                "application/json": components["schemas"]["CentersRetrieve"];
             };
         };
         responses: {
@@ -559,9 +955,9 @@ export interface operations {
         };
         requestBody?: {
             content: {
-                "application/json": components["schemas"]["PatchedCentersRetrieve"];
-                "application/x-www-form-urlencoded": components["schemas"]["PatchedCentersRetrieve"];
                 "multipart/form-data": components["schemas"]["PatchedCentersRetrieve"];
+                "application/x-www-form-urlencoded": components["schemas"]["PatchedCentersRetrieve"];
+                "application/json": components["schemas"]["PatchedCentersRetrieve"];
             };
         };
         responses: {
@@ -575,27 +971,112 @@ export interface operations {
             };
         };
     };
+    api_educenters_stats_retrieve: {
+        parameters: {
+            query?: {
+                days?: number;
+            };
+            header?: never;
+            path: {
+                slug: string;
+            };
+            cookie?: never;
+        };
+        requestBody?: never;
+        responses: {
+            200: {
+                headers: {
+                    [name: string]: unknown;
+                };
+                content: {
+                    "application/json": components["schemas"]["CenterStats"];
+                };
+            };
+        };
+    };
+    api_educenters_nearby_list: {
+        parameters: {
+            query: {
+                lat: number;
+                limit?: number;
+                lng: number;
+                /** @description Kilometres. Without it the `limit` nearest centers are returned, however far */
+                radius?: number;
+            };
+            header?: never;
+            path?: never;
+            cookie?: never;
+        };
+        requestBody?: never;
+        responses: {
+            200: {
+                headers: {
+                    [name: string]: unknown;
+                };
+                content: {
+                    "application/json": components["schemas"]["CentersNearby"][];
+                };
+            };
+        };
+    };
+    api_educenters_search_retrieve: {
+        parameters: {
+            query: {
+                cost_max?: number;
+                cost_min?: number;
+                course?: string;
+                q: string;
+            };
+            header?: never;
+            path?: never;
+            cookie?: never;
+        };
+        requestBody?: never;
+        responses: {
+            200: {
+                headers: {
+                    [name: string]: unknown;
+                };
+                content: {
+                    "application/json": components["schemas"]["CentersList"];
+                };
+            };
+        };
+    };
     api_me_retrieve: {
         parameters: {
-            query?: never;
+            query?: {
+                /** @description Comma-separated fields to render, `relation.field` for fields of an expanded relation */
+                fields?: string;
+            };
             header?: never;
             path?: never;
             cookie?: never;
         };
         requestBody?: never;
         responses: {
-            /** @description No response body */
             200: {
                 headers: {
                     [name: string]: unknown;
                 };
-                content?: never;
+                content: {
+                    "application/json": components["schemas"]["UserShort"];
+                };
             };
         };
     };
     api_my_applications_list: {
         parameters: {
-            query?: never;
+            query?: {
+                /** @description The pagination cursor value. */
+                cursor?: string;
+                /** @description Comma-separated relations to embed instead of their ids: owner, center, course */
+                expand?: string;
+                /** @description Comma-separated fields to render, `relation.field` for fields of an expanded relation */
+                fields?: string;
+                /** @description Number of results to return per page. */
+                page_size?: number;
+            };
             header?: never;
             path?: never;
             cookie?: never;
@@ -607,7 +1088,7 @@ export interface operations {
                     [name: string]: unknown;
                 };
                 content: {
-                    "application/json": components["schemas"]["Applications"][];
+                    "application/json": components["schemas"]["PaginatedApplicationsList"];
                 };
             };
         };
@@ -639,7 +1120,12 @@ export interface operations {
     };
     api_my_applications_retrieve: {
         parameters: {
-            query?: never;
+            query?: {
+                /** @description Comma-separated relations to embed instead of their ids: owner, center, course */
+                expand?: string;
+                /** @description Comma-separated fields to render, `relation.field` for fields of an expanded relation */
+                fields?: string;
+            };
             header?: never;
             path: {
                 index: number;
@@ -732,6 +1218,63 @@ export interface operations {
             };
         };
     };
+    api_my_applications_bulk_create: {
+        parameters: {
+            query?: never;
+            header?: never;
+            path?: never;
+            cookie?: never;
+        };
+        requestBody: {
+            content: {
+                "application/json": components["schemas"]["ApplicationsBulk"];
+                "application/x-www-form-urlencoded": components["schemas"]["ApplicationsBulk"];
+                "multipart/form-data": components["schemas"]["ApplicationsBulk"];
+            };
+        };
+        responses: {
+            201: {
+                headers: {
+                    [name: string]: unknown;
+                };
+                content: {
+                    "application/json": components["schemas"]["ApplicationsBulkResult"];
+                };
+            };
+            400: {
+                headers: {
+                    [name: string]: unknown;
+                };
+                content: {
+                    "application/json": components["schemas"]["ApplicationsBulkResult"];
+                };
+            };
+        };
+    };
+    api_received_applications_export_retrieve: {
+        parameters: {
+            query?: {
+                /** @description Only the applications of this center (slug) */
+                center?: string;
+                format?: "csv" | "ndjson";
+            };
+            header?: never;
+            path?: never;
+            cookie?: never;
+        };
+        requestBody?: never;
+        responses: {
+            200: {
+                headers: {
+                    [name: string]: unknown;
+                };
+                content: {
+                    "text/csv": string;
+                    "application/x-ndjson": string;
+                };
+            };
+        };
+    };
     api_token_create: {
         parameters: {
             query?: never;
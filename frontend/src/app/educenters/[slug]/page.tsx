@@ -1,19 +1,16 @@
 'use client';
 
 import { useEffect, useState } from 'react';
-import { apiClient } from '@/api/client';
-import { components } from '@/api/generated/schema';
+import { apiClient, EduceterDetail } from '@/api/client';
 import { useParams, useRouter } from 'next/navigation';
 import Link from 'next/link';
 import { Loader2, ArrowLeft, Phone, MapPin, Info, Users, BookOpen, ExternalLink } from 'lucide-react';
 import { motion, AnimatePresence } from 'framer-motion';
 
-type Educeter = components['schemas']['CentersRetrieve'];
-
 export default function EduceterDetailPage() {
     const { slug } = useParams();
     const router = useRouter();
-    const [center, setCenter] = useState<Educeter | null>(null);
+    const [center, setCenter] = useState<EduceterDetail | null>(null);
     const [isLoading, setIsLoading] = useState(true);
     const [error, setError] = useState<string | null>(null);
 
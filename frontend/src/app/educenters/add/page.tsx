@@ -40,7 +40,7 @@ export default function AddEducenterPage() {
     useEffect(() => {
         const fetchCourses = async () => {
             try {
-                const { data } = await apiClient.courses.list();
+                const data = await apiClient.courses.list();
                 setCourses(data);
             } catch (err) {
                 console.error('Failed to load courses', err);
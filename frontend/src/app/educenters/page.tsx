@@ -20,13 +20,16 @@ export default function EducetersListPage() {
     const [isLoading, setIsLoading] = useState(true);
     const [error, setError] = useState<string | null>(null);
     const [searchQuery, setSearchQuery] = useState('');
+    const [nextPage, setNextPage] = useState<string | null>(null);
+    const [isLoadingMore, setIsLoadingMore] = useState(false);
 
     useEffect(() => {
         const fetchCenters = async () => {
             try {
                 const { data } = await apiClient.educenters.list();
-                setCenters(data);
-                setFilteredCenters(data);
+                setCenters(data.results);
+                setFilteredCenters(data.results);
+                setNextPage(data.next);
             } catch (err: any) {
                 setError('Failed to load educational centers.');
             } finally {
@@ -36,12 +39,35 @@ export default function EducetersListPage() {
         fetchCenters();
     }, []);
 
+    const loadMore = async () => {
+        if (!nextPage) return;
+        setIsLoadingMore(true);
+        try {
+            const { data } = await apiClient.educenters.list(nextPage);
+            setCenters(prev => [...prev, ...data.results]);
+            setNextPage(data.next);
+        } catch (err: any) {
+            toast.error('Failed to load more centers.');
+        } finally {
+            setIsLoadingMore(false);
+        }
+    };
+
     useEffect(() => {
-        const filtered = centers.filter(c =>
-            c.name.toLowerCase().includes(searchQuery.toLowerCase()) ||
-            (c.info && c.info.toLowerCase().includes(searchQuery.toLowerCase()))
-        );
-        setFilteredCenters(filtered);
+        const query = searchQuery.trim();
+        if (!query) {
+            setFilteredCenters(centers);
+            return;
+        }
+        const timeout = setTimeout(async () => {
+            try {
+                const { data } = await apiClient.educenters.search(query);
+                setFilteredCenters(data.results);
+            } catch (err: any) {
+                toast.error('Search failed.');
+            }
+        }, 300);
+        return () => clearTimeout(timeout);
     }, [searchQuery, centers]);
 
     const handleAddClick = () => {
@@ -187,7 +213,7 @@ export default function EducetersListPage() {
                                     <div className="relative h-56 overflow-hidden">
                                         {center.picture ? (
                                             <img
-                                                src={center.picture}
+                                                src={center.picture_variants.medium_webp || center.picture}
                                                 alt={center.name}
                                                 className="h-full w-full object-cover transition-transform duration-500 group-hover:scale-110"
                                             />
@@ -252,6 +278,19 @@ export default function EducetersListPage() {
                         </motion.div>
                     )}
                 </AnimatePresence>
+
+                {nextPage && !searchQuery.trim() && (
+                    <div className="mt-12 flex justify-center">
+                        <button
+                            onClick={loadMore}
+                            disabled={isLoadingMore}
+                            className="flex items-center space-x-2 rounded-2xl bg-gray-900 px-8 py-4 text-md font-black text-white hover:bg-gray-800 transition-all disabled:opacity-50 dark:bg-indigo-600 dark:hover:bg-indigo-700"
+                        >
+                            {isLoadingMore && <Loader2 className="h-5 w-5 animate-spin" />}
+                            <span>Load more</span>
+                        </button>
+                    </div>
+                )}
             </div>
         </div>
     );
@@ -1,7 +1,7 @@
 'use client';
 
 import { useEffect, useState } from 'react';
-import { apiClient } from '@/api/client';
+import { apiClient, Application } from '@/api/client';
 import { components } from '@/api/generated/schema';
 import {
     Loader2, User, Phone, Mail, LogOut, FileText,
@@ -14,7 +14,6 @@ import { motion, AnimatePresence } from 'framer-motion';
 import { toast } from 'sonner';
 
 type UserProfile = components['schemas']['UserShort'];
-type Application = components['schemas']['Applications'];
 
 export default function ProfilePage() {
     const [profile, setProfile] = useState<UserProfile | null>(null);
@@ -34,7 +33,7 @@ export default function ProfilePage() {
                     apiClient.applications.list()
                 ]);
                 setProfile(profileRes.data);
-                setApplications(appsRes.data);
+                setApplications(appsRes);
             } catch (err: any) {
                 setError('Failed to load profile data.');
                 toast.error('Session expired. Please login again.');
@@ -11,7 +11,7 @@ class EduAdmin(admin.ModelAdmin):
 
 @admin.register(Courses)
 class CoursesAdmin(admin.ModelAdmin):
-    list_display = ['title']
+    list_display = ['title', 'centers_count', 'applications_count']
 
 
 @admin.register(Application)
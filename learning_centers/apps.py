@@ -3,3 +3,6 @@ from django.apps import AppConfig
 
 class LearningCentersConfig(AppConfig):
     name = 'learning_centers'
+
+    def ready(self):
+        from . import signals  # noqa: F401
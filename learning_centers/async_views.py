@@ -0,0 +1,79 @@
+from django.http import Http404
+
+from rest_framework import permissions
+from rest_framework.response import Response
+
+from config.aio import AsyncAPIView
+from config.fieldsets import Fieldset
+
+from .caching import AsyncCachedReadMixin
+from .models import Educenters, Courses, Application
+from .permissions import IsOwnerOrAdmin
+from .pagination import CentersPagination, CoursesPagination, ApplicationsPagination
+from .serializers import (
+    CentersListSerializer, CentersFastListSerializer, CentersRetrieveSerializer, ApplicationsSerializer, CoursesDetailSerializer,
+)
+
+# Async twins of the read actions in views.py, routed in by urls.py when
+# ASYNC_READ_VIEWS is on. Their output is the same as the DRF views'.
+
+
+async def get_object(queryset, **lookup):
+    try:
+        return await queryset.aget(**lookup)
+    except queryset.model.DoesNotExist:
+        raise Http404('No %s matches the given query.' % queryset.model._meta.object_name)
+
+
+class CentersListView(AsyncCachedReadMixin, AsyncAPIView):
+    basename = 'educenters'
+    cache_models = (Educenters, Courses)
+    permission_classes = [permissions.IsAuthenticated]
+
+    async def get(self, request):
+        paginator = CentersPagination()
+        page = await paginator.apaginate_queryset(Educenters.objects.values(*CentersFastListSerializer.VALUES), request)
+        return paginator.get_paginated_response(CentersListSerializer(page, many=True, context={'request': request}).data)
+
+
+class CentersRetrieveView(AsyncCachedReadMixin, AsyncAPIView):
+    basename = 'educenters'
+    cache_models = (Educenters, Courses)
+    permission_classes = [permissions.IsAuthenticated]
+
+    async def get(self, request, slug):
+        queryset = Educenters.objects.all()
+        if Fieldset.from_request(request).wants('courses'):
+            queryset = queryset.prefetch_related('courses')
+        center = await get_object(queryset, slug=slug)
+        return Response(CentersRetrieveSerializer(center, context={'request': request}).data)
+
+
+class CoursesListView(AsyncCachedReadMixin, AsyncAPIView):
+    basename = 'courses'
+    cache_models = (Courses, Application)
+    permission_classes = [permissions.IsAuthenticated]
+
+    async def get(self, request):
+        paginator = CoursesPagination()
+        page = await paginator.apaginate_queryset(Courses.objects.all(), request)
+        return paginator.get_paginated_response(CoursesDetailSerializer(page, many=True, context={'request': request}).data)
+
+
+class CoursesRetrieveView(AsyncCachedReadMixin, AsyncAPIView):
+    basename = 'courses'
+    cache_models = (Courses, Application)
+    permission_classes = [permissions.IsAuthenticated]
+
+    async def get(self, request, slug):
+        return Response(CoursesDetailSerializer(await get_object(Courses.objects.all(), slug=slug), context={'request': request}).data)
+
+
+class ApplicationsListView(AsyncAPIView):
+    permission_classes = [permissions.IsAuthenticated, IsOwnerOrAdmin]
+
+    async def get(self, request):
+        paginator = ApplicationsPagination()
+        queryset = ApplicationsSerializer.setup_eager_loading(request.user.applies.all(), Fieldset.from_request(request))
+        page = await paginator.apaginate_queryset(queryset, request)
+        return paginator.get_paginated_response(ApplicationsSerializer(page, many=True, context={'request': request}).data)
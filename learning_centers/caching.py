@@ -0,0 +1,240 @@
+import hashlib
+import os
+import threading
+import time
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import connection, transaction
+from django.http import HttpResponse, HttpResponseNotModified
+from django.utils.http import parse_etags, quote_etag
+
+from config.aio import cache_call
+from config.compression import accepted_encoding, precompress
+from config.timing import mark
+
+
+# Hits and misses of this process: counting them in the cache would write to it on every read
+_stats = {'HIT': 0, 'MISS': 0}
+_stats_lock = threading.Lock()
+
+
+def response_cache():
+    return caches[settings.RESPONSE_CACHE_ALIAS]
+
+
+def version_key(model):
+    return f'response-cache:version:{model._meta.label_lower}'
+
+
+def get_versions(models):
+    """
+    Returns the current version of every model, starting missing ones at the
+    current time in ms so a version never goes back to a value that may
+    still have entries cached under it after an eviction.
+    """
+    cache = response_cache()
+    keys = [version_key(model) for model in models]
+    versions = cache.get_many(keys)
+    for key in keys:
+        if key not in versions:
+            cache.add(key, time.time_ns() // 1_000_000, timeout=None)
+            versions[key] = cache.get(key)
+    return [versions[key] for key in keys]
+
+
+async def aget_versions(models):
+    cache = response_cache()
+    keys = [version_key(model) for model in models]
+    versions = await cache_call(cache, 'get_many', keys)
+    for key in keys:
+        if key not in versions:
+            await cache_call(cache, 'add', key, time.time_ns() // 1_000_000, timeout=None)
+            versions[key] = await cache_call(cache, 'get', key)
+    return [versions[key] for key in keys]
+
+
+def cache_key(basename, versions, request):
+    url = hashlib.md5(request.build_absolute_uri().encode()).hexdigest()
+    return f'response-cache:{basename}:{":".join(str(version) for version in versions)}:{url}'
+
+
+def cache_entry(response):
+    """ Renders ``response`` and returns the (etag, content type, content) tuple stored in the cache. """
+    response.render()
+    etag = quote_etag(hashlib.sha256(response.content).hexdigest()[:32])
+    return etag, response['Content-Type'], response.content
+
+
+def encoded_key(key, encoding):
+    return f'{key}:{encoding}'
+
+
+def encoded_entries(key, encoded):
+    return {encoded_key(key, encoding): content for encoding, content in encoded.items()}
+
+
+def cache_entries(key, entry, encoded):
+    """ The cache items of a rendered response: the entry and its ``precompress``ed copy. """
+    return {key: entry, **encoded_entries(key, encoded)}
+
+
+def stored_copy(key, entry, found, encoding):
+    """
+    The ``precompressed`` copy to send the cached ``entry`` with, and the cache
+    items still to store: the copy read along with the entry, or the first
+    request in ``encoding`` compresses it once for the ones after it.
+    """
+    content = found.get(encoded_key(key, encoding))
+    if content is not None:
+        return {encoding: content}, {}
+    encoded = precompress(entry[2], entry[1], encoding)
+    return encoded, encoded_entries(key, encoded)
+
+
+def cached_response(entry, encoded):
+    etag, content_type, content = entry
+    response = HttpResponse(content, content_type=content_type)
+    response.precompressed = encoded
+    return response
+
+
+def conditional_response(request, etag, response, status):
+    # compressed responses carry W/<etag>, which clients send back
+    if etag.removeprefix('W/') in [tag.removeprefix('W/') for tag in parse_etags(request.headers.get('If-None-Match', ''))]:
+        response = HttpResponseNotModified()
+    response['ETag'] = etag
+    response['X-Cache'] = status
+    return response
+
+
+def _incr(key):
+    cache = response_cache()
+    try:
+        cache.incr(key)
+    except ValueError:
+        if not cache.add(key, 1, timeout=None):
+            cache.incr(key)
+
+
+def bump_version(model):
+    """
+    Invalidates every cached response built from ``model``.
+
+    Inside a transaction the version is bumped again on commit, otherwise a
+    read that ran between the first bump and the commit could cache the old
+    rows under the new version.
+
+    Only workers sharing ``RESPONSE_CACHE_ALIAS`` see the bump, the others
+    serve what they cached until ``RESPONSE_CACHE_TIMEOUT``.
+    """
+    _incr(version_key(model))
+    if connection.in_atomic_block:
+        transaction.on_commit(lambda: _incr(version_key(model)))
+
+
+def record(status):
+    with _stats_lock:
+        _stats[status] += 1
+    mark('cache', status)
+
+
+def get_stats():
+    """ The hits and misses of this worker process since it started, each worker counts its own. """
+    hits, misses = _stats['HIT'], _stats['MISS']
+    return {
+        'pid': os.getpid(),
+        'hits': hits,
+        'misses': misses,
+        'hit_ratio': round(hits / (hits + misses), 4) if hits + misses else None,
+    }
+
+
+def reset_stats():
+    with _stats_lock:
+        _stats.update(HIT=0, MISS=0)
+
+
+class CachedReadMixin:
+    """
+    Serves ``list``/``retrieve`` JSON responses from the response cache.
+
+    Entries are keyed by the absolute URL and the versions of
+    ``cache_models``, which the signals bump on every write, so they never
+    need to be deleted. Every cached response carries a strong ETag and a
+    matching ``If-None-Match`` is answered with 304.
+    """
+    cache_models = ()
+
+    def list(self, request, *args, **kwargs):
+        return self.cached(super().list, request, *args, **kwargs)
+
+    def retrieve(self, request, *args, **kwargs):
+        return self.cached(super().retrieve, request, *args, **kwargs)
+
+    def get_cache_key(self, request):
+        return cache_key(self.basename, get_versions(self.cache_models), request)
+
+    def cached(self, handler, request, *args, **kwargs):
+        self.response_cache_key = None
+        if request.accepted_renderer.format != 'json':
+            return handler(request, *args, **kwargs)
+
+        key = self.get_cache_key(request)
+        # the compressed copy this client accepts is read along with the entry
+        encoding = accepted_encoding(request)
+        found = response_cache().get_many([key, encoded_key(key, encoding)] if encoding else [key])
+        entry = found.get(key)
+        if entry is None:
+            record('MISS')
+            self.response_cache_key, self.response_encoding = key, encoding
+            return handler(request, *args, **kwargs)
+
+        record('HIT')
+        encoded, missing = stored_copy(key, entry, found, encoding)
+        if missing:
+            response_cache().set_many(missing, settings.RESPONSE_CACHE_TIMEOUT)
+        return conditional_response(request, entry[0], cached_response(entry, encoded), 'HIT')
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        response = super().finalize_response(request, response, *args, **kwargs)
+
+        key = getattr(self, 'response_cache_key', None)
+        if key and response.status_code == 200:
+            entry = cache_entry(response)
+            encoded = precompress(entry[2], entry[1], self.response_encoding)
+            response_cache().set_many(cache_entries(key, entry, encoded), settings.RESPONSE_CACHE_TIMEOUT)
+            response.precompressed = encoded
+            response = conditional_response(request, entry[0], response, 'MISS')
+        return response
+
+
+class AsyncCachedReadMixin:
+    """ ``CachedReadMixin`` for ``AsyncAPIView`` reads, sharing its cache entries and counters. """
+    cache_models = ()
+    basename = None
+
+    async def respond(self, request, *args, **kwargs):
+        cache = response_cache()
+        key = cache_key(self.basename, await aget_versions(self.cache_models), request)
+        encoding = accepted_encoding(request)
+
+        found = await cache_call(cache, 'get_many', [key, encoded_key(key, encoding)] if encoding else [key])
+        entry = found.get(key)
+        if entry is not None:
+            record('HIT')
+            encoded, missing = stored_copy(key, entry, found, encoding)
+            if missing:
+                await cache_call(cache, 'set_many', missing, settings.RESPONSE_CACHE_TIMEOUT)
+            return conditional_response(request, entry[0], cached_response(entry, encoded), 'HIT')
+
+        record('MISS')
+        response = self.finalize_response(await super().respond(request, *args, **kwargs))
+        if response.status_code != 200:
+            return response
+
+        entry = cache_entry(response)
+        encoded = precompress(entry[2], entry[1], encoding)
+        await cache_call(cache, 'set_many', cache_entries(key, entry, encoded), settings.RESPONSE_CACHE_TIMEOUT)
+        response.precompressed = encoded
+        return conditional_response(request, entry[0], response, 'MISS')
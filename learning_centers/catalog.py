@@ -0,0 +1,223 @@
+import csv
+import itertools
+import json
+from collections import Counter
+
+from django.core.exceptions import ValidationError
+from django.db import transaction
+from django.db.models import CharField, F, Func, IntegerField, Max, Value
+from django.db.models.functions import Cast, Concat, Length, Substr
+from django.utils.text import slugify
+
+from . import geo
+from .caching import bump_version
+from .counters import add_centers
+from .models import Educenters, Courses
+from .search import fts_enabled, index_centers, write_index
+
+
+# Columns of a catalog row besides ``courses``, ``name`` is required and
+# ``slug`` picks the center to update
+CENTER_FIELDS = (
+    'name', 'slug', 'info', 'cost', 'phone_number', 'phone_number_extra', 'official_website', 'latitude', 'longitude',
+)
+
+
+def read_rows(stream, file_format):
+    """
+    Yields catalog rows as dicts one at a time. In CSV ``courses`` holds
+    ``;``-separated course titles, in NDJSON it is a list.
+    """
+    if file_format == 'csv':
+        for row in csv.DictReader(stream):
+            row = {key: value for key, value in row.items() if key and value != ''}
+            if 'courses' in row:
+                row['courses'] = [title.strip() for title in row['courses'].split(';') if title.strip()]
+            yield row
+    else:
+        for line in stream:
+            if line.strip():
+                yield json.loads(line)
+
+
+def chunked(iterable, size):
+    iterator = iter(iterable)
+    while chunk := list(itertools.islice(iterator, size)):
+        yield chunk
+
+
+def clean_row(row):
+    """ Returns the row with every center field converted and validated by its model field. """
+    if not row.get('name'):
+        raise ValidationError({'name': 'This field is required.'})
+
+    cleaned = {}
+    for name in CENTER_FIELDS:
+        if row.get(name) not in (None, ''):
+            field = Educenters._meta.get_field(name)
+            try:
+                cleaned[name] = field.clean(row[name], None)
+            except ValidationError as error:
+                raise ValidationError({name: error.messages})
+
+    if 'courses' in row:
+        courses = row['courses']
+        if not isinstance(courses, list) or not all(isinstance(title, str) for title in courses):
+            raise ValidationError({'courses': 'Expected a list of course titles.'})
+        cleaned['courses'] = list(dict.fromkeys(title.strip()[:100] for title in courses if title.strip()))
+    return cleaned
+
+
+def unique_slugs(model, names, fallback, reserved=()):
+    """
+    Slugifies every name and appends ``-2``, ``-3``... when the slug is
+    taken by the table, by ``reserved`` or by an earlier name.
+
+    One query returns, per base, whether the base itself is taken and the
+    highest numeric suffix in use: a slug carries a suffix of ``base`` when
+    stripping its trailing digits leaves ``<base>-``. New suffixes continue
+    after that maximum, gaps are not reused.
+    """
+    bases = [slugify(name)[:110] or fallback for name in names]
+    stems = {f'{base}-' for base in bases}
+
+    stem = Func(F('slug'), Value('0123456789'), function='RTRIM', output_field=CharField())
+    suffixed = (
+        model.objects.annotate(stem=stem).filter(stem__in=stems).values('stem')
+        .annotate(top=Max(Cast(Substr('slug', Length('stem') + 1), IntegerField())))
+    )
+    exact = (
+        model.objects.filter(slug__in=set(bases))
+        .annotate(stem=Concat('slug', Value('-'), output_field=CharField()), top=Value(1)).values('stem', 'top')
+    )
+    top = {}
+    for key, value in suffixed.union(exact, all=True).values_list('stem', 'top'):
+        top[key] = max(top.get(key, 1), value or 1)
+
+    reserved, slugs = set(reserved), []
+    for base in bases:
+        key = f'{base}-'
+        slug = base
+        while slug in reserved or (slug == base and key in top):
+            top[key] = top.get(key, 1) + 1
+            slug = f'{base}-{top[key]}'
+        top.setdefault(key, 1)
+        reserved.add(slug)
+        slugs.append(slug)
+    return slugs
+
+
+class CatalogImporter:
+    """
+    Upserts centers and their courses from catalog rows, one transaction per
+    chunk.
+
+    A row whose ``slug`` matches a center updates it, any other row creates
+    a center with a free slug derived from its name. Courses are matched by
+    title and created when missing, and a row with ``courses`` replaces the
+    center's courses. Everything goes through ``bulk_create``/``bulk_update``,
+    which skip the model signals, so the search index, the course counters
+    and the response cache versions are updated here.
+    """
+
+    def __init__(self, owner=None):
+        self.owner = owner
+        self.created = self.updated = 0
+        self.errors = []
+
+    def import_rows(self, rows, chunk_size=1000):
+        for number, chunk in enumerate(chunked(rows, chunk_size)):
+            self.import_chunk(chunk, first_line=number * chunk_size + 1)
+        return self
+
+    def import_chunk(self, chunk, first_line=1):
+        rows = {}
+        for line, row in enumerate(chunk, first_line):
+            try:
+                cleaned = clean_row(row)
+            except ValidationError as error:
+                self.errors.append((line, error.message_dict))
+                continue
+            # a slug repeated inside the chunk is updated once, with its last row
+            rows[cleaned.get('slug') or ('line', line)] = cleaned
+        rows = list(rows.values())
+        if not rows:
+            return
+
+        with transaction.atomic():
+            centers, updated = self.save_centers(rows)
+            self.save_courses(rows, centers, updated)
+            self.index(rows, centers, updated)
+
+        bump_version(Educenters)
+        bump_version(Courses)
+
+    def save_centers(self, rows):
+        existing = Educenters.objects.in_bulk([row['slug'] for row in rows if 'slug' in row], field_name='slug')
+
+        unnamed = [row for row in rows if 'slug' not in row]
+        reserved = {row['slug'] for row in rows if 'slug' in row}
+        for row, slug in zip(unnamed, unique_slugs(Educenters, [row['name'] for row in unnamed], 'center', reserved)):
+            row['slug'] = slug
+
+        centers, to_update, update_fields = [], [], set()
+        for row in rows:
+            fields = {name: value for name, value in row.items() if name != 'courses'}
+            center = existing.get(row['slug'])
+            if center is None:
+                center = Educenters(owner=self.owner, **fields)
+            else:
+                for name, value in fields.items():
+                    setattr(center, name, value)
+                to_update.append(center)
+                update_fields.update(fields)
+            center.geohash = geo.encode(center.latitude, center.longitude)  # Educenters.save() isn't called
+            centers.append(center)
+
+        if {'latitude', 'longitude'} & update_fields:
+            update_fields.add('geohash')
+
+        created = Educenters.objects.bulk_create([center for center in centers if center.pk is None])
+        if to_update:
+            Educenters.objects.bulk_update(to_update, sorted(update_fields - {'slug'}))
+
+        self.created += len(created)
+        self.updated += len(to_update)
+        return centers, {center.id for center in to_update}
+
+    def save_courses(self, rows, centers, updated):
+        titles = sorted({title for row in rows for title in row.get('courses', [])})
+        course_ids = dict(Courses.objects.filter(title__in=titles).values_list('title', 'id'))
+
+        missing = [title for title in titles if title not in course_ids]
+        new_courses = Courses.objects.bulk_create(
+            Courses(title=title, slug=slug)
+            for title, slug in zip(missing, unique_slugs(Courses, missing, 'course'))
+        )
+        course_ids.update((course.title, course.id) for course in new_courses)
+
+        Through = Educenters.courses.through
+        replaced = [center.id for row, center in zip(rows, centers) if 'courses' in row and center.id in updated]
+        links = Counter()
+        if replaced:
+            removed = Through.objects.filter(educenters_id__in=replaced)
+            links.subtract(removed.values_list('courses_id', flat=True))
+            removed.delete()
+        added = Through.objects.bulk_create(
+            Through(educenters_id=center.id, courses_id=course_ids[title])
+            for row, center in zip(rows, centers) for title in row.get('courses', [])
+        )
+        links.update(link.courses_id for link in added)
+        add_centers(links)
+
+    def index(self, rows, centers, updated):
+        """ Indexes the centers from the imported rows, reading back only updated centers with unknown courses. """
+        if not fts_enabled():
+            return
+
+        known = [
+            (center.id, center.name, center.info, row.get('courses', []))
+            for row, center in zip(rows, centers) if 'courses' in row or center.id not in updated
+        ]
+        write_index([center_id for center_id, *_ in known], known)
+        index_centers(center.id for row, center in zip(rows, centers) if 'courses' not in row and center.id in updated)
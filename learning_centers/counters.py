@@ -0,0 +1,80 @@
+"""
+Denormalized course counters: ``Courses.centers_count``, the centers
+teaching the course, and ``Courses.applications_count``.
+
+The signals keep them current on ``Educenters.courses`` changes and on
+application saves and deletes; bulk writes, which send no signals, call
+``add_centers``/``add_applications`` themselves. Writes that skip both (raw
+SQL, ``queryset.update``) leave them drifted until ``manage.py
+reconcile_course_counters``.
+
+Application counts bump the ``Application`` response cache version, not the
+``Courses`` one, so a new application doesn't drop the cached centers that
+embed their courses.
+"""
+from collections import Counter, defaultdict
+
+from django.db.models import Case, Count, F, Value, When
+from django.db.models.functions import Greatest
+
+from .caching import bump_version
+from .models import Application, Courses, Educenters
+
+
+def _add(field, deltas):
+    """ Adds ``{course_id: delta}`` to ``field`` with one UPDATE, never going below zero. """
+    course_ids = defaultdict(list)
+    for course_id, delta in deltas.items():
+        if delta:
+            course_ids[delta].append(course_id)
+    if not course_ids:
+        return False
+
+    delta = Case(*(When(pk__in=ids, then=Value(delta)) for delta, ids in course_ids.items()))
+    Courses.objects.filter(pk__in=[pk for ids in course_ids.values() for pk in ids]).update(
+        **{field: Greatest(F(field) + delta, 0)}
+    )
+    return True
+
+
+def add_centers(deltas):
+    if _add('centers_count', deltas):
+        bump_version(Courses)
+
+
+def add_applications(deltas):
+    if _add('applications_count', deltas):
+        bump_version(Application)
+
+
+def count_courses(applications):
+    return Counter(application.course_id for application in applications)
+
+
+def reconcile(batch_size=1000):
+    """
+    Recounts both counters of every course with one GROUP BY per table and
+    writes the ones that drifted, returns ``[(course_id, {field: (stored, actual)})]``.
+    """
+    centers = dict(
+        Educenters.courses.through.objects.values('courses_id').annotate(count=Count('*')).values_list('courses_id', 'count')
+    )
+    applications = dict(
+        Application.objects.order_by().values('course_id').annotate(count=Count('*')).values_list('course_id', 'count')
+    )
+
+    drifted, changes = [], []
+    for course in Courses.objects.only('centers_count', 'applications_count').iterator(chunk_size=batch_size):
+        actual = {'centers_count': centers.get(course.pk, 0), 'applications_count': applications.get(course.pk, 0)}
+        changed = {field: (getattr(course, field), count) for field, count in actual.items() if getattr(course, field) != count}
+        if changed:
+            for field, count in actual.items():
+                setattr(course, field, count)
+            drifted.append(course)
+            changes.append((course.pk, changed))
+
+    if drifted:
+        Courses.objects.bulk_update(drifted, ['centers_count', 'applications_count'], batch_size=batch_size)
+        bump_version(Courses)
+        bump_version(Application)
+    return changes
@@ -0,0 +1,143 @@
+import csv
+import io
+import json
+
+from asgiref.sync import sync_to_async
+from django.core.serializers.json import DjangoJSONEncoder
+
+from rest_framework.renderers import BaseRenderer
+
+from .models import Application, Educenters
+
+
+# column: lookup, flat so the export never instantiates a model
+APPLICATION_COLUMNS = {
+    'id': 'id',
+    'index': 'index',
+    'created_date': 'created_date',
+    'username': 'owner__username',
+    'first_name': 'owner__first_name',
+    'last_name': 'owner__last_name',
+    'phone_number': 'owner__phone_number',
+    'center': 'center__name',
+    'center_slug': 'center__slug',
+    'course': 'course__title',
+    'content': 'content',
+}
+
+# rows fetched per database round-trip and written per yielded chunk
+EXPORT_CHUNK_SIZE = 2000
+
+
+def received_applications(user, center=None):
+    """
+    Flat rows of the applications sent to ``user``'s centers, grouped by
+    center and oldest first.
+
+    Filtering on a list of center ids and ordering by (center, id) follows
+    the ``center_id`` index, so rows come out as they are read instead of
+    after the whole result set is sorted.
+    """
+    centers = Educenters.objects.filter(owner=user)
+    if center:
+        centers = centers.filter(slug=center)
+    center_ids = list(centers.order_by('id').values_list('id', flat=True))
+
+    return (
+        Application.objects.filter(center_id__in=center_ids).order_by('center_id', 'id')
+        .values_list(*APPLICATION_COLUMNS.values())
+    )
+
+
+def _chunks(rows):
+    chunk = []
+    for row in rows.iterator(chunk_size=EXPORT_CHUNK_SIZE):
+        chunk.append(row)
+        if len(chunk) == EXPORT_CHUNK_SIZE:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+async def _achunks(rows):
+    # one thread hop per chunk; QuerySet.aiterator() would run a values_list() query on the event loop
+    chunks = _chunks(rows)
+    while (chunk := await sync_to_async(next)(chunks, None)) is not None:
+        yield chunk
+
+
+def _csv_writer():
+    """ Returns a function writing rows to one reused buffer and returning them as CSV. """
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+
+    def write(rows):
+        buffer.seek(0)
+        buffer.truncate()
+        writer.writerows(rows)
+        return buffer.getvalue()
+    return write
+
+
+def _ndjson_writer():
+    encoder = DjangoJSONEncoder()
+    columns = list(APPLICATION_COLUMNS)
+    return lambda rows: ''.join(encoder.encode(dict(zip(columns, row))) + '\n' for row in rows)
+
+
+def stream_csv(rows):
+    """ Yields the header line first, then the rows in CSV chunks of ``EXPORT_CHUNK_SIZE``. """
+    write = _csv_writer()
+    yield write([APPLICATION_COLUMNS])
+    for chunk in _chunks(rows):
+        yield write(chunk)
+
+
+def stream_ndjson(rows):
+    write = _ndjson_writer()
+    for chunk in _chunks(rows):
+        yield write(chunk)
+
+
+async def astream_csv(rows):
+    """
+    ``stream_csv`` for ASGI, which reads a sync iterator into a list before
+    sending the first byte.
+    """
+    write = _csv_writer()
+    yield write([APPLICATION_COLUMNS])
+    async for chunk in _achunks(rows):
+        yield write(chunk)
+
+
+async def astream_ndjson(rows):
+    write = _ndjson_writer()
+    async for chunk in _achunks(rows):
+        yield write(chunk)
+
+
+class CSVRenderer(BaseRenderer):
+    """ Lets ``?format=csv``/``Accept: text/csv`` through content negotiation, errors render as one-row CSV. """
+    media_type = 'text/csv'
+    format = 'csv'
+    charset = 'utf-8'
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        writer.writerows([data.keys(), data.values()] if isinstance(data, dict) else [[data]])
+        return buffer.getvalue().encode()
+
+
+class NDJSONRenderer(BaseRenderer):
+    media_type = 'application/x-ndjson'
+    format = 'ndjson'
+    charset = 'utf-8'
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        return (json.dumps(data, cls=DjangoJSONEncoder) + '\n').encode()
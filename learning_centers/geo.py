@@ -0,0 +1,164 @@
+"""
+"Centers near me" without a GIS extension.
+
+Every center with a location stores its geohash (``Educenters.geohash``,
+indexed). A geohash cell is a prefix: all the points inside cell ``u4pr``
+have geohashes starting with ``u4pr``, so one cell is one index range. A
+radius query covers the circle's bounding box with a few cells, reads the
+centers in those ranges and keeps the ones within the exact (haversine)
+distance. k-nearest queries grow the radius until k centers are inside it.
+
+Bounding boxes that cross the antimeridian are widened to every longitude,
+which stays correct and only reads more rows.
+"""
+import math
+from functools import reduce
+from operator import or_
+
+from django.db.models import Q
+
+
+BASE32 = '0123456789bcdefghjkmnpqrstuvwxyz'
+
+# Stored precision, 8 characters is a cell of about 38 x 19 m
+PRECISION = 8
+
+# Most cells (index ranges) a query covers its bounding box with, the finest
+# precision that fits is used
+MAX_CELLS = 16
+
+EARTH_RADIUS_KM = 6371.0088
+MAX_DISTANCE_KM = math.pi * EARTH_RADIUS_KM  # the other side of the planet
+
+# k-nearest searches start at this radius and multiply it until k centers are found
+START_RADIUS_KM = 2
+RADIUS_GROWTH = 4
+
+
+def encode(lat, lng, precision=PRECISION):
+    """ Geohash of a point, None when either coordinate is missing. """
+    if lat is None or lng is None:
+        return None
+
+    lat_range, lng_range = [-90.0, 90.0], [-180.0, 180.0]
+    chars, bits, bit_count, even = [], 0, 0, True
+    while len(chars) < precision:
+        value, bounds = (lng, lng_range) if even else (lat, lat_range)
+        middle = (bounds[0] + bounds[1]) / 2
+        if value >= middle:
+            bits, bounds[0] = bits * 2 + 1, middle
+        else:
+            bits, bounds[1] = bits * 2, middle
+        even = not even
+        bit_count += 1
+        if bit_count == 5:
+            chars.append(BASE32[bits])
+            bits = bit_count = 0
+    return ''.join(chars)
+
+
+def cell_size(precision):
+    """ (height, width) of a cell in degrees, longitude gets the odd bit. """
+    bits = 5 * precision
+    return 180 / 2 ** (bits // 2), 360 / 2 ** (bits - bits // 2)
+
+
+def distance_km(lat1, lng1, lat2, lng2):
+    """ Haversine distance. """
+    lat1, lng1, lat2, lng2 = map(math.radians, (lat1, lng1, lat2, lng2))
+    a = math.sin((lat2 - lat1) / 2) ** 2 + math.cos(lat1) * math.cos(lat2) * math.sin((lng2 - lng1) / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * math.asin(min(1.0, math.sqrt(a)))
+
+
+def bounding_box(lat, lng, radius_km):
+    """ (south, west, north, east) of every point within ``radius_km``. """
+    dlat = math.degrees(radius_km / EARTH_RADIUS_KM)
+    south, north = max(lat - dlat, -90.0), min(lat + dlat, 90.0)
+    widest = math.cos(math.radians(max(abs(south), abs(north))))
+    if north == 90 or south == -90 or widest <= 0 or dlat / widest >= 180:
+        return south, -180.0, north, 180.0
+
+    dlng = dlat / widest
+    west, east = lng - dlng, lng + dlng
+    if west < -180 or east > 180:
+        west, east = -180.0, 180.0
+    return south, west, north, east
+
+
+def covering_cells(lat, lng, radius_km, max_cells=MAX_CELLS):
+    """
+    The geohash cells covering the circle's bounding box at the finest
+    precision that needs at most ``max_cells``, None when even one
+    character does (the whole planet).
+    """
+    south, west, north, east = bounding_box(lat, lng, radius_km)
+    for precision in range(PRECISION, 0, -1):
+        height, width = cell_size(precision)
+        rows, columns = round(180 / height), round(360 / width)
+        first_row, last_row = int((south + 90) // height), min(int((north + 90) // height), rows - 1)
+        first_column, last_column = int((west + 180) // width), min(int((east + 180) // width), columns - 1)
+        if (last_row - first_row + 1) * (last_column - first_column + 1) > max_cells:
+            continue
+
+        return sorted({
+            encode(-90 + (row + 0.5) * height, -180 + (column + 0.5) * width, precision)
+            for row in range(first_row, last_row + 1)
+            for column in range(first_column, last_column + 1)
+        })
+    return None
+
+
+def cell_ranges(cells):
+    """ Inclusive ``geohash`` ranges of the cells, neighbours in geohash order merged into one. """
+    def number(cell):
+        return reduce(lambda value, char: value * 32 + BASE32.index(char), cell, 0)
+
+    ranges = []
+    for cell in cells:
+        if ranges and number(cell) == number(ranges[-1][1]) + 1:
+            ranges[-1][1] = cell
+        else:
+            ranges.append([cell, cell])
+    return [(first, last + BASE32[-1] * (PRECISION - len(last))) for first, last in ranges]
+
+
+def within(queryset, lat, lng, radius_km, fields=()):
+    """
+    The centers of ``queryset`` within ``radius_km`` as dicts of ``fields``,
+    ``latitude``, ``longitude`` and ``distance_km``, nearest first.
+    """
+    cells = covering_cells(lat, lng, radius_km)
+    if cells is None:
+        queryset = queryset.filter(geohash__isnull=False)
+    else:
+        # the cells stick out of the bounding box, the database drops those rows cheaper than Python
+        south, west, north, east = bounding_box(lat, lng, radius_km)
+        queryset = queryset.filter(
+            reduce(or_, (Q(geohash__range=cell_range) for cell_range in cell_ranges(cells))),
+            latitude__range=(south, north), longitude__range=(west, east),
+        )
+
+    rows = []
+    for row in queryset.values(*fields, 'latitude', 'longitude'):
+        row['distance_km'] = distance_km(lat, lng, row['latitude'], row['longitude'])
+        if row['distance_km'] <= radius_km:
+            rows.append(row)
+    rows.sort(key=lambda row: row['distance_km'])
+    return rows
+
+
+def nearby(queryset, lat, lng, limit, radius_km=None, fields=()):
+    """
+    The ``limit`` centers nearest to the point, only the ones within
+    ``radius_km`` when it is given. See ``within`` for the rows.
+    """
+    if radius_km is not None:
+        return within(queryset, lat, lng, radius_km, fields)[:limit]
+
+    radius_km = START_RADIUS_KM
+    while True:
+        rows = within(queryset, lat, lng, radius_km, fields)
+        # everything inside the radius was read, so these are the nearest ones
+        if len(rows) >= limit or radius_km >= MAX_DISTANCE_KM:
+            return rows[:limit]
+        radius_km = min(radius_km * RADIUS_GROWTH, MAX_DISTANCE_KM)
@@ -0,0 +1,123 @@
+import io
+import os
+import re
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.db import connection, transaction
+
+from .caching import bump_version
+from .models import Educenters
+
+
+# name: (max width, max height, Pillow format, extension)
+VARIANTS = {
+    'thumbnail': (320, 320, 'JPEG', 'jpg'),
+    'thumbnail_webp': (320, 320, 'WEBP', 'webp'),
+    'medium_webp': (960, 960, 'WEBP', 'webp'),
+}
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def variant_name(picture_name, variant):
+    """ educenter_images/a.png -> educenter_images/variants/a_thumbnail.jpg """
+    directory, filename = os.path.split(picture_name)
+    stem = os.path.splitext(filename)[0]
+    return f'{directory}/variants/{stem}_{variant}.{VARIANTS[variant][3]}'
+
+
+def expected_variants(picture_name):
+    if not picture_name:
+        return {}
+    return {variant: variant_name(picture_name, variant) for variant in VARIANTS}
+
+
+def up_to_date(picture_name, variants):
+    """
+    Whether ``variants`` are the ones of ``picture_name``. A storage that
+    finds a name taken saves under ``<root>_<7 characters><ext>`` instead,
+    so the names stored are matched by their root and extension.
+    """
+    expected = expected_variants(picture_name)
+    if variants.keys() != expected.keys():
+        return False
+    for variant, name in expected.items():
+        root, ext = os.path.splitext(name)
+        if not re.fullmatch(re.escape(root) + r'(_[a-zA-Z0-9]{7})?' + re.escape(ext), variants[variant]):
+            return False
+    return True
+
+
+def render_variant(image, variant):
+    from PIL import Image
+
+    width, height, image_format, _ = VARIANTS[variant]
+
+    resized = image.copy()
+    resized.thumbnail((width, height), Image.Resampling.LANCZOS)
+    if image_format == 'JPEG' and resized.mode != 'RGB':
+        resized = resized.convert('RGB')
+
+    buffer = io.BytesIO()
+    resized.save(buffer, image_format, quality=80, optimize=True)
+    return buffer.getvalue()
+
+
+def generate_variants(center_id):
+    """
+    Renders every variant of the center's current picture, stores their
+    names in ``picture_variants`` and drops the ones of a replaced picture.
+    """
+    try:
+        center = Educenters.objects.only('picture', 'picture_variants').get(pk=center_id)
+    except Educenters.DoesNotExist:
+        return {}
+
+    storage = center.picture.storage
+    stale = set(center.picture_variants.values())
+    variants = {}
+
+    if center.picture:
+        # Pillow is imported on first use, most processes never render a picture
+        from PIL import Image, ImageOps
+
+        with center.picture.open('rb') as source:
+            image = ImageOps.exif_transpose(Image.open(source))
+            image.load()
+
+        for variant, name in expected_variants(center.picture.name).items():
+            storage.delete(name)
+            variants[variant] = storage.save(name, ContentFile(render_variant(image, variant)))
+
+    for name in stale - set(variants.values()):
+        storage.delete(name)
+
+    # A queryset update keeps the search index untouched, the cached lists
+    # still have to be invalidated by hand.
+    Educenters.objects.filter(pk=center_id, picture=center.picture.name).update(picture_variants=variants)
+    bump_version(Educenters)
+    return variants
+
+
+def render_in_worker(center_id):
+    try:
+        return generate_variants(center_id)
+    finally:
+        connection.close()
+
+
+def get_executor():
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(settings.PICTURE_VARIANT_WORKERS, thread_name_prefix='picture-variants')
+    return _executor
+
+
+def schedule_variants(center_id):
+    """ Renders the variants in the worker pool once the current transaction commits. """
+    transaction.on_commit(lambda: get_executor().submit(render_in_worker, center_id))
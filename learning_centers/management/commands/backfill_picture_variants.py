@@ -0,0 +1,39 @@
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from django.core.management.base import BaseCommand
+
+from learning_centers.images import render_in_worker, up_to_date
+from learning_centers.models import Educenters
+
+
+class Command(BaseCommand):
+    help = 'Renders the thumbnail/WebP variants of center pictures that are missing or out of date'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--workers', type=int, default=4)
+        parser.add_argument('--force', action='store_true', help='Re-render the variants of every picture')
+
+    def handle(self, *args, **options):
+        centers = Educenters.objects.exclude(picture='').exclude(picture=None).values_list('id', 'picture', 'picture_variants')
+        pending = [
+            center_id for center_id, picture, variants in centers.iterator()
+            if options['force'] or not up_to_date(picture, variants)
+        ]
+        self.stdout.write(f'Rendering variants for {len(pending)} centers with {options["workers"]} workers...')
+
+        started = time.perf_counter()
+        failed = 0
+        with ThreadPoolExecutor(options['workers']) as executor:
+            futures = {executor.submit(render_in_worker, center_id): center_id for center_id in pending}
+            for future in as_completed(futures):
+                try:
+                    future.result()
+                except Exception as error:
+                    failed += 1
+                    self.stderr.write(f'Center {futures[future]}: {error}')
+
+        elapsed = time.perf_counter() - started
+        self.stdout.write(self.style.SUCCESS(
+            f'Done in {elapsed:.1f}s, {len(pending) - failed} rendered, {failed} failed.'
+        ))
@@ -0,0 +1,43 @@
+import difflib
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from config.openapi import generate_schema, render_schema
+
+# diff lines printed before giving up
+MAX_DIFF_LINES = 60
+
+
+class Command(BaseCommand):
+    help = 'Fails when the stored OpenAPI schema (schema.json) no longer matches the code, --write regenerates it'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--file', default=settings.OPENAPI_SCHEMA_FILE or settings.BASE_DIR / 'schema.json')
+        parser.add_argument('--write', action='store_true', help='write the generated schema to the file instead')
+
+    def handle(self, *args, **options):
+        generated = render_schema(generate_schema())
+        try:
+            with open(options['file'], 'rb') as f:
+                stored = f.read()
+        except FileNotFoundError:
+            stored = b''
+
+        if stored == generated:
+            self.stdout.write(self.style.SUCCESS(f'{options["file"]} is up to date.'))
+            return
+
+        if options['write']:
+            with open(options['file'], 'wb') as f:
+                f.write(generated)
+            self.stdout.write(self.style.SUCCESS(f'Wrote {options["file"]}.'))
+            return
+
+        diff = list(difflib.unified_diff(
+            stored.decode().splitlines(), generated.decode().splitlines(), 'stored', 'generated', lineterm='',
+        ))
+        self.stdout.write('\n'.join(diff[:MAX_DIFF_LINES]))
+        if len(diff) > MAX_DIFF_LINES:
+            self.stdout.write(f'... {len(diff) - MAX_DIFF_LINES} more lines')
+        raise CommandError(f'{options["file"]} is out of date, run `python manage.py check_schema --write`.')
@@ -0,0 +1,52 @@
+import sys
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from learning_centers.catalog import CatalogImporter, read_rows
+from users_control.models import CustomUser
+
+
+class Command(BaseCommand):
+    help = (
+        'Upserts education centers and their courses from a CSV or NDJSON catalog, in chunks. '
+        'Columns: name, slug, info, cost, phone_number, phone_number_extra, official_website, courses '
+        '(";"-separated titles in CSV, a list in NDJSON). Rows with a known slug update that center.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help='Catalog file, "-" reads stdin')
+        parser.add_argument('--format', choices=['csv', 'ndjson'], help='Defaults to the file extension')
+        parser.add_argument('--chunk-size', type=int, default=1000)
+        parser.add_argument('--owner', help='Username set as the owner of created centers')
+
+    def handle(self, *args, **options):
+        path = options['path']
+        file_format = options['format'] or ('csv' if path.endswith('.csv') else 'ndjson' if path != '-' else None)
+        if file_format is None:
+            raise CommandError('Pass --format when reading stdin.')
+
+        owner = None
+        if options['owner']:
+            try:
+                owner = CustomUser.objects.get(username=options['owner'])
+            except CustomUser.DoesNotExist:
+                raise CommandError(f'User "{options["owner"]}" does not exist.')
+
+        stream = sys.stdin if path == '-' else open(path, newline='', encoding='utf-8')
+        started = time.perf_counter()
+        try:
+            importer = CatalogImporter(owner).import_rows(read_rows(stream, file_format), options['chunk_size'])
+        finally:
+            if stream is not sys.stdin:
+                stream.close()
+        elapsed = time.perf_counter() - started
+
+        for line, errors in importer.errors:
+            self.stderr.write(f'Row {line}: {errors}')
+
+        rows = importer.created + importer.updated + len(importer.errors)
+        self.stdout.write(self.style.SUCCESS(
+            f'{importer.created} created, {importer.updated} updated, {len(importer.errors)} skipped '
+            f'in {elapsed:.1f}s ({rows / elapsed if elapsed else rows:.0f} rows/s).'
+        ))
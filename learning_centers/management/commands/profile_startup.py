@@ -0,0 +1,140 @@
+import json
+import os
+import subprocess
+import sys
+
+from django.apps import apps
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+# Boots a WSGI worker in a fresh interpreter and serves one request, writing
+# a marker line to stderr before each phase (and the -X importtime lines
+# between them when asked for)
+BOOT = '''
+import sys, time
+
+def phase(name):
+    sys.stderr.write(f'@phase {name} {time.perf_counter()}\\n')
+
+phase('settings')
+from django.conf import settings
+settings.INSTALLED_APPS
+phase('apps')
+import django
+django.setup(set_prefix=False)
+phase('middleware')
+from django.core.handlers.wsgi import WSGIHandler
+handler = WSGIHandler()
+phase('first request')
+from django.test import RequestFactory
+environ = RequestFactory().get(sys.argv[1], secure=True, HTTP_HOST=sys.argv[2]).environ
+response = handler(environ, lambda status, headers: sys.stderr.write(f'@status {status}\\n'))
+response.close()
+phase('end')
+'''
+
+PHASES = ('settings', 'apps', 'middleware', 'first request')
+
+
+def boot(path, host, env, importtime=False):
+    """ Returns ``(phase ms, status line, [(phase, top-level module, cumulative ms)])`` of one cold start. """
+    command = [sys.executable, *(['-X', 'importtime'] if importtime else []), '-c', BOOT, path, host]
+    result = subprocess.run(command, env=env, cwd=settings.BASE_DIR, capture_output=True, text=True)
+    if result.returncode:
+        raise CommandError(f'The worker failed to boot:\n{result.stderr[-2000:]}')
+
+    marks, status, imports, current = {}, '', [], None
+    for line in result.stderr.splitlines():
+        if line.startswith('@phase '):
+            current, started = line[len('@phase '):].rsplit(' ', 1)
+            marks[current] = float(started)
+        elif line.startswith('@status '):
+            status = line[len('@status '):]
+        elif line.startswith('import time:') and current:
+            _, cumulative, name = line.split('|')
+            # nested imports are indented below the one that triggered them
+            if not name[1:].startswith(' ') and cumulative.strip().isdigit():
+                imports.append((current, name.strip(), int(cumulative) / 1000))
+
+    names = [*PHASES, 'end']
+    timings = {name: (marks[next_name] - marks[name]) * 1000 for name, next_name in zip(names, names[1:])}
+    return timings, status, imports
+
+
+def setting_owners():
+    """ The module prefix of every INSTALLED_APPS, MIDDLEWARE and ROOT_URLCONF entry. """
+    owners = {app.name: f'INSTALLED_APPS {app.name}' for app in apps.get_app_configs()}
+    owners.update({entry.rsplit('.', 1)[0]: f'MIDDLEWARE {entry}' for entry in settings.MIDDLEWARE})
+    owners[settings.ROOT_URLCONF] = f'ROOT_URLCONF {settings.ROOT_URLCONF}'
+    owners[os.environ.get('DJANGO_SETTINGS_MODULE', 'config.settings')] = 'settings module'
+    return owners
+
+
+def owner_of(module, owners):
+    while module:
+        if module in owners:
+            return owners[module]
+        module = module.rpartition('.')[0]
+    return None
+
+
+class Command(BaseCommand):
+    help = (
+        'Boots a worker in a fresh process and reports the time to its first request by phase, '
+        'and the import cost per setting and per module'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--path', default='/api/courses/', help='path of the first request')
+        parser.add_argument('--runs', type=int, default=5, help='cold starts per mode, the fastest one is reported')
+        parser.add_argument('--top', type=int, default=15, help='slowest top-level imports to list')
+        parser.add_argument('--compare', action='store_true', help='profile with LEAN_BOOT off and on')
+        parser.add_argument('--json', action='store_true', help='print the results as JSON')
+
+    def handle(self, *args, **options):
+        host = next((host for host in settings.ALLOWED_HOSTS if host[0] not in '.*'), 'localhost')
+        modes = {'default': 'False', 'lean': 'True'} if options['compare'] else {'current': os.getenv('LEAN_BOOT', 'False')}
+
+        results = {}
+        for mode, lean in modes.items():
+            env = {**os.environ, 'LEAN_BOOT': lean}
+            runs = [boot(options['path'], host, env)[0] for _ in range(options['runs'])]
+            _, status, imports = boot(options['path'], host, env, importtime=True)
+            results[mode] = {
+                'status': status,
+                'phases_ms': {name: round(min(run[name] for run in runs), 1) for name in PHASES},
+                'total_ms': round(min(sum(run.values()) for run in runs), 1),
+                'imports': imports,
+            }
+
+        if options['json']:
+            self.stdout.write(json.dumps(results, indent=2))
+            return
+
+        for mode, result in results.items():
+            self.report(mode, result, options['top'])
+        if options['compare']:
+            default, lean = results['default']['total_ms'], results['lean']['total_ms']
+            self.stdout.write(self.style.SUCCESS(
+                f'Time to first request: {default} ms default, {lean} ms lean ({(lean - default) / default:+.0%}).'
+            ))
+
+    def report(self, mode, result, top):
+        self.stdout.write(self.style.MIGRATE_HEADING(
+            f'{mode}: {result["total_ms"]} ms to the first response ({result["status"]}), fastest of the runs'
+        ))
+        for name, ms in result['phases_ms'].items():
+            self.stdout.write(f'  {name:<16} {ms:>8.1f} ms')
+
+        owners = setting_owners()
+        per_setting = {}
+        for _, module, ms in result['imports']:
+            owner = owner_of(module, owners) or 'other (Django, libraries)'
+            per_setting[owner] = per_setting.get(owner, 0) + ms
+        self.stdout.write('  import time per setting (-X importtime, one run):')
+        for owner, ms in sorted(per_setting.items(), key=lambda item: item[1], reverse=True):
+            self.stdout.write(f'  {ms:>8.1f} ms  {owner}')
+
+        self.stdout.write('  slowest top-level imports:')
+        for phase, module, ms in sorted(result['imports'], key=lambda item: item[2], reverse=True)[:top]:
+            self.stdout.write(f'  {ms:>8.1f} ms  {module} ({phase})')
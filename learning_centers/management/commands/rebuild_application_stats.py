@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+
+from learning_centers.stats import rebuild
+
+
+class Command(BaseCommand):
+    help = 'Recomputes the daily application counts from the applications table (needed after raw SQL and queryset.update writes)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=1000)
+
+    def handle(self, *args, **options):
+        count = rebuild(options['batch_size'])
+        self.stdout.write(self.style.SUCCESS(f'Wrote {count} daily rows.'))
@@ -0,0 +1,18 @@
+from django.core.management.base import BaseCommand
+
+from learning_centers.search import fts_enabled, rebuild_index
+
+
+class Command(BaseCommand):
+    help = 'Rebuilds the full-text search index of education centers (needed after bulk_create and raw SQL writes)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=1000)
+
+    def handle(self, *args, **options):
+        if not fts_enabled():
+            self.stdout.write('Full-text search is only indexed on SQLite, nothing to do.')
+            return
+
+        count = rebuild_index(options['batch_size'])
+        self.stdout.write(self.style.SUCCESS(f'Indexed {count} centers.'))
@@ -0,0 +1,20 @@
+from django.core.management.base import BaseCommand
+
+from learning_centers.counters import reconcile
+
+
+class Command(BaseCommand):
+    help = (
+        'Recounts the centers and applications of every course and repairs the stored counters that drifted '
+        '(after raw SQL and queryset.update/delete writes)'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=1000)
+
+    def handle(self, *args, **options):
+        changes = reconcile(options['batch_size'])
+        for course_id, fields in changes:
+            drift = ', '.join(f'{field} {stored} -> {actual}' for field, (stored, actual) in fields.items())
+            self.stdout.write(f'course {course_id}: {drift}')
+        self.stdout.write(self.style.SUCCESS(f'Repaired {len(changes)} courses.'))
@@ -0,0 +1,62 @@
+# Generated by Django 5.2.11 on 2026-10-18 11:32
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('learning_centers', '0003_educenters_phone_number_and_more'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RenameField(
+            model_name='educenters',
+            old_name='bio',
+            new_name='info',
+        ),
+        migrations.AddField(
+            model_name='educenters',
+            name='cost',
+            field=models.PositiveIntegerField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='educenters',
+            name='official_website',
+            field=models.URLField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='educenters',
+            name='owner',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.AddField(
+            model_name='educenters',
+            name='picture',
+            field=models.ImageField(blank=True, null=True, upload_to='educenter_images/'),
+        ),
+        migrations.AlterField(
+            model_name='educenters',
+            name='courses',
+            field=models.ManyToManyField(blank=True, related_name='educenters', to='learning_centers.courses'),
+        ),
+        migrations.CreateModel(
+            name='Application',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('index', models.PositiveIntegerField(blank=True, editable=False, null=True, unique=True)),
+                ('content', models.TextField(blank=True, null=True)),
+                ('created_date', models.DateTimeField(auto_now_add=True)),
+                ('center', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='applies', to='learning_centers.educenters')),
+                ('course', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='applies', to='learning_centers.courses')),
+                ('owner', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='applies', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'verbose_name': 'Application',
+                'verbose_name_plural': 'Applications',
+            },
+        ),
+    ]
@@ -0,0 +1,31 @@
+# Generated by Django 5.2.11 on 2026-10-18 11:35
+
+from django.db import migrations, models
+from django.db.models import Max
+
+
+def seed_application_index(apps, schema_editor):
+    Application = apps.get_model('learning_centers', 'Application')
+    Sequence = apps.get_model('learning_centers', 'Sequence')
+
+    max_index = Application.objects.aggregate(max_i=Max('index'))['max_i'] or 0
+    Sequence.objects.create(name='application_index', value=max_index)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('learning_centers', '0004_rename_bio_educenters_info_educenters_cost_and_more'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Sequence',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=50, unique=True)),
+                ('value', models.PositiveBigIntegerField(default=0)),
+            ],
+        ),
+        migrations.RunPython(seed_application_index, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,37 @@
+from django.db import migrations
+
+
+FTS_TABLE = 'learning_centers_educenters_fts'
+
+
+def create_fts_table(apps, schema_editor):
+    if schema_editor.connection.vendor != 'sqlite':
+        return
+
+    schema_editor.execute(
+        f"CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} "
+        f"USING fts5(name, info, courses, tokenize='unicode61 remove_diacritics 2')"
+    )
+
+    Educenters = apps.get_model('learning_centers', 'Educenters')
+    for center in Educenters.objects.prefetch_related('courses').iterator(chunk_size=1000):
+        schema_editor.execute(
+            f'INSERT INTO {FTS_TABLE} (rowid, name, info, courses) VALUES (%s, %s, %s, %s)',
+            [center.id, center.name, center.info or '', ' '.join(course.title for course in center.courses.all())],
+        )
+
+
+def drop_fts_table(apps, schema_editor):
+    if schema_editor.connection.vendor == 'sqlite':
+        schema_editor.execute(f'DROP TABLE IF EXISTS {FTS_TABLE}')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('learning_centers', '0005_sequence'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_fts_table, drop_fts_table),
+    ]
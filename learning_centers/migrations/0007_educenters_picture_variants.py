@@ -0,0 +1,18 @@
+# Generated by Django 5.2.11 on 2026-10-18 11:47
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('learning_centers', '0006_educenters_fts'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='educenters',
+            name='picture_variants',
+            field=models.JSONField(blank=True, default=dict, editable=False),
+        ),
+    ]
@@ -0,0 +1,43 @@
+# Generated by Django 5.2.11 on 2026-10-18 12:13
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.models import Count
+from django.db.models.functions import TruncDate
+
+
+def fill_daily_stats(apps, schema_editor):
+    Application = apps.get_model('learning_centers', 'Application')
+    ApplicationDailyStats = apps.get_model('learning_centers', 'ApplicationDailyStats')
+
+    rows = (
+        Application.objects.annotate(day=TruncDate('created_date'))
+        .values('center_id', 'course_id', 'day').annotate(count=Count('id')).order_by()
+    )
+    ApplicationDailyStats.objects.bulk_create((ApplicationDailyStats(**row) for row in rows), batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('learning_centers', '0007_educenters_picture_variants'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ApplicationDailyStats',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('day', models.DateField()),
+                ('count', models.PositiveIntegerField(default=0)),
+                ('center', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='daily_stats', to='learning_centers.educenters')),
+                ('course', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='daily_stats', to='learning_centers.courses')),
+            ],
+            options={
+                'verbose_name': 'Application daily stats',
+                'verbose_name_plural': 'Application daily stats',
+                'constraints': [models.UniqueConstraint(fields=('center', 'day', 'course'), name='unique_application_daily_stats')],
+            },
+        ),
+        migrations.RunPython(fill_daily_stats, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,42 @@
+# Generated by Django 5.2.11 on 2026-10-18 12:44
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+THROUGH_INDEX = 'educenters_courses_course_center_idx'
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('learning_centers', '0008_application_daily_stats'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='application',
+            index=models.Index(fields=['owner', 'created_date'], name='application_owner_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='application',
+            index=models.Index(fields=['center', 'course', 'created_date'], name='application_center_course_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='educenters',
+            index=models.Index(fields=['cost'], name='educenters_cost_idx'),
+        ),
+        # the owner index is a prefix of application_owner_created_idx now
+        migrations.AlterField(
+            model_name='application',
+            name='owner',
+            field=models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='applies', to=settings.AUTH_USER_MODEL),
+        ),
+        # centers of a course straight from the index, without reading the link rows
+        migrations.RunSQL(
+            f'CREATE INDEX {THROUGH_INDEX} ON learning_centers_educenters_courses (courses_id, educenters_id)',
+            f'DROP INDEX {THROUGH_INDEX}',
+        ),
+    ]
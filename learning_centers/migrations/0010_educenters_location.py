@@ -0,0 +1,35 @@
+# Generated by Django 5.2.11 on 2026-10-18 13:15
+
+import django.core.validators
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('learning_centers', '0009_query_indexes'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='educenters',
+            name='geohash',
+            field=models.CharField(blank=True, editable=False, max_length=8, null=True),
+        ),
+        migrations.AddField(
+            model_name='educenters',
+            name='latitude',
+            field=models.FloatField(blank=True, null=True, validators=[django.core.validators.MinValueValidator(-90), django.core.validators.MaxValueValidator(90)]),
+        ),
+        migrations.AddField(
+            model_name='educenters',
+            name='longitude',
+            field=models.FloatField(blank=True, null=True, validators=[django.core.validators.MinValueValidator(-180), django.core.validators.MaxValueValidator(180)]),
+        ),
+        migrations.AddIndex(
+            model_name='educenters',
+            index=models.Index(fields=['geohash'], name='educenters_geohash_idx'),
+        ),
+    ]
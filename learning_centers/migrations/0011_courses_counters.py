@@ -0,0 +1,49 @@
+# Generated by Django 5.2.11 on 2026-10-18 13:32
+
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def fill_counters(apps, schema_editor):
+    Courses = apps.get_model('learning_centers', 'Courses')
+    Application = apps.get_model('learning_centers', 'Application')
+    Through = apps.get_model('learning_centers', 'Educenters').courses.through
+
+    def count(queryset, field):
+        rows = queryset.filter(**{field: OuterRef('pk')}).order_by().values(field).annotate(count=Count('*')).values('count')
+        return Coalesce(Subquery(rows), 0)
+
+    Courses.objects.update(
+        centers_count=count(Through.objects.all(), 'courses_id'),
+        applications_count=count(Application.objects.all(), 'course_id'),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('learning_centers', '0010_educenters_location'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='courses',
+            name='applications_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='courses',
+            name='centers_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddIndex(
+            model_name='courses',
+            index=models.Index(fields=['applications_count', 'id'], name='courses_applications_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='courses',
+            index=models.Index(fields=['centers_count', 'id'], name='courses_centers_idx'),
+        ),
+        migrations.RunPython(fill_counters, migrations.RunPython.noop),
+    ]
@@ -1,9 +1,14 @@
-from django.db import models, transaction, IntegrityError
+from django.conf import settings
+from django.core.validators import MaxValueValidator, MinValueValidator
+from django.db import models
 from django.utils.text import slugify
 from django.db.models import Max
 
 from users_control.models import CustomUser
 
+from . import geo
+from .sequences import BlockAllocator
+
 # Create your models here.
 
 
@@ -11,6 +16,9 @@ from users_control.models import CustomUser
 class Courses(models.Model):
     title = models.CharField(max_length=100)
     slug = models.SlugField(max_length=120, null=True, blank=True, unique=True)
+    # kept up to date by signals.py, see counters.py
+    centers_count = models.PositiveIntegerField(default=0, editable=False)
+    applications_count = models.PositiveIntegerField(default=0, editable=False)
 
     def __str__(self):
         return self.title
@@ -23,12 +31,18 @@ class Courses(models.Model):
     class Meta:
         verbose_name = 'Course'
         verbose_name_plural = 'Courses'
+        indexes = [
+            # ?sort=popular and ?sort=centers pages of the course list
+            models.Index(fields=['applications_count', 'id'], name='courses_applications_idx'),
+            models.Index(fields=['centers_count', 'id'], name='courses_centers_idx'),
+        ]
 
 
 """ Education centers """
 class Educenters(models.Model):
     owner = models.ForeignKey(CustomUser, on_delete=models.CASCADE, null=True, blank=True)  # by default we should write owner = 'ceo'
     picture = models.ImageField(upload_to="educenter_images/", null=True, blank=True)
+    picture_variants = models.JSONField(default=dict, blank=True, editable=False)  # filled by images.py in the background
     official_website = models.URLField(null=True, blank=True)
     cost = models.PositiveIntegerField(null=True, blank=True)
     name = models.CharField(max_length=100)
@@ -37,6 +51,9 @@ class Educenters(models.Model):
     info = models.TextField(null=True, blank=True)
     phone_number = models.CharField(max_length=13, null=True, blank=True)
     phone_number_extra = models.CharField(max_length=13, null=True, blank=True)
+    latitude = models.FloatField(null=True, blank=True, validators=[MinValueValidator(-90), MaxValueValidator(90)])
+    longitude = models.FloatField(null=True, blank=True, validators=[MinValueValidator(-180), MaxValueValidator(180)])
+    geohash = models.CharField(max_length=geo.PRECISION, null=True, blank=True, editable=False)  # of the location, see geo.py
 
     def __str__(self):
         return self.name
@@ -44,38 +61,76 @@ class Educenters(models.Model):
     def save(self, *args, **kwargs):
         if not self.slug:
             self.slug = slugify(self.name)
+        self.geohash = geo.encode(self.latitude, self.longitude)
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None and {'latitude', 'longitude'} & set(update_fields):
+            kwargs['update_fields'] = {*update_fields, 'geohash'}
         return super().save(*args, **kwargs)
     
     class Meta:
         verbose_name = 'Educenter'
         verbose_name_plural = 'Educenters'
+        indexes = [
+            models.Index(fields=['cost'], name='educenters_cost_idx'),  # search cost filters
+            models.Index(fields=['geohash'], name='educenters_geohash_idx'),  # nearby cell ranges
+        ]
+
+
+""" Named counters, see sequences.py """
+class Sequence(models.Model):
+    name = models.CharField(max_length=50, unique=True)
+    value = models.PositiveBigIntegerField(default=0)
+
+    def __str__(self):
+        return f'{self.name}={self.value}'
+
+
+def current_max_index():
+    return Application.objects.aggregate(max_i=Max("index"))["max_i"] or 0 # SELECT MAX(index) AS max_i FROM model_name;
 
 
 class Application(models.Model):
-    owner = models.ForeignKey(CustomUser, on_delete=models.CASCADE, related_name="applies")
+    owner = models.ForeignKey(CustomUser, on_delete=models.CASCADE, related_name="applies", db_index=False)  # see Meta.indexes
     center = models.ForeignKey(Educenters, on_delete=models.CASCADE, related_name="applies")
     course = models.ForeignKey(Courses, on_delete=models.CASCADE, related_name='applies')
     index = models.PositiveIntegerField(editable=False, null=True, blank=True, unique=True)
     content = models.TextField(null=True, blank=True)
     created_date = models.DateTimeField(auto_now_add=True)
 
+    index_allocator = BlockAllocator('application_index', settings.APPLICATION_INDEX_BLOCK_SIZE, start=current_max_index)
+
     def __str__(self):
         return self.owner.username
     
     def save(self, *args, **kwargs):
-        if self.pk and self.index is None:
-            return super().save(*args, **kwargs)
-        
-        for _ in range(5):
-            try:
-                with transaction.atomic():
-                    max_index = Application.objects.aggregate(max_i=Max("index"))["max_i"] or 0 # SELECT MAX(index) AS max_i FROM model_name;
-                    self.index = max_index + 1
-                    return super().save()
-            except IntegrityError:
-                continue
-        raise IntegrityError("Could not assign a unique index after several retries")
+        if self.pk is None and self.index is None:
+            self.index = self.index_allocator.next()
+        return super().save(*args, **kwargs)
     
     class Meta:
         verbose_name = 'Application'
-        verbose_name_plural = 'Applications'
\ No newline at end of file
+        verbose_name_plural = 'Applications'
+        indexes = [
+            # "my applications", newest first, without sorting them; also serves owner lookups
+            models.Index(fields=['owner', 'created_date'], name='application_owner_created_idx'),
+            # applications per center and course, and the stats rebuild
+            models.Index(fields=['center', 'course', 'created_date'], name='application_center_course_idx'),
+        ]
+
+
+""" Daily application counts per center and course, see stats.py """
+class ApplicationDailyStats(models.Model):
+    center = models.ForeignKey(Educenters, on_delete=models.CASCADE, related_name='daily_stats')
+    course = models.ForeignKey(Courses, on_delete=models.CASCADE, related_name='daily_stats')
+    day = models.DateField()
+    count = models.PositiveIntegerField(default=0)
+
+    def __str__(self):
+        return f'{self.center_id}/{self.course_id} {self.day}: {self.count}'
+
+    class Meta:
+        verbose_name = 'Application daily stats'
+        verbose_name_plural = 'Application daily stats'
+        constraints = [
+            models.UniqueConstraint(fields=['center', 'day', 'course'], name='unique_application_daily_stats'),
+        ]
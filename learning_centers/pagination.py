@@ -0,0 +1,192 @@
+from django.conf import settings
+from django.db.models import Q
+
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import CursorPagination, PageNumberPagination, _reverse_ordering
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param, remove_query_param
+
+
+class KeysetPagination(CursorPagination):
+    """
+    Cursor pagination over a unique (or nearly unique) ordering column.
+
+    Every page is fetched with ``WHERE <column> < <cursor position> LIMIT n``,
+    so deep pages cost the same as the first one. Cursors are opaque and
+    the page size can be tuned per request with ``?page_size=``.
+
+    An ordering of several fields (a counter, then the id) keeps all of
+    them in the cursor and pages with ``WHERE a < x OR (a = x AND id < y)``,
+    so rows with equal counters are never paged by offset.
+    """
+    page_size = settings.API_PAGE_SIZE
+    page_size_query_param = 'page_size'
+    max_page_size = 100
+
+    # DRF's paginate_queryset, split around its one query so async views can
+    # run the same cursor logic with the async ORM
+
+    def paginate_queryset(self, queryset, request, view=None):
+        window = self.get_window(queryset, request, view)
+        return None if window is None else self.set_page(list(window))
+
+    async def apaginate_queryset(self, queryset, request, view=None):
+        window = self.get_window(queryset, request, view)
+        return None if window is None else self.set_page([row async for row in window])
+
+    def get_window(self, queryset, request, view=None):
+        """ Returns the queryset slice holding the page plus one row, or None when paging is off. """
+        self.request = request
+        self.page_size = self.get_page_size(request)
+        if not self.page_size:
+            return None
+
+        self.base_url = request.build_absolute_uri()
+        self.ordering = self.get_ordering(request, queryset, view)
+
+        self.cursor = self.decode_cursor(request)
+        offset, reverse, current_position = self.cursor or (0, False, None)
+
+        if reverse:
+            queryset = queryset.order_by(*_reverse_ordering(self.ordering))
+        else:
+            queryset = queryset.order_by(*self.ordering)
+
+        if current_position is not None:
+            queryset = queryset.filter(self.after(current_position))
+
+        return queryset[offset:offset + self.page_size + 1]
+
+    def after(self, position):
+        """ The rows past ``position``, in the direction the cursor pages. """
+        values = position.split(',') if len(self.ordering) > 1 else [position]
+        condition, equal = Q(), Q()
+        for order, value in zip(self.ordering, values):
+            # (cursor reversed) XOR (queryset reversed)
+            lookup = '__lt' if self.cursor.reverse != order.startswith('-') else '__gt'
+            condition |= equal & Q(**{order.lstrip('-') + lookup: value})
+            equal &= Q(**{order.lstrip('-'): value})
+        if len(values) > 1:
+            # the OR alone gives SQLite no range to search the index with
+            first = self.ordering[0]
+            lookup = '__lte' if self.cursor.reverse != first.startswith('-') else '__gte'
+            condition &= Q(**{first.lstrip('-') + lookup: values[0]})
+        return condition
+
+    def _get_position_from_instance(self, instance, ordering):
+        if len(ordering) == 1:
+            return super()._get_position_from_instance(instance, ordering)
+        position = super()._get_position_from_instance
+        return ','.join(position(instance, (order, )) for order in ordering)
+
+    def set_page(self, results):
+        offset, reverse, current_position = self.cursor or (0, False, None)
+        self.page = list(results[:self.page_size])
+
+        if len(results) > len(self.page):
+            has_following_position = True
+            following_position = self._get_position_from_instance(results[-1], self.ordering)
+        else:
+            has_following_position = False
+            following_position = None
+
+        if reverse:
+            self.page = list(reversed(self.page))
+            self.has_next = (current_position is not None) or (offset > 0)
+            self.has_previous = has_following_position
+            if self.has_next:
+                self.next_position = current_position
+            if self.has_previous:
+                self.previous_position = following_position
+        else:
+            self.has_next = has_following_position
+            self.has_previous = (current_position is not None) or (offset > 0)
+            if self.has_next:
+                self.next_position = following_position
+            if self.has_previous:
+                self.previous_position = current_position
+
+        if (self.has_previous or self.has_next) and self.template is not None:
+            self.display_page_controls = True
+        return self.page
+
+
+class CentersPagination(KeysetPagination):
+    ordering = '-id'
+
+
+class CoursesPagination(KeysetPagination):
+    ordering = 'id'
+
+    # ?sort= orderings, busiest first, courses with equal counters in id order
+    sort_query_param = 'sort'
+    sorts = {
+        'popular': ('-applications_count', '-id'),
+        'centers': ('-centers_count', '-id'),
+    }
+
+    def get_ordering(self, request, queryset, view):
+        return self.sorts.get(request.query_params.get(self.sort_query_param), (self.ordering, ))
+
+
+class ApplicationsPagination(KeysetPagination):
+    ordering = '-created_date'
+
+
+class SearchPagination(PageNumberPagination):
+    """
+    Page-numbered pagination for ranked results that can only be sliced.
+
+    One row more than the page size is fetched to find out whether there is
+    a next page, so the matches are never counted. The response has the
+    same ``next``/``previous``/``results`` shape as the cursor pages.
+    """
+    page_size = settings.API_PAGE_SIZE
+    page_size_query_param = 'page_size'
+    max_page_size = 100
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        page_size = self.get_page_size(request)
+        try:
+            self.page_number = int(request.query_params.get(self.page_query_param, 1))
+        except ValueError:
+            self.page_number = 0
+        if self.page_number < 1:
+            raise NotFound('Invalid page.')
+
+        offset = (self.page_number - 1) * page_size
+        rows = queryset[offset:offset + page_size + 1]
+        self.has_next = len(rows) > page_size
+        return rows[:page_size]
+
+    def get_next_link(self):
+        if not self.has_next:
+            return None
+        return replace_query_param(self.request.build_absolute_uri(), self.page_query_param, self.page_number + 1)
+
+    def get_previous_link(self):
+        if self.page_number == 1:
+            return None
+        url = self.request.build_absolute_uri()
+        if self.page_number == 2:
+            return remove_query_param(url, self.page_query_param)
+        return replace_query_param(url, self.page_query_param, self.page_number - 1)
+
+    def get_paginated_response(self, data):
+        return Response({
+            'next': self.get_next_link(),
+            'previous': self.get_previous_link(),
+            'results': data,
+        })
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            'type': 'object',
+            'required': ['results'],
+            'properties': {
+                'next': {'type': 'string', 'nullable': True, 'format': 'uri'},
+                'previous': {'type': 'string', 'nullable': True, 'format': 'uri'},
+                'results': schema,
+            },
+        }
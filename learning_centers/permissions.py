@@ -25,4 +25,8 @@ class IsEduOwner(BasePermission):
 
 class HaveARightToAdd(BasePermission):
     def has_permission(self, request, view):
-        return request.user.have_right_to_add
\ No newline at end of file
+        return request.user.have_right_to_add
+
+class IsCenterOwnerOrAdmin(BasePermission):
+    def has_object_permission(self, request, view, obj):
+        return request.user.is_staff or obj.owner_id == request.user.id
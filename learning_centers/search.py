@@ -0,0 +1,154 @@
+import re
+
+from django.db import connection, transaction
+from django.db.models import Q
+
+from .models import Educenters
+
+
+FTS_TABLE = 'learning_centers_educenters_fts'
+
+# bm25 column weights for (name, info, courses)
+RANK = f'bm25({FTS_TABLE}, 10.0, 1.0, 5.0)'
+
+# centers per IN (...) list, well under SQLite's bound parameter limit
+INDEX_BATCH_SIZE = 500
+
+
+def fts_enabled():
+    return connection.vendor == 'sqlite'
+
+
+def match_expression(query):
+    """ Turns free text into an FTS5 query where every word is a prefix match. """
+    return ' '.join(f'"{word}"*' for word in re.findall(r'\w+', query))
+
+
+def batches(center_ids):
+    center_ids = list(center_ids)
+    return [center_ids[start:start + INDEX_BATCH_SIZE] for start in range(0, len(center_ids), INDEX_BATCH_SIZE)]
+
+
+def index_centers(center_ids):
+    """ (Re)writes the FTS rows of the given centers from the current database state. """
+    if not fts_enabled():
+        return
+
+    for batch in batches(center_ids):
+        centers = Educenters.objects.filter(id__in=batch).prefetch_related('courses').only('id', 'name', 'info')
+        write_index(batch, [
+            (center.id, center.name, center.info, [course.title for course in center.courses.all()])
+            for center in centers
+        ])
+
+
+def write_index(center_ids, rows):
+    """ Replaces the FTS rows of ``center_ids`` with ``(id, name, info, course titles)`` rows. """
+    if not center_ids:
+        return
+
+    rows = [(center_id, name, info or '', ' '.join(titles)) for center_id, name, info, titles in rows]
+    with transaction.atomic(), connection.cursor() as cursor:
+        delete_rows(cursor, center_ids)
+        cursor.executemany(f'INSERT INTO {FTS_TABLE} (rowid, name, info, courses) VALUES (%s, %s, %s, %s)', rows)
+
+
+def delete_rows(cursor, center_ids):
+    for batch in batches(center_ids):
+        cursor.execute(f'DELETE FROM {FTS_TABLE} WHERE rowid IN ({", ".join(["%s"] * len(batch))})', batch)
+
+
+def unindex_centers(center_ids):
+    if not fts_enabled():
+        return
+
+    with connection.cursor() as cursor:
+        delete_rows(cursor, center_ids)
+
+
+def rebuild_index(batch_size=1000):
+    """ Drops every FTS row and indexes all centers again, ``batch_size`` at a time. """
+    if not fts_enabled():
+        return 0
+
+    with transaction.atomic():
+        with connection.cursor() as cursor:
+            cursor.execute(f'DELETE FROM {FTS_TABLE}')
+
+        ids = list(Educenters.objects.order_by('id').values_list('id', flat=True))
+        for start in range(0, len(ids), batch_size):
+            index_centers(ids[start:start + batch_size])
+    return len(ids)
+
+
+class CenterSearch:
+    """
+    Ranked center search, evaluated lazily when sliced.
+
+    On SQLite this reads the FTS5 index and joins the filters onto the
+    matching rowids, so it never scans ``Educenters``. Other databases fall
+    back to ``icontains`` lookups without ranking.
+    """
+
+    def __init__(self, query, cost_min=None, cost_max=None, course=None):
+        self.query = query
+        self.cost_min = cost_min
+        self.cost_max = cost_max
+        self.course = course
+
+    def __getitem__(self, key):
+        if not isinstance(key, slice):
+            return self[key:key + 1][0]
+
+        offset = key.start or 0
+        limit = key.stop - offset
+        if fts_enabled():
+            return self._fts(limit, offset)
+        return list(self._fallback()[offset:offset + limit])
+
+    def _fts(self, limit, offset):
+        match = match_expression(self.query)
+        if not match:
+            return []
+
+        sql = [f'SELECT {FTS_TABLE}.rowid FROM {FTS_TABLE}']
+        if self.cost_min is not None or self.cost_max is not None or self.course:
+            sql.append(f'JOIN learning_centers_educenters center ON center.id = {FTS_TABLE}.rowid')
+        sql.append(f'WHERE {FTS_TABLE} MATCH %s')
+        params = [match]
+        if self.cost_min is not None:
+            sql.append('AND center.cost >= %s')
+            params.append(self.cost_min)
+        if self.cost_max is not None:
+            sql.append('AND center.cost <= %s')
+            params.append(self.cost_max)
+        if self.course:
+            sql.append(
+                'AND EXISTS (SELECT 1 FROM learning_centers_educenters_courses link '
+                'JOIN learning_centers_courses course ON course.id = link.courses_id '
+                'WHERE link.educenters_id = center.id AND course.slug = %s)'
+            )
+            params.append(self.course)
+        sql.append(f'ORDER BY {RANK} LIMIT %s OFFSET %s')
+        params += [limit, offset]
+
+        with connection.cursor() as cursor:
+            cursor.execute(' '.join(sql), params)
+            ids = [row[0] for row in cursor.fetchall()]
+
+        centers = Educenters.objects.in_bulk(ids)
+        return [centers[center_id] for center_id in ids if center_id in centers]
+
+    def _fallback(self):
+        queryset = Educenters.objects.all()
+        for word in re.findall(r'\w+', self.query):
+            queryset = queryset.filter(
+                Q(name__icontains=word) | Q(info__icontains=word) | Q(courses__title__icontains=word)
+            )
+        if self.cost_min is not None:
+            queryset = queryset.filter(cost__gte=self.cost_min)
+        if self.cost_max is not None:
+            queryset = queryset.filter(cost__lte=self.cost_max)
+        if self.course:
+            queryset = queryset.filter(courses__slug=self.course)
+        return queryset.distinct().order_by('-id')
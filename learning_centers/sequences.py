@@ -0,0 +1,81 @@
+import itertools
+import os
+import threading
+
+from django.apps import apps
+from django.db import connection, transaction, IntegrityError
+from django.db.models import F
+
+
+def reserve(name, count=1, start=0):
+    """
+    Atomically takes the next ``count`` values of the named counter and
+    returns them as a range.
+
+    The counter row is bumped with a single ``UPDATE ... SET value = value + n``
+    so concurrent callers queue on one row lock for the length of one
+    statement instead of racing on ``SELECT MAX()``. ``start`` (a value or a
+    callable) seeds the counter the first time it is used.
+    """
+    Sequence = apps.get_model('learning_centers', 'Sequence')
+
+    with transaction.atomic():
+        updated = Sequence.objects.filter(name=name).update(value=F('value') + count)
+        if updated:
+            value = Sequence.objects.filter(name=name).values_list('value', flat=True).get()
+            return range(value - count + 1, value + 1)
+
+    try:
+        with transaction.atomic():
+            Sequence.objects.create(name=name, value=start() if callable(start) else start)
+    except IntegrityError:
+        pass  # someone else created it first
+    return reserve(name, count)
+
+
+class BlockAllocator:
+    """
+    Hands out values of a named counter from blocks reserved in advance.
+
+    With ``block_size=1`` every value costs one ``reserve`` call and values
+    stay dense. Bigger blocks let a worker serve ``block_size`` allocations
+    from memory, at the price of gaps when a worker exits with values left.
+    Blocks are dropped after a fork so children never share them.
+
+    A block reserved inside a transaction is only kept once that transaction
+    commits: a rollback hands its values out again, so caching them right
+    away would allocate them twice.
+    """
+
+    def __init__(self, name, block_size=1, start=0):
+        self.name = name
+        self.block_size = block_size
+        self.start = start
+        self._lock = threading.Lock()
+        self._block = iter(())
+        self._pid = None
+
+    def take(self, count):
+        """ Returns ``count`` values, reserved in one round-trip when the local block runs short. """
+        with self._lock:
+            if self._pid != os.getpid():
+                self._block, self._pid = iter(()), os.getpid()
+
+            values = [value for _, value in zip(range(count), self._block)]
+            missing = count - len(values)
+            if missing:
+                block = reserve(self.name, max(missing, self.block_size), self.start)
+                values += block[:missing]
+                if connection.in_atomic_block:
+                    transaction.on_commit(lambda: self._keep(block[missing:]))
+                else:
+                    self._block = iter(block[missing:])
+            return values
+
+    def _keep(self, values):
+        with self._lock:
+            if self._pid == os.getpid():
+                self._block = itertools.chain(self._block, values)
+
+    def next(self):
+        return self.take(1)[0]
@@ -1,28 +1,131 @@
+from urllib.parse import quote
+
 from rest_framework import serializers
 
+from django.conf import settings
+from django.db import models, transaction
 from django.urls import reverse
+from django.utils.http import RFC3986_SUBDELIMS
+from drf_spectacular.utils import extend_schema_field
+
+from config.fieldsets import FieldsetMixin
+from config.timing import TimedSerializerMixin, timed
 
+from . import geo
 from .models import Educenters, Courses, Application
+from .stats import record_created
+from .counters import add_applications, count_courses
 
 from users_control.serializers import UserShortSerializer
 from users_control.models import CustomUser
 
 
 
-class CoursesSerializer(serializers.ModelSerializer):
+class CoursesSerializer(FieldsetMixin, TimedSerializerMixin, serializers.ModelSerializer):
     class Meta:
         model = Courses
         fields = ['id', 'title', 'slug']
 
 
+class CoursesDetailSerializer(CoursesSerializer):
+    """ A course with its counters, for the course endpoints (centers embed the plain one). """
+    class Meta(CoursesSerializer.Meta):
+        fields = [*CoursesSerializer.Meta.fields, 'centers_count', 'applications_count']
+
+
+
+class CentersFastListSerializer(serializers.ListSerializer):
+    """
+    Read-only list path of ``CentersListSerializer``.
+
+    Rows are built straight from ``.values(*VALUES)`` dicts (model instances
+    work too) and ``detail_url`` comes from a URL template reversed once per
+    list, instead of going through every field and ``reverse()`` per row.
+    The output is identical to the per-row serializer, ``?fields=`` included:
+    the URLs of the fields left out aren't built.
+    """
+    VALUES = ('id', 'name', 'slug', 'info', 'phone_number', 'picture', 'picture_variants', 'cost', 'owner_id')
+
+    def to_representation(self, data):
+        with timed('serialize'):
+            rows = self.build_rows(data)
+            fields = self.child.fieldset.fields
+            if fields is not None:
+                rows = [{name: value for name, value in row.items() if name in fields} for row in rows]
+            return rows
+
+    def build_rows(self, data):
+        request = self.context.get('request')
+        storage = Educenters._meta.get_field('picture').storage
+        wants = self.child.fieldset.wants
+        pictures, variants_wanted, urls = wants('picture'), wants('picture_variants'), wants('detail_url')
+
+        placeholder = 'slug-placeholder'
+        prefix, suffix = reverse("educenters-detail", kwargs={'slug': placeholder}).split(placeholder)
+        if request:
+            prefix = request.build_absolute_uri(prefix)
+        safe = RFC3986_SUBDELIMS + "/~:@"
+
+        rows = []
+        for row in data.all() if isinstance(data, models.manager.BaseManager) else data:
+            if not isinstance(row, dict):
+                row = {
+                    'id': row.id, 'name': row.name, 'slug': row.slug, 'info': row.info,
+                    'phone_number': row.phone_number, 'picture': row.picture.name,
+                    'picture_variants': row.picture_variants, 'cost': row.cost, 'owner_id': row.owner_id,
+                }
+
+            picture = pictures and row['picture'] or None
+            if picture:
+                picture = storage.url(picture)
+                if request:
+                    picture = request.build_absolute_uri(picture)
+
+            variants = {}
+            for variant, name in row['picture_variants'].items() if variants_wanted else ():
+                variants[variant] = request.build_absolute_uri(storage.url(name)) if request else storage.url(name)
+
+            rows.append({
+                'id': row['id'],
+                'name': row['name'],
+                'slug': row['slug'],
+                'info': row['info'],
+                'phone_number': row['phone_number'],
+                'picture': picture,
+                'picture_variants': variants,
+                'cost': row['cost'],
+                'detail_url': prefix + quote(str(row['slug']), safe=safe) + suffix if urls else None,
+                'owner': row['owner_id'],
+            })
+        return rows
 
-class CentersListSerializer(serializers.ModelSerializer):
+
+class PictureVariantsSerializer(serializers.Serializer):
+    """ URLs of the resized copies of the picture (images.VARIANTS), missing until they are rendered. """
+    thumbnail = serializers.URLField(required=False)
+    thumbnail_webp = serializers.URLField(required=False)
+    medium_webp = serializers.URLField(required=False)
+
+
+class CentersListSerializer(FieldsetMixin, TimedSerializerMixin, serializers.ModelSerializer):
+    picture_variants = serializers.SerializerMethodField()
     detail_url = serializers.SerializerMethodField()
 
     class Meta:
         model = Educenters
-        fields = ['id', 'name', 'slug', 'info', 'phone_number', 'picture', 'cost', 'detail_url', 'owner']
+        fields = ['id', 'name', 'slug', 'info', 'phone_number', 'picture', 'picture_variants', 'cost', 'detail_url', 'owner']
         read_only_fields = ("owner", )
+        list_serializer_class = CentersFastListSerializer
+
+    @extend_schema_field(PictureVariantsSerializer)
+    def get_picture_variants(self, obj):
+        request = self.context.get('request')
+        storage = obj.picture.storage
+
+        urls = {}
+        for variant, name in obj.picture_variants.items():
+            urls[variant] = request.build_absolute_uri(storage.url(name)) if request else storage.url(name)
+        return urls
 
     def get_detail_url(self, obj):
         request = self.context.get('request')
@@ -31,8 +134,8 @@ class CentersListSerializer(serializers.ModelSerializer):
         return request.build_absolute_uri(url) if request else url
 
 
-class CentersRetrieveSerializer(serializers.ModelSerializer):
-    courses = CoursesSerializer(many=True, read_only=True)
+class CentersRetrieveSerializer(FieldsetMixin, TimedSerializerMixin, serializers.ModelSerializer):
+    courses = serializers.PrimaryKeyRelatedField(many=True, read_only=True)
 
     course_ids = serializers.PrimaryKeyRelatedField(
         source='courses',
@@ -45,16 +148,83 @@ class CentersRetrieveSerializer(serializers.ModelSerializer):
         model = Educenters
         fields = ['id', 'name', 'slug', 'info', 'phone_number', 
                   'phone_number_extra', 'courses', 'cost', 
-                  'official_website', 'picture', 'course_ids']
+                  'official_website', 'picture', 'course_ids', 'latitude', 'longitude']
         read_only_fields = ['slug']
+        expandable_fields = {'courses': (CoursesSerializer, {'many': True})}
+
+    def validate(self, attrs):
+        location = [attrs.get(name, getattr(self.instance, name, None)) for name in ('latitude', 'longitude')]
+        if location.count(None) == 1:
+            raise serializers.ValidationError('latitude and longitude have to be given together.')
+        return attrs
+
+
+
+class CentersSearchSerializer(serializers.Serializer):
+    q = serializers.CharField(max_length=200)
+    cost_min = serializers.IntegerField(min_value=0, required=False)
+    cost_max = serializers.IntegerField(min_value=0, required=False)
+    course = serializers.SlugField(required=False)
+
+
+
+class CentersNearbyQuerySerializer(serializers.Serializer):
+    lat = serializers.FloatField(min_value=-90, max_value=90)
+    lng = serializers.FloatField(min_value=-180, max_value=180)
+    radius = serializers.FloatField(
+        min_value=0, max_value=geo.MAX_DISTANCE_KM, required=False,
+        help_text='Kilometres. Without it the `limit` nearest centers are returned, however far',
+    )
+    limit = serializers.IntegerField(min_value=1, max_value=100, default=settings.API_PAGE_SIZE)
 
 
+class CentersNearbyListSerializer(CentersFastListSerializer):
+    """ ``CentersFastListSerializer`` rows of ``geo.nearby`` results, with their location and distance. """
 
-class ApplicationsSerializer(serializers.ModelSerializer):
-    owner = UserShortSerializer(read_only=True)
-    center = CentersRetrieveSerializer(read_only=True)
-    course = CoursesSerializer(read_only=True)
+    def build_rows(self, data):
+        rows = super().build_rows(data)
+        for row, center in zip(rows, data):
+            row.update(latitude=center['latitude'], longitude=center['longitude'],
+                       distance_km=round(center['distance_km'], 3))
+        return rows
 
+
+class CentersNearbySerializer(CentersListSerializer):
+    distance_km = serializers.FloatField(read_only=True)
+
+    class Meta(CentersListSerializer.Meta):
+        fields = CentersListSerializer.Meta.fields + ['latitude', 'longitude', 'distance_km']
+        list_serializer_class = CentersNearbyListSerializer
+
+
+class CenterStatsQuerySerializer(serializers.Serializer):
+    days = serializers.IntegerField(min_value=1, max_value=365, default=30)
+
+
+class CourseCountSerializer(serializers.Serializer):
+    course_id = serializers.IntegerField()
+    course = serializers.CharField()
+    count = serializers.IntegerField()
+
+
+class DailyCountSerializer(serializers.Serializer):
+    day = serializers.DateField()
+    count = serializers.IntegerField()
+
+
+class CenterStatsSerializer(TimedSerializerMixin, serializers.Serializer):
+    since = serializers.DateField()
+    until = serializers.DateField()
+    total = serializers.IntegerField()
+    period_total = serializers.IntegerField()
+    previous_period_total = serializers.IntegerField()
+    trend = serializers.FloatField(allow_null=True, help_text='Change of period_total against previous_period_total')
+    courses = CourseCountSerializer(many=True)
+    daily = DailyCountSerializer(many=True)
+
+
+
+class ApplicationsSerializer(FieldsetMixin, TimedSerializerMixin, serializers.ModelSerializer):
     center_id = serializers.PrimaryKeyRelatedField(
         source='center',
         queryset=Educenters.objects.all(),
@@ -70,5 +240,82 @@ class ApplicationsSerializer(serializers.ModelSerializer):
     class Meta:
         model = Application
         fields = ['id', 'owner', 'center', 'course', 'content', 'index', 'center_id', 'course_id', 'created_date']
+        read_only_fields = ['owner', 'center', 'course']
+        expandable_fields = {
+            'owner': (UserShortSerializer, {}),
+            'center': (CentersRetrieveSerializer, {}),
+            'course': (CoursesSerializer, {}),
+        }
+
+    @staticmethod
+    def setup_eager_loading(queryset, fieldset):
+        """ Joins and prefetches only the relations ``fieldset`` renders, the others are read from their ``_id``. """
+        queryset = queryset.select_related(*(name for name in ('owner', 'center', 'course') if fieldset.expands(name)))
+        if fieldset.expands('center') and fieldset.child('center').wants('courses'):
+            queryset = queryset.prefetch_related('center__courses')
+        return queryset
+
+
+
+class ApplicationsBulkItemSerializer(serializers.Serializer):
+    center_id = serializers.IntegerField(min_value=1)
+    course_id = serializers.IntegerField(min_value=1)
+    content = serializers.CharField(required=False, allow_null=True, allow_blank=True)
+
+
+class ApplicationsBulkSerializer(serializers.Serializer):
+    """
+    Several applications in one request.
+
+    Centers and courses are looked up with one query per model, the indexes
+    are reserved as one block and the rows are inserted with a single
+    ``bulk_create``. Items pointing at a missing center or course are
+    reported in ``results`` and the others are still created.
+    """
+    applications = ApplicationsBulkItemSerializer(
+        many=True, allow_empty=False, max_length=settings.APPLICATION_BULK_MAX_ITEMS
+    )
+
+    def create(self, validated_data):
+        items = validated_data['applications']
+        existing = {
+            'center_id': set(Educenters.objects.filter(pk__in={item['center_id'] for item in items}).values_list('pk', flat=True)),
+            'course_id': set(Courses.objects.filter(pk__in={item['course_id'] for item in items}).values_list('pk', flat=True)),
+        }
+        does_not_exist = serializers.PrimaryKeyRelatedField.default_error_messages['does_not_exist']
+
+        results, applications = [], []
+        for item in items:
+            errors = {
+                field: [does_not_exist.format(pk_value=item[field])]
+                for field, pks in existing.items() if item[field] not in pks
+            }
+            if errors:
+                results.append({'status': 'error', 'errors': errors})
+                continue
+
+            application = Application(
+                owner=validated_data['owner'], center_id=item['center_id'],
+                course_id=item['course_id'], content=item.get('content'),
+            )
+            applications.append(application)
+            results.append(application)
+
+        for application, index in zip(applications, Application.index_allocator.take(len(applications))):
+            application.index = index
+        with transaction.atomic():
+            Application.objects.bulk_create(applications)
+            record_created(applications)  # bulk_create sends no post_save
+            add_applications(count_courses(applications))
+
+        return [
+            {'status': 'created', 'id': result.id, 'index': result.index}
+            if isinstance(result, Application) else result
+            for result in results
+        ]
+
 
-        
\ No newline at end of file
+class ApplicationsBulkResultSerializer(serializers.Serializer):
+    created = serializers.IntegerField()
+    failed = serializers.IntegerField()
+    results = serializers.ListField(child=serializers.DictField())
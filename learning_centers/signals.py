@@ -0,0 +1,134 @@
+from django.db.models.signals import pre_save, post_save, post_delete, pre_delete, m2m_changed
+from django.dispatch import receiver
+
+from .caching import bump_version
+from .counters import add_centers, add_applications
+from .images import schedule_variants, up_to_date
+from .models import Educenters, Courses, Application
+from .search import index_centers, unindex_centers
+from .stats import stats_key, record, record_created, record_deleted
+
+
+""" Full-text search index """
+
+@receiver(post_save, sender=Educenters)
+def index_saved_center(sender, instance, **kwargs):
+    index_centers([instance.pk])
+
+
+@receiver(post_delete, sender=Educenters)
+def unindex_deleted_center(sender, instance, **kwargs):
+    unindex_centers([instance.pk])
+
+
+@receiver(m2m_changed, sender=Educenters.courses.through)
+def index_centers_on_courses_change(sender, instance, action, reverse, pk_set, **kwargs):
+    if action == 'pre_clear' and reverse:
+        # course.educenters.clear() does not tell post_clear which centers it touched
+        instance._cleared_center_ids = list(instance.educenters.values_list('id', flat=True))
+    elif action in ('post_add', 'post_remove'):
+        index_centers(pk_set if reverse else [instance.pk])
+    elif action == 'post_clear':
+        index_centers(instance.__dict__.pop('_cleared_center_ids', []) if reverse else [instance.pk])
+
+
+@receiver(post_save, sender=Courses)
+def index_centers_on_course_rename(sender, instance, created, **kwargs):
+    if not created:
+        index_centers(instance.educenters.values_list('id', flat=True))
+
+
+@receiver(pre_delete, sender=Courses)
+def remember_course_centers(sender, instance, **kwargs):
+    instance._deleted_center_ids = list(instance.educenters.values_list('id', flat=True))
+
+
+@receiver(post_delete, sender=Courses)
+def index_centers_on_course_delete(sender, instance, **kwargs):
+    index_centers(instance.__dict__.pop('_deleted_center_ids', []))
+
+
+""" Response cache versions """
+
+@receiver(post_save, sender=Educenters)
+@receiver(post_delete, sender=Educenters)
+def bump_centers_version(sender, **kwargs):
+    bump_version(Educenters)
+
+
+@receiver(m2m_changed, sender=Educenters.courses.through)
+def bump_centers_version_on_courses_change(sender, action, **kwargs):
+    if action.startswith('post_'):
+        bump_version(Educenters)
+
+
+@receiver(post_save, sender=Courses)
+@receiver(post_delete, sender=Courses)
+def bump_courses_version(sender, **kwargs):
+    bump_version(Courses)
+
+
+""" Picture variants """
+
+@receiver(post_save, sender=Educenters)
+def render_picture_variants(sender, instance, **kwargs):
+    if not up_to_date(instance.picture.name, instance.picture_variants):
+        schedule_variants(instance.pk)
+
+
+""" Application statistics rollup """
+
+@receiver(pre_save, sender=Application)
+def remember_application_stats_key(sender, instance, **kwargs):
+    if not instance._state.adding:
+        old = Application.objects.filter(pk=instance.pk).only('center_id', 'course_id', 'created_date').first()
+        instance._old_stats_key = stats_key(old) if old else None
+
+
+@receiver(post_save, sender=Application)
+def count_saved_application(sender, instance, created, **kwargs):
+    if created:
+        record_created([instance])
+        add_applications({instance.course_id: 1})
+        return
+
+    old, new = instance.__dict__.pop('_old_stats_key', None), stats_key(instance)
+    if old and old != new:
+        record({old: -1, new: 1})
+        add_applications({old[1]: -1, new[1]: 1})  # a no-op unless the course changed
+
+
+@receiver(post_delete, sender=Application)
+def count_deleted_application(sender, instance, **kwargs):
+    record_deleted([instance])
+    add_applications({instance.course_id: -1})
+
+
+""" Course counters """
+
+@receiver(m2m_changed, sender=Educenters.courses.through)
+def count_centers_on_courses_change(sender, instance, action, reverse, pk_set, **kwargs):
+    if action in ('pre_remove', 'pre_clear'):
+        # remove() reports every pk it was given, linked or not, clear() none
+        links = sender.objects.filter(**{'courses_id' if reverse else 'educenters_id': instance.pk})
+        if action == 'pre_remove':
+            links = links.filter(**{'educenters_id__in' if reverse else 'courses_id__in': pk_set})
+        if reverse:
+            instance._unlinked_centers = {instance.pk: -links.count()}
+        else:
+            instance._unlinked_centers = {course_id: -1 for course_id in links.values_list('courses_id', flat=True)}
+    elif action in ('post_remove', 'post_clear'):
+        add_centers(instance.__dict__.pop('_unlinked_centers', {}))
+    elif action == 'post_add':
+        add_centers({instance.pk: len(pk_set)} if reverse else dict.fromkeys(pk_set, 1))
+
+
+@receiver(pre_delete, sender=Educenters)
+def remember_center_courses(sender, instance, **kwargs):
+    # the links go with the center without an m2m_changed signal
+    instance._deleted_course_ids = list(instance.courses.values_list('id', flat=True))
+
+
+@receiver(post_delete, sender=Educenters)
+def count_centers_on_center_delete(sender, instance, **kwargs):
+    add_centers(dict.fromkeys(instance.__dict__.pop('_deleted_course_ids', []), -1))
@@ -0,0 +1,132 @@
+import itertools
+from collections import Counter
+from datetime import timedelta
+
+from django.db import IntegrityError, connection, transaction
+from django.db.models import Count, F, Sum
+from django.db.models.functions import TruncDate
+from django.utils import timezone
+
+from .models import Application, ApplicationDailyStats
+
+
+def stats_key(application):
+    return application.center_id, application.course_id, timezone.localdate(application.created_date)
+
+
+def record(deltas):
+    """
+    Adds ``{(center_id, course_id, day): delta}`` to the daily rollup.
+
+    Increments go in as one ``INSERT ... ON CONFLICT DO UPDATE SET count =
+    count + excluded.count`` where the database supports it, otherwise one
+    ``UPDATE`` per key with an insert for missing rows. Decrements never
+    take a count below zero, a rollup that drifted is fixed by
+    ``rebuild_application_stats``.
+    """
+    increments = {key: delta for key, delta in deltas.items() if delta > 0}
+    for (center_id, course_id, day), delta in deltas.items():
+        if delta < 0:
+            ApplicationDailyStats.objects.filter(
+                center_id=center_id, course_id=course_id, day=day, count__gte=-delta
+            ).update(count=F('count') + delta)
+
+    if not increments:
+        return
+    if connection.features.supports_update_conflicts_with_target:
+        _upsert(increments)
+        return
+
+    for (center_id, course_id, day), delta in increments.items():
+        rows = ApplicationDailyStats.objects.filter(center_id=center_id, course_id=course_id, day=day)
+        if rows.update(count=F('count') + delta):
+            continue
+        try:
+            with transaction.atomic():
+                ApplicationDailyStats.objects.create(center_id=center_id, course_id=course_id, day=day, count=delta)
+        except IntegrityError:
+            rows.update(count=F('count') + delta)  # someone else created it first
+
+
+def _upsert(increments, batch_size=200):
+    table = ApplicationDailyStats._meta.db_table
+    day_field = ApplicationDailyStats._meta.get_field('day')
+    items = list(increments.items())
+
+    with connection.cursor() as cursor:
+        for start in range(0, len(items), batch_size):
+            batch = items[start:start + batch_size]
+            params = []
+            for (center_id, course_id, day), delta in batch:
+                params += [center_id, course_id, day_field.get_db_prep_value(day, connection), delta]
+            cursor.execute(
+                f'INSERT INTO {table} (center_id, course_id, day, count) '
+                f'VALUES {", ".join(["(%s, %s, %s, %s)"] * len(batch))} '
+                f'ON CONFLICT (center_id, day, course_id) DO UPDATE SET count = {table}.count + excluded.count',
+                params,
+            )
+
+
+def record_created(applications):
+    record(Counter(stats_key(application) for application in applications))
+
+
+def record_deleted(applications):
+    record({key: -count for key, count in Counter(stats_key(application) for application in applications).items()})
+
+
+def rebuild(batch_size=1000):
+    """ Recomputes the whole rollup from the applications table, returns the number of rows written. """
+    rows = (
+        Application.objects.annotate(day=TruncDate('created_date'))
+        .values('center_id', 'course_id', 'day').annotate(count=Count('id')).order_by()
+    )
+
+    written = 0
+    with transaction.atomic():
+        ApplicationDailyStats.objects.all().delete()
+        iterator = rows.iterator(chunk_size=batch_size)
+        while batch := list(itertools.islice(iterator, batch_size)):
+            ApplicationDailyStats.objects.bulk_create(ApplicationDailyStats(**row) for row in batch)
+            written += len(batch)
+    return written
+
+
+def center_stats(center, days=30, today=None):
+    """
+    Application counts of ``center`` from the rollup: per day and per course
+    over the last ``days`` days, the same period before it and all time.
+
+    It reads at most ``2 * days * courses`` rollup rows, however many
+    applications there are.
+    """
+    today = today or timezone.localdate()
+    since = today - timedelta(days=days - 1)
+    rows = ApplicationDailyStats.objects.filter(center=center, day__gte=since - timedelta(days=days), day__lte=today)
+
+    daily, courses, previous = Counter(), Counter(), 0
+    for day, course_id, title, count in rows.values_list('day', 'course_id', 'course__title', 'count'):
+        if day >= since:
+            daily[day] += count
+            courses[course_id, title] += count
+        else:
+            previous += count
+
+    total = ApplicationDailyStats.objects.filter(center=center).aggregate(total=Sum('count'))['total'] or 0
+    current = sum(daily.values())
+    return {
+        'since': since,
+        'until': today,
+        'total': total,
+        'period_total': current,
+        'previous_period_total': previous,
+        'trend': round((current - previous) / previous, 4) if previous else None,
+        'courses': [
+            {'course_id': course_id, 'course': title, 'count': count}
+            for (course_id, title), count in courses.most_common()
+        ],
+        'daily': [
+            {'day': since + timedelta(days=offset), 'count': daily[since + timedelta(days=offset)]}
+            for offset in range(days)
+        ],
+    }
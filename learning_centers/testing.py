@@ -0,0 +1,107 @@
+import re
+
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+
+class QueryBudgetMixin:
+    """
+    TestCase mixin that catches N+1 regressions.
+
+    ``assertQueryBudget`` requests an endpoint twice, with ``seed`` called in
+    between to add more rows, and fails if the second request needs more
+    queries than the first. ``budget`` optionally caps the absolute count.
+    """
+
+    def count_queries(self, url, method='get', **kwargs):
+        with CaptureQueriesContext(connection) as ctx:
+            response = getattr(self.client, method)(url, **kwargs)
+        return response, ctx.captured_queries
+
+    def assertQueryBudget(self, url, seed, small=2, large=12, budget=None):
+        seed(small)
+        response, small_queries = self.count_queries(url)
+        self.assertEqual(response.status_code, 200, response.content)
+
+        seed(large - small)
+        response, large_queries = self.count_queries(url)
+        self.assertEqual(response.status_code, 200, response.content)
+
+        sql = '\n'.join(query['sql'] for query in large_queries)
+        self.assertEqual(
+            len(small_queries), len(large_queries),
+            f'{url} runs {len(small_queries)} queries for {small} rows but {len(large_queries)} for {large}:\n{sql}'
+        )
+        if budget is not None:
+            self.assertLessEqual(len(large_queries), budget, f'{url} is over its query budget:\n{sql}')
+
+
+class QueryPlanMixin:
+    """
+    TestCase mixin that catches missing indexes.
+
+    ``assertIndexedPlans`` requests an endpoint, runs ``EXPLAIN QUERY PLAN``
+    on every SELECT it sent and fails if a plan scans a whole table or sorts
+    every matching row in a temporary B-tree. Scanning a table in rowid or
+    index order is fine when the query has a LIMIT and every column it
+    filters on is looked up by a SEARCH, it stops early. Seed the
+    tables to a realistic size and ``ANALYZE`` them first, SQLite plans
+    small tables differently. ``allow`` lists plan lines to accept, by
+    prefix.
+    """
+    SORT = 'USE TEMP B-TREE'
+    ORDERED_SCAN = re.compile(r'^SCAN \w+(?: AS \w+)?(?: USING (?:COVERING )?INDEX \w+)?$')
+    SEARCH = re.compile(r'^SEARCH (\w+)(?: AS (\w+))? USING .*?\((.*)\)$', re.MULTILINE)
+    COLUMN = re.compile(r'"?(\w+)"?\."(\w+)"')
+
+    def capture_selects(self, url, data=None):
+        statements = []
+
+        def capture(execute, sql, params, many, context):
+            if sql.lstrip().upper().startswith('SELECT'):
+                statements.append((sql, params))
+            return execute(sql, params, many, context)
+
+        with connection.execute_wrapper(capture):
+            response = self.client.get(url, data)
+            if response.streaming:
+                b''.join(response.streaming_content)
+        return response, statements
+
+    def query_plan(self, sql, params):
+        with connection.cursor() as cursor:
+            cursor.execute(f'EXPLAIN QUERY PLAN {sql}', params)
+            return [row[-1] for row in cursor.fetchall()]
+
+    def plan_problems(self, sql, plan, allow=()):
+        plan = [line for line in plan if not line.startswith(tuple(allow))]
+        sorts = [line for line in plan if line.startswith(self.SORT)]
+        scans = [
+            line for line in plan
+            if line.startswith('SCAN ') and 'VIRTUAL TABLE' not in line and 'CONSTANT ROW' not in line
+        ]
+        if ' LIMIT ' in sql.upper() and not sorts and all(self.ORDERED_SCAN.match(line) for line in scans):
+            if not self.unindexed_filters(sql, plan):
+                scans = []  # walked in order and stopped by the LIMIT
+        return scans + sorts
+
+    def unindexed_filters(self, sql, plan):
+        """ The ``table.column`` of the WHERE clause no SEARCH of ``plan`` looks up, those rows are read and dropped. """
+        where = re.split(r' WHERE ', sql, maxsplit=1, flags=re.IGNORECASE)[1:]
+        where = re.split(r' (?:GROUP BY|ORDER BY|LIMIT) ', where[0], flags=re.IGNORECASE)[0] if where else ''
+
+        searched = set()
+        for table, alias, constraints in self.SEARCH.findall('\n'.join(plan)):
+            columns = {'id' if column == 'rowid' else column for column in re.findall(r'(\w+)\s*[=<>]', constraints)}
+            searched |= {(name, column) for name in (table, alias) if name for column in columns}
+        return sorted(set(self.COLUMN.findall(where)) - searched)
+
+    def assertIndexedPlans(self, url, data=None, allow=()):
+        response, statements = self.capture_selects(url, data)
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(statements, f'{url} sent no queries')
+
+        for sql, params in statements:
+            plan = self.query_plan(sql, params)
+            problems = self.plan_problems(sql, plan, allow)
+            self.assertFalse(problems, f'{url} runs\n{sql}\nwith the plan\n' + '\n'.join(plan))
@@ -1,3 +1,1394 @@
-from django.test import TestCase
+import csv
+import gzip
+import io
+import json
+import os
+import random
+import shutil
+import tempfile
+import time
+from base64 import b64decode
+from datetime import datetime, timedelta
+from decimal import Decimal
+from unittest import mock, skipUnless
+from urllib.parse import parse_qs, urlparse
+
+from asgiref.sync import async_to_sync, sync_to_async
+from django.conf import settings
+from django.core.cache import cache
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import CommandError, call_command
+from django.db import connection, transaction, IntegrityError, OperationalError
+from django.db.utils import ConnectionHandler
+from django.http import HttpResponse
+from django.test import RequestFactory, SimpleTestCase, TestCase, TransactionTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import path, reverse
+from django.urls.resolvers import RegexPattern, URLResolver
+from django.utils import timezone
+
+from rest_framework import permissions, serializers
+from rest_framework.renderers import JSONRenderer
+from rest_framework.request import Request
+from rest_framework.test import APITestCase, APIRequestFactory
+from rest_framework_simplejwt.tokens import AccessToken
+from drf_spectacular.drainage import GENERATOR_STATS
+
+from config import compression, openapi, throttling
+from config.renderers import FastJSONRenderer
+from config.aio import read_async
+from config.lean import LazyAdminResolver, lazy_view
+from config.db import ReplicaMiddleware, ReplicaRouter, sqlite_databases, use_primary
+
+from users_control.models import CustomUser
+
+from .models import Educenters, Courses, Application, ApplicationDailyStats, Sequence
+from .views import ApplicationsView
+from .caching import get_stats, reset_stats, response_cache
+from . import async_views, geo, images, search
+from .images import expected_variants, generate_variants
+from .search import CenterSearch
+from .serializers import CentersListSerializer, CentersFastListSerializer
+from .sequences import reserve, BlockAllocator
+from .testing import QueryBudgetMixin, QueryPlanMixin
 
 # Create your tests here.
+
+
+@override_settings(SECURE_SSL_REDIRECT=False)
+class APITestBase(APITestCase):
+    def setUp(self):
+        cache.clear()
+        throttling.reset()
+        reset_stats()
+        self.user = CustomUser.objects.create_user(username='student', password='pass12345', phone_number='+998900000001')
+        self.client.force_authenticate(self.user)
+
+    def make_centers(self, count, **kwargs):
+        return Educenters.objects.bulk_create(
+            Educenters(name=f'Center {i}', slug=f'center-{i}', **kwargs) for i in range(count)
+        )
+
+
+class PaginationTests(APITestBase):
+    def test_centers_list_is_cursor_paginated(self):
+        self.make_centers(25)
+
+        response = self.client.get(reverse('educenters-list'))
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.data['results']), 20)
+        self.assertIsNone(response.data['previous'])
+        self.assertIn('cursor=', response.data['next'])
+
+    def test_following_next_walks_every_center_once(self):
+        centers = self.make_centers(25)
+
+        seen = []
+        url = reverse('educenters-list') + '?page_size=10'
+        while url:
+            response = self.client.get(url)
+            seen += [row['id'] for row in response.data['results']]
+            url = response.data['next']
+
+        self.assertEqual(seen, sorted((c.id for c in centers), reverse=True))
+
+    def test_page_size_is_capped(self):
+        Courses.objects.bulk_create(Courses(title=f'Course {i}', slug=f'course-{i}') for i in range(120))
+
+        response = self.client.get(reverse('courses-list') + '?page_size=1000')
+
+        self.assertEqual(len(response.data['results']), 100)
+
+    def test_applications_are_newest_first(self):
+        center = self.make_centers(1)[0]
+        course = Courses.objects.create(title='Math')
+        first = Application.objects.create(owner=self.user, center=center, course=course)
+        second = Application.objects.create(owner=self.user, center=center, course=course)
+
+        response = self.client.get(reverse('applications-list'))
+
+        self.assertEqual([row['index'] for row in response.data['results']], [second.index, first.index])
+
+
+class QueryBudgetTests(QueryBudgetMixin, APITestBase):
+    def setUp(self):
+        super().setUp()
+        self.center = Educenters.objects.create(name='Main center')
+        self.course = Courses.objects.create(title='Math')
+        self.center.courses.add(self.course)
+
+    def add_centers(self, count):
+        for _ in range(count):
+            Educenters.objects.create(name=f'Center {Educenters.objects.count()}')
+
+    def add_courses(self, count):
+        for _ in range(count):
+            course = Courses.objects.create(title=f'Course {Courses.objects.count()}')
+            self.center.courses.add(course)
+
+    def add_applications(self, count):
+        for _ in range(count):
+            center = Educenters.objects.create(name=f'Center {Educenters.objects.count()}')
+            course = Courses.objects.create(title=f'Course {Courses.objects.count()}')
+            center.courses.add(course, self.course)
+            Application.objects.create(owner=self.user, center=center, course=course)
+
+    def test_centers_list(self):
+        self.assertQueryBudget(reverse('educenters-list'), self.add_centers, budget=1)
+
+    def test_center_retrieve(self):
+        self.assertQueryBudget(
+            reverse('educenters-detail', kwargs={'slug': self.center.slug}), self.add_courses, budget=2
+        )
+
+    def test_courses_list(self):
+        self.assertQueryBudget(reverse('courses-list'), self.add_courses, budget=1)
+
+    def test_applications_list(self):
+        self.assertQueryBudget(reverse('applications-list'), self.add_applications, budget=2)
+
+    def test_application_retrieve(self):
+        application = Application.objects.create(owner=self.user, center=self.center, course=self.course)
+
+        self.assertQueryBudget(
+            reverse('applications-detail', kwargs={'index': application.index}), self.add_courses, budget=2
+        )
+
+
+class SequenceTests(TestCase):
+    def test_reserve_hands_out_consecutive_ranges(self):
+        self.assertEqual(list(reserve('test', 3)), [1, 2, 3])
+        self.assertEqual(list(reserve('test', 2)), [4, 5])
+
+    def test_missing_counter_is_seeded_from_start(self):
+        self.assertEqual(list(reserve('seeded', start=lambda: 41)), [42])
+
+    def test_block_allocator_reserves_once_per_block(self):
+        Sequence.objects.create(name='blocks')
+        allocator = BlockAllocator('blocks', block_size=5)
+
+        # UPDATE + SELECT inside a savepoint, the rest of the block is kept on commit
+        with self.assertNumQueries(4), self.captureOnCommitCallbacks(execute=True):
+            values = [allocator.next()]
+        with self.assertNumQueries(0):
+            values += [allocator.next() for _ in range(4)]
+        with self.captureOnCommitCallbacks(execute=True):
+            values += allocator.take(3)
+
+        self.assertEqual(values, list(range(1, 9)))
+        self.assertEqual(Sequence.objects.get(name='blocks').value, 10)
+
+    def test_block_reserved_in_a_rolled_back_transaction_is_not_handed_out_again(self):
+        Sequence.objects.create(name='blocks')
+        allocator = BlockAllocator('blocks', block_size=5)
+
+        with self.assertRaises(IntegrityError), transaction.atomic():
+            rolled_back = allocator.next()
+            raise IntegrityError
+        with self.captureOnCommitCallbacks(execute=True):
+            values = allocator.take(8)
+
+        self.assertEqual(rolled_back, 1)
+        self.assertEqual(values, list(range(1, 9)))
+        self.assertEqual(Sequence.objects.get(name='blocks').value, 8)
+
+    def test_application_index_is_allocated_once(self):
+        user = CustomUser.objects.create_user(username='student', password='pass12345', phone_number='+998900000001')
+        center = Educenters.objects.create(name='Center')
+        course = Courses.objects.create(title='Math')
+
+        first = Application.objects.create(owner=user, center=center, course=course)
+        second = Application.objects.create(owner=user, center=center, course=course)
+        second.content = 'updated'
+        second.save()
+
+        self.assertEqual(second.index, first.index + 1)
+        second.refresh_from_db()
+        self.assertEqual(second.index, first.index + 1)
+
+
+class SearchTests(APITestBase):
+    def setUp(self):
+        super().setUp()
+        self.python = Courses.objects.create(title='Python backend')
+        self.ielts = Courses.objects.create(title='IELTS preparation')
+
+        self.coders = Educenters.objects.create(name='Coders hub', info='Programming school', cost=500)
+        self.coders.courses.add(self.python)
+        self.english = Educenters.objects.create(name='English house', info='Language center', cost=300)
+        self.english.courses.add(self.ielts)
+        self.mixed = Educenters.objects.create(name='Everything center', info='Python and English', cost=900)
+        self.mixed.courses.add(self.python, self.ielts)
+
+    def search(self, **params):
+        response = self.client.get(reverse('educenters-search'), params)
+        self.assertEqual(response.status_code, 200, response.content)
+        return [row['slug'] for row in response.data['results']]
+
+    def test_name_matches_rank_first(self):
+        self.assertEqual(self.search(q='english'), [self.english.slug, self.mixed.slug])
+
+    def test_prefix_match_on_course_titles(self):
+        self.assertEqual(set(self.search(q='ielt')), {self.english.slug, self.mixed.slug})
+
+    def test_filters(self):
+        self.assertEqual(self.search(q='python', cost_max=600), [self.coders.slug])
+        self.assertEqual(self.search(q='center', course=self.python.slug), [self.mixed.slug])
+
+    def test_index_follows_course_changes(self):
+        self.coders.courses.add(self.ielts)
+        self.assertIn(self.coders.slug, self.search(q='ielts'))
+
+        self.ielts.educenters.clear()
+        self.assertEqual(self.search(q='ielts'), [])
+
+        self.python.title = 'Go backend'
+        self.python.save()
+        self.assertEqual(self.search(q='python'), [self.mixed.slug])
+
+    def test_renaming_a_popular_course_reindexes_in_batches(self):
+        for i in range(5):
+            Educenters.objects.create(name=f'School {i}').courses.add(self.python)
+
+        with mock.patch.object(search, 'INDEX_BATCH_SIZE', 2), CaptureQueriesContext(connection) as queries:
+            self.python.title = 'Go backend'
+            self.python.save()
+
+        deletes = [query['sql'] for query in queries if query['sql'].startswith('DELETE')]
+        self.assertEqual(len(deletes), 4)
+        self.assertTrue(all(query.count(',') <= 1 for query in deletes))
+        self.assertEqual(len(self.search(q='go')), 7)
+
+    def test_deleted_centers_leave_the_index(self):
+        self.coders.delete()
+
+        self.assertEqual(self.search(q='python'), [self.mixed.slug])
+
+    def test_pages(self):
+        for i in range(3):
+            Educenters.objects.create(name=f'Python school {i}')
+
+        response = self.client.get(reverse('educenters-search'), {'q': 'python', 'page_size': 2, 'page': 2})
+
+        self.assertEqual(len(response.data['results']), 2)
+        self.assertIn('page=3', response.data['next'])
+        self.assertNotIn('page=', response.data['previous'])
+
+    def test_query_is_required(self):
+        response = self.client.get(reverse('educenters-search'))
+
+        self.assertEqual(response.status_code, 400)
+
+    def test_fallback_without_fts(self):
+        search = CenterSearch('python', cost_min=600)
+
+        self.assertEqual(list(search._fallback()), [self.mixed])
+
+
+class ResponseCacheTests(APITestBase):
+    def setUp(self):
+        super().setUp()
+        self.center = Educenters.objects.create(name='Coders hub')
+        self.url = reverse('educenters-detail', kwargs={'slug': self.center.slug})
+
+    def test_second_read_is_served_from_cache(self):
+        first = self.client.get(self.url)
+        with self.assertNumQueries(0):
+            second = self.client.get(self.url)
+
+        self.assertEqual(first['X-Cache'], 'MISS')
+        self.assertEqual(second['X-Cache'], 'HIT')
+        self.assertEqual(first.content, second.content)
+        self.assertEqual(first['ETag'], second['ETag'])
+        self.assertEqual(get_stats(), {'pid': os.getpid(), 'hits': 1, 'misses': 1, 'hit_ratio': 0.5})
+
+    def test_hits_are_counted_without_writing_to_the_cache(self):
+        self.client.get(self.url)
+        with mock.patch.object(response_cache(), 'set_many', side_effect=AssertionError), \
+                mock.patch.object(response_cache(), 'incr', side_effect=AssertionError):
+            self.assertEqual(self.client.get(self.url)['X-Cache'], 'HIT')
+        self.assertEqual(get_stats()['hits'], 1)
+
+    def test_matching_etag_gets_304(self):
+        etag = self.client.get(self.url)['ETag']
+
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response['ETag'], etag)
+        self.assertEqual(response.content, b'')
+
+    def test_writes_invalidate(self):
+        self.client.get(self.url, {'expand': 'courses'})
+        course = Courses.objects.create(title='Python')
+        self.center.courses.add(course)
+
+        response = self.client.get(self.url, {'expand': 'courses'})
+        self.assertEqual(response['X-Cache'], 'MISS')
+        self.assertEqual(response.data['courses'][0]['title'], 'Python')
+
+        course.title = 'Go'
+        course.save()
+        self.assertEqual(self.client.get(self.url, {'expand': 'courses'}).json()['courses'][0]['title'], 'Go')
+
+    def test_entries_expire(self):
+        self.client.get(self.url)
+
+        # the only way a worker with its own cache catches up with writes handled by the others
+        expired = time.time() + settings.RESPONSE_CACHE_TIMEOUT + 1
+        with mock.patch('django.core.cache.backends.locmem.time.time', return_value=expired):
+            self.assertEqual(self.client.get(self.url)['X-Cache'], 'MISS')
+
+    def test_course_list_ignores_center_writes(self):
+        self.client.get(reverse('courses-list'))
+        Educenters.objects.create(name='English house')
+
+        self.assertEqual(self.client.get(reverse('courses-list'))['X-Cache'], 'HIT')
+
+    def test_browsable_api_is_not_cached(self):
+        response = self.client.get(self.url, HTTP_ACCEPT='text/html')
+
+        self.assertNotIn('X-Cache', response)
+
+
+class FastListSerializerTests(TestCase):
+    def setUp(self):
+        owner = CustomUser.objects.create_user(username='owner', password='pass12345', phone_number='+998900000002')
+        Educenters.objects.create(name='Coders hub', info='Programming', cost=500, owner=owner,
+                                  picture='educenter_images/coders hub.png', phone_number='+998901112233')
+        Educenters.objects.create(name='Ёлка центр', slug='ёлка-центр')
+        Educenters.objects.create(name='Empty')
+
+    def render_both(self, request=None):
+        context = {'request': request}
+        queryset = Educenters.objects.order_by('id')
+
+        slow = serializers.ListSerializer(child=CentersListSerializer(), instance=queryset, context=context)
+        fast = CentersListSerializer(queryset.values(*CentersFastListSerializer.VALUES), many=True, context=context)
+        from_instances = CentersListSerializer(queryset, many=True, context=context)
+        return [JSONRenderer().render(serializer.data) for serializer in (slow, fast, from_instances)]
+
+    def test_output_is_identical_with_request(self):
+        request = Request(APIRequestFactory().get('/api/educenters/'))
+
+        slow, fast, from_instances = self.render_both(request)
+
+        self.assertEqual(fast, slow)
+        self.assertEqual(from_instances, slow)
+        self.assertIn(b'http://testserver/media/educenter_images/coders%20hub.png', fast)
+
+    def test_output_is_identical_without_request(self):
+        slow, fast, from_instances = self.render_both()
+
+        self.assertEqual(fast, slow)
+        self.assertEqual(from_instances, slow)
+
+
+class TemporaryMediaMixin:
+    def setUp(self):
+        super().setUp()
+        media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, media_root)
+        settings_override = override_settings(MEDIA_ROOT=media_root)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+
+    def make_picture(self, name='photo.png', size=(1600, 1200)):
+        from PIL import Image
+
+        buffer = io.BytesIO()
+        Image.new('RGBA', size, (200, 30, 30, 255)).save(buffer, 'PNG')
+        return SimpleUploadedFile(name, buffer.getvalue(), content_type='image/png')
+
+
+class PictureVariantTests(TemporaryMediaMixin, APITestBase):
+    def test_generate_variants(self):
+        from PIL import Image
+
+        center = Educenters.objects.create(name='Coders hub', picture=self.make_picture())
+
+        variants = generate_variants(center.pk)
+
+        storage = center.picture.storage
+        with storage.open(variants['thumbnail']) as thumbnail:
+            self.assertEqual(Image.open(thumbnail).size, (320, 240))
+        with storage.open(variants['medium_webp']) as medium:
+            self.assertEqual(Image.open(medium).format, 'WEBP')
+
+        center.refresh_from_db()
+        center.picture = self.make_picture('other.png')
+        center.save()
+        generate_variants(center.pk)
+        self.assertFalse(storage.exists(variants['thumbnail']))
+
+    def test_variants_under_alternative_names_are_not_rendered_again(self):
+        center = Educenters.objects.create(name='Coders hub', picture=self.make_picture())
+        # what storage.save() returns when the expected names are taken
+        variants = {
+            variant: '_AbC1234'.join(os.path.splitext(name))
+            for variant, name in expected_variants(center.picture.name).items()
+        }
+        Educenters.objects.filter(pk=center.pk).update(picture_variants=variants)
+        center.refresh_from_db()
+
+        with mock.patch('learning_centers.signals.schedule_variants') as schedule:
+            center.save()
+            schedule.assert_not_called()
+
+            center.picture = self.make_picture('other.png')
+            center.save()
+            schedule.assert_called_once_with(center.pk)
+
+    def test_list_exposes_variant_urls(self):
+        center = Educenters.objects.create(name='Coders hub', picture=self.make_picture())
+        generate_variants(center.pk)
+
+        row = self.client.get(reverse('educenters-list')).data['results'][0]
+
+        self.assertEqual(
+            row['picture_variants']['thumbnail_webp'],
+            'http://testserver/media/educenter_images/variants/photo_thumbnail_webp.webp'
+        )
+
+
+class PictureVariantWorkerTests(TemporaryMediaMixin, TransactionTestCase):
+    def tearDown(self):
+        # renders still running would write into MEDIA_ROOT after the override is gone
+        images.get_executor().shutdown(wait=True)
+        images._executor = None
+        super().tearDown()
+
+    def test_variants_are_rendered_in_the_worker_pool(self):
+        center = Educenters.objects.create(name='Coders hub', picture=self.make_picture())
+
+        for _ in range(100):
+            center.refresh_from_db()
+            if center.picture_variants:
+                break
+            time.sleep(0.05)
+
+        self.assertEqual(set(center.picture_variants), {'thumbnail', 'thumbnail_webp', 'medium_webp'})
+
+    def test_backfill_command(self):
+        center = Educenters.objects.create(name='Coders hub', picture=self.make_picture())
+        Educenters.objects.filter(pk=center.pk).update(picture_variants={})
+
+        call_command('backfill_picture_variants', workers=2, stdout=io.StringIO())
+
+        center.refresh_from_db()
+        self.assertEqual(len(center.picture_variants), 3)
+
+
+class BulkApplicationTests(APITestBase):
+    def setUp(self):
+        super().setUp()
+        self.centers = self.make_centers(2)
+        self.courses = Courses.objects.bulk_create(Courses(title=f'Course {i}', slug=f'course-{i}') for i in range(2))
+        Sequence.objects.filter(name='application_index').update(value=100)
+
+    def post(self, items):
+        return self.client.post(reverse('applications-bulk'), {'applications': items}, format='json')
+
+    def test_applications_are_created_in_one_insert(self):
+        items = [
+            {'center_id': center.id, 'course_id': course.id, 'content': 'hi'}
+            for center in self.centers for course in self.courses
+        ]
+
+        # centers + courses, UPDATE + SELECT of the sequence, one INSERT, one
+        # upsert of the daily stats and one UPDATE of the course counters,
+        # each write in its own savepoint
+        with self.assertNumQueries(11):
+            response = self.post(items)
+
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.data['created'], 4)
+        self.assertEqual([result['index'] for result in response.data['results']], [101, 102, 103, 104])
+        self.assertEqual(self.user.applies.count(), 4)
+
+    def test_partial_failures_are_reported_per_item(self):
+        response = self.post([
+            {'center_id': self.centers[0].id, 'course_id': self.courses[0].id},
+            {'center_id': 999, 'course_id': self.courses[0].id},
+            {'center_id': 999, 'course_id': 998},
+        ])
+
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual((response.data['created'], response.data['failed']), (1, 2))
+        self.assertEqual(response.data['results'][0]['status'], 'created')
+        self.assertEqual(list(response.data['results'][1]['errors']), ['center_id'])
+        self.assertEqual(list(response.data['results'][2]['errors']), ['center_id', 'course_id'])
+
+    def test_nothing_created_is_a_bad_request(self):
+        response = self.post([{'center_id': 999, 'course_id': self.courses[0].id}])
+
+        self.assertEqual(response.status_code, 400)
+        self.assertFalse(Application.objects.exists())
+
+    def test_item_limit(self):
+        item = {'center_id': self.centers[0].id, 'course_id': self.courses[0].id}
+        self.assertEqual(self.post([item] * (settings.APPLICATION_BULK_MAX_ITEMS + 1)).status_code, 400)
+        throttling.reset()  # that bulk took the whole bucket
+        self.assertEqual(self.post([]).status_code, 400)
+
+
+@override_settings(REST_FRAMEWORK={
+    **settings.REST_FRAMEWORK, 'DEFAULT_THROTTLE_RATES': {'applications_user': '2/min', 'applications_ip': '3/min'},
+})
+class ThrottlingTests(APITestBase):
+    def post(self, **extra):
+        # an empty bulk is a cheap 400, the tokens are taken before validation
+        return self.client.post(reverse('applications-bulk'), {'applications': []}, format='json', **extra)
+
+    def test_user_bucket_rejects_with_retry_after(self):
+        self.assertEqual([self.post().status_code for _ in range(3)], [400, 400, 429])
+
+        response = self.post()
+        self.assertEqual(response.status_code, 429)
+        self.assertIn(int(response['Retry-After']), range(1, 31))  # one of 2 tokens per minute
+        self.assertEqual(self.client.get(reverse('applications-list')).status_code, 200)
+
+    def test_ip_bucket_is_shared_by_users(self):
+        self.post(), self.post()
+        self.client.force_authenticate(
+            CustomUser.objects.create_user(username='other', password='pass12345', phone_number='+998900000002')
+        )
+
+        self.assertEqual(self.post().status_code, 400)
+        self.assertEqual(self.post().status_code, 429)
+
+    def test_bulk_costs_a_token_per_application(self):
+        response = self.client.post(reverse('applications-bulk'), {'applications': [{}] * 3}, format='json')
+        self.assertEqual(response.status_code, 400)
+
+        response = self.post()
+        self.assertEqual(response.status_code, 429)
+        self.assertIn(int(response['Retry-After']), range(31, 61))  # the bucket went a token below zero
+
+    @override_settings(THROTTLE_CACHE_ALIAS='default')
+    def test_cache_buckets(self):
+        self.assertEqual([self.post().status_code for _ in range(3)], [400, 400, 429])
+
+        throttling.reset()  # the buckets are in the cache, not in memory
+        self.assertEqual(self.post().status_code, 429)
+        cache.clear()
+        self.assertEqual(self.post().status_code, 400)
+
+    def test_bucket_refills(self):
+        buckets = throttling.LocalBuckets()
+        take = lambda now: buckets.take('key', 2, 1 / 30, now)[0]
+
+        self.assertEqual([take(0), take(0), take(0), take(29), take(30), take(30)], [True, True, False, False, True, False])
+        self.assertEqual([take(150), take(150), take(150)], [True, True, False])  # never above the capacity
+
+    def test_costly_requests_need_a_full_enough_bucket(self):
+        buckets = throttling.LocalBuckets()
+        take = lambda now, cost=1: buckets.take('key', 2, 1 / 30, now, cost)[0]
+
+        self.assertEqual([take(0), take(0, cost=5), take(30, cost=5)], [True, False, True])
+        self.assertEqual([take(30), take(149), take(150), take(150)], [False, False, True, False])  # paid back 3 below zero
+
+    def test_least_recently_used_buckets_are_dropped(self):
+        buckets = throttling.LocalBuckets(max_keys=2)
+        for key in ('a', 'b', 'a', 'c'):
+            buckets.take(key, 1, 1, 0)
+
+        self.assertEqual(list(buckets.buckets), ['a', 'c'])
+
+
+class CourseCounterTests(APITestBase):
+    def setUp(self):
+        super().setUp()
+        self.centers = self.make_centers(3)
+        self.math, self.physics = Courses.objects.bulk_create([
+            Courses(title='Math', slug='math'), Courses(title='Physics', slug='physics'),
+        ])
+
+    def counts(self):
+        return {
+            course.slug: (course.centers_count, course.applications_count)
+            for course in Courses.objects.order_by('id')
+        }
+
+    def test_centers_follow_course_links(self):
+        first, second, third = self.centers
+        first.courses.add(self.math, self.physics)
+        self.math.educenters.add(second, third)
+        first.courses.add(self.math)  # already linked
+        self.assertEqual(self.counts(), {'math': (3, 0), 'physics': (1, 0)})
+
+        second.courses.remove(self.math, self.physics)  # physics was never linked
+        self.physics.educenters.remove(third)
+        self.assertEqual(self.counts(), {'math': (2, 0), 'physics': (1, 0)})
+
+        self.math.educenters.clear()
+        first.courses.clear()
+        self.assertEqual(self.counts(), {'math': (0, 0), 'physics': (0, 0)})
+
+        third.courses.set([self.physics])
+        third.delete()
+        self.assertEqual(self.counts(), {'math': (0, 0), 'physics': (0, 0)})
+
+    def test_applications_follow_saves_and_deletes(self):
+        application = Application.objects.create(owner=self.user, center=self.centers[0], course=self.math)
+        self.client.post(reverse('applications-bulk'), {'applications': [
+            {'center_id': self.centers[1].id, 'course_id': self.math.id},
+            {'center_id': self.centers[1].id, 'course_id': self.physics.id},
+        ]}, format='json')
+        self.assertEqual(self.counts(), {'math': (0, 2), 'physics': (0, 1)})
+
+        application.course = self.physics
+        application.save()
+        self.assertEqual(self.counts(), {'math': (0, 1), 'physics': (0, 2)})
+
+        self.centers[1].delete()
+        self.assertEqual(self.counts(), {'math': (0, 0), 'physics': (0, 1)})
+
+    def test_list_sorts_by_popularity(self):
+        courses = Courses.objects.bulk_create(Courses(title=f'Course {i}', slug=f'course-{i}') for i in range(4))
+        for course, applications in zip(courses, [1, 3, 0, 3]):
+            for _ in range(applications):
+                Application.objects.create(owner=self.user, center=self.centers[0], course=course)
+
+        response = self.client.get(reverse('courses-list'), {'sort': 'popular', 'page_size': 2})
+        self.assertEqual(response.data['results'][0]['applications_count'], 3)
+        slugs = [course['slug'] for course in response.data['results']]
+        while response.data['next']:
+            response = self.client.get(response.data['next'])
+            slugs += [course['slug'] for course in response.data['results']]
+
+        self.assertEqual(slugs, ['course-3', 'course-1', 'course-0', 'course-2', 'physics', 'math'])
+
+    def test_sorted_pages_walk_ties_past_the_offset_cutoff(self):
+        Courses.objects.bulk_create(Courses(title=f'Course {i}', slug=f'course-{i}') for i in range(1100))
+        expected = list(Courses.objects.order_by('-centers_count', '-id').values_list('slug', flat=True))
+
+        response = self.client.get(reverse('courses-list'), {'sort': 'centers', 'page_size': 100})
+        slugs = [course['slug'] for course in response.data['results']]
+        while response.data['next']:
+            cursor = parse_qs(urlparse(response.data['next']).query)['cursor'][0]
+            self.assertNotIn('o', parse_qs(b64decode(cursor).decode()))  # (count, id), never an offset
+            response = self.client.get(response.data['next'])
+            slugs += [course['slug'] for course in response.data['results']]
+
+        self.assertEqual(slugs, expected)
+
+        previous = self.client.get(response.data['previous'])
+        self.assertEqual([course['slug'] for course in previous.data['results']], expected[-102:-2])
+
+    def test_new_application_refreshes_cached_course_list(self):
+        self.client.get(reverse('courses-list'))
+        center_url = reverse('educenters-detail', kwargs={'slug': 'center-0'})
+        self.client.get(center_url)
+
+        Application.objects.create(owner=self.user, center=self.centers[0], course=self.math)
+
+        response = self.client.get(reverse('courses-list'))
+        self.assertEqual(response['X-Cache'], 'MISS')
+        self.assertEqual(response.data['results'][0]['applications_count'], 1)
+        self.assertEqual(self.client.get(center_url)['X-Cache'], 'HIT')
+
+    def test_reconcile_repairs_drift(self):
+        self.centers[0].courses.add(self.math)
+        Application.objects.create(owner=self.user, center=self.centers[0], course=self.physics)
+        Courses.objects.update(centers_count=7, applications_count=0)
+        out = io.StringIO()
+
+        call_command('reconcile_course_counters', stdout=out)
+
+        self.assertEqual(self.counts(), {'math': (1, 0), 'physics': (0, 1)})
+        self.assertIn(f'course {self.math.id}: centers_count 7 -> 1', out.getvalue())
+        self.assertIn('Repaired 2 courses.', out.getvalue())
+
+
+class FieldsetTests(APITestBase):
+    def setUp(self):
+        super().setUp()
+        self.center = self.make_centers(1)[0]
+        self.math, self.physics = Courses.objects.bulk_create([
+            Courses(title='Math', slug='math'), Courses(title='Physics', slug='physics'),
+        ])
+        self.center.courses.set([self.math, self.physics])
+        for _ in range(3):
+            Application.objects.create(owner=self.user, center=self.center, course=self.math)
+
+    def applications(self, params=None):
+        return self.client.get(reverse('applications-list'), params).json()['results']
+
+    def test_relations_are_ids_unless_expanded(self):
+        # the page and nothing else, the relations come from their _id columns
+        with self.assertNumQueries(1):
+            row = self.applications()[0]
+
+        self.assertEqual((row['owner'], row['center'], row['course']), (self.user.id, self.center.id, self.math.id))
+
+    def test_expanded_and_sparse(self):
+        with self.assertNumQueries(1):
+            rows = self.applications({'expand': 'center,course', 'fields': 'index,center.name,course.title'})
+
+        self.assertEqual(rows[0], {'index': rows[0]['index'], 'center': {'name': 'Center 0'}, 'course': {'title': 'Math'}})
+
+    def test_nested_expansion_prefetches(self):
+        with self.assertNumQueries(2):
+            rows = self.applications({'expand': 'owner,center.courses', 'fields': 'owner.username,center.courses.slug'})
+
+        self.assertEqual(rows[0], {'owner': {'username': 'student'}, 'center': {'courses': [{'slug': 'math'}, {'slug': 'physics'}]}})
+
+    def test_left_out_fields_are_still_written(self):
+        response = self.client.post(
+            reverse('applications-list') + '?fields=index', {'center_id': self.center.id, 'course_id': self.physics.id}, format='json',
+        )
+
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(list(response.data), ['index'])
+        self.assertEqual(Application.objects.filter(course=self.physics).count(), 1)
+
+    def test_center_courses(self):
+        url = reverse('educenters-detail', kwargs={'slug': self.center.slug})
+
+        self.assertEqual(self.client.get(url).data['courses'], [self.math.id, self.physics.id])
+        self.assertEqual(self.client.get(url, {'expand': 'courses', 'fields': 'courses.title'}).data, {'courses': [{'title': 'Math'}, {'title': 'Physics'}]})
+        with self.assertNumQueries(1):
+            self.assertEqual(self.client.get(url, {'fields': 'name'}).data, {'name': 'Center 0'})
+
+    def test_fast_list_path(self):
+        rows = self.client.get(reverse('educenters-list'), {'fields': 'slug,detail_url'}).json()['results']
+
+        self.assertEqual(rows, [{'slug': 'center-0', 'detail_url': 'http://testserver/api/educenters/center-0/'}])
+        self.assertEqual(
+            CentersListSerializer(Educenters.objects.all(), many=True).data,
+            CentersListSerializer(Educenters.objects.values(*CentersFastListSerializer.VALUES), many=True).data,
+        )
+
+
+class CompressionTests(APITestBase):
+    def setUp(self):
+        super().setUp()
+        self.make_centers(30, info='An education center ' * 5)
+        self.url = reverse('educenters-list')
+
+    def test_negotiation(self):
+        self.assertEqual(compression.negotiate('gzip, deflate, br'), compression.ENCODINGS[0])
+        self.assertEqual(compression.negotiate('br;q=1.0, gzip;q=0.5'), compression.ENCODINGS[0])
+        self.assertEqual(compression.negotiate('*'), compression.ENCODINGS[0])
+        self.assertEqual(compression.negotiate('gzip;q=0, identity'), None)
+        self.assertEqual(compression.negotiate(''), None)
+
+    def test_list_is_compressed_and_cached_compressed(self):
+        plain = self.client.get(self.url)
+        zipped = self.client.get(self.url, HTTP_ACCEPT_ENCODING='gzip')
+
+        self.assertEqual(zipped['Content-Encoding'], 'gzip')
+        self.assertIn('Accept-Encoding', zipped['Vary'])
+        self.assertEqual(gzip.decompress(zipped.content), plain.content)
+        self.assertEqual(zipped['ETag'], f'W/{plain["ETag"]}')
+
+        # the hit sends the copy stored with the entry
+        with mock.patch('config.compression.compress', side_effect=AssertionError):
+            hit = self.client.get(self.url, HTTP_ACCEPT_ENCODING='gzip')
+        self.assertEqual(hit['X-Cache'], 'HIT')
+        self.assertEqual(hit.content, zipped.content)
+        self.assertEqual(self.client.get(self.url, HTTP_ACCEPT_ENCODING='gzip', HTTP_IF_NONE_MATCH=hit['ETag']).status_code, 304)
+
+    def test_only_the_accepted_encoding_is_compressed(self):
+        with mock.patch('config.compression.compress', wraps=compression.compress) as compress:
+            self.client.get(self.url, HTTP_ACCEPT_ENCODING='gzip')
+            self.client.get(self.url, HTTP_ACCEPT_ENCODING='gzip')
+        compress.assert_called_once_with(mock.ANY, 'gzip')
+
+    @skipUnless(compression.brotli, 'brotli is not installed')
+    def test_brotli_is_preferred(self):
+        plain = self.client.get(self.url)
+        compressed = self.client.get(self.url, HTTP_ACCEPT_ENCODING='gzip, deflate, br')
+
+        self.assertEqual(compressed['Content-Encoding'], 'br')
+        self.assertEqual(compression.brotli.decompress(compressed.content), plain.content)
+
+    def test_what_is_left_alone(self):
+        small = self.client.get(self.url, {'page_size': 1}, HTTP_ACCEPT_ENCODING='gzip')
+        self.assertNotIn('Content-Encoding', small)
+
+        login = self.client.post(reverse('token_obtain_pair'), {'username': 'student', 'password': 'pass12345'},
+                                 HTTP_ACCEPT_ENCODING='gzip')
+        self.assertEqual(login.status_code, 200)
+        self.assertNotIn('Content-Encoding', login)
+
+    def test_fast_renderer_matches_drf(self):
+        data = {
+            'when': timezone.make_aware(datetime(2026, 1, 2, 3, 4, 5, 678901)), 'cost': Decimal('1.50'),
+            'name': 'Ўзбекистон \u2028', 'ids': {1, 2}, 1: None, 'nested': [{'x': 1.5}],
+        }
+
+        self.assertEqual(FastJSONRenderer().render(data), JSONRenderer().render(data))
+        indented = FastJSONRenderer().render(data, 'application/json; indent=2')
+        self.assertEqual(indented, JSONRenderer().render(data, 'application/json; indent=2'))
+
+
+class CatalogImportTests(TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directory)
+
+    def import_catalog(self, name, content, **options):
+        path = f'{self.directory}/{name}'
+        with open(path, 'w', encoding='utf-8') as file:
+            file.write(content)
+        stderr = io.StringIO()
+        call_command('import_catalog', path, stdout=io.StringIO(), stderr=stderr, **options)
+        return stderr.getvalue()
+
+    def test_csv_creates_centers_courses_and_free_slugs(self):
+        Educenters.objects.create(name='Star', slug='star')
+        Courses.objects.create(title='Math', slug='math')
+
+        errors = self.import_catalog('catalog.csv', (
+            'name,info,cost,courses\n'
+            'Star,first,100,Math;English\n'
+            'Star,second,,English\n'
+            'Broken,,not a number,\n'
+        ))
+
+        self.assertIn('Row 3', errors)
+        self.assertEqual(
+            list(Educenters.objects.order_by('id').values_list('slug', 'info', 'cost')),
+            [('star', None, None), ('star-2', 'first', 100), ('star-3', 'second', None)],
+        )
+        self.assertEqual(Courses.objects.get(title='English').slug, 'english')
+        self.assertEqual(
+            sorted(Educenters.objects.get(slug='star-2').courses.values_list('title', flat=True)), ['English', 'Math']
+        )
+        self.assertEqual(sorted(center.slug for center in CenterSearch('english')[:10]), ['star-2', 'star-3'])
+
+    def test_ndjson_upserts_by_slug(self):
+        self.import_catalog('catalog.ndjson', '{"name": "Star", "slug": "star", "courses": ["Math"]}\n')
+
+        self.import_catalog('catalog.ndjson', (
+            '{"name": "Star Academy", "slug": "star", "courses": ["Physics"]}\n'
+            '{"name": "Star", "cost": 300}\n'
+        ), chunk_size=1)
+
+        center = Educenters.objects.get(slug='star')
+        self.assertEqual(center.name, 'Star Academy')
+        self.assertEqual(list(center.courses.values_list('title', flat=True)), ['Physics'])
+        self.assertEqual(dict(Courses.objects.values_list('title', 'centers_count')), {'Math': 0, 'Physics': 1})
+        self.assertEqual(Educenters.objects.get(slug='star-2').cost, 300)
+
+    def test_queries_per_chunk_do_not_grow_with_rows(self):
+        def count_queries(rows, prefix):
+            lines = ''.join(f'{{"name": "{prefix} {i}", "courses": ["{prefix} {i % 3}"]}}\n' for i in range(rows))
+            with CaptureQueriesContext(connection) as ctx:
+                self.import_catalog('catalog.ndjson', lines, chunk_size=rows)
+            return len(ctx.captured_queries)
+
+        # 60 centers still fit one INSERT under SQLite's 999 parameters
+        self.assertEqual(count_queries(5, 'Small'), count_queries(60, 'Large'))
+        self.assertEqual(Educenters.objects.count(), 65)
+
+
+class ApplicationsExportTests(APITestBase):
+    def setUp(self):
+        super().setUp()
+        self.owner = CustomUser.objects.create_user(username='owner', password='pass12345', phone_number='+998900000002')
+        mine, other = Educenters.objects.bulk_create([
+            Educenters(name='Mine', slug='mine', owner=self.owner), Educenters(name='Other', slug='other'),
+        ])
+        course = Courses.objects.create(title='Math, advanced', slug='math')
+        for center in (mine, mine, other):
+            Application.objects.create(owner=self.user, center=center, course=course, content='Call me "after" 6')
+        self.client.force_authenticate(self.owner)
+
+    def export(self, **params):
+        response = self.client.get(reverse('applications-export'), params)
+        self.assertTrue(response.streaming)
+        return response, b''.join(response.streaming_content).decode()
+
+    def test_csv_has_only_the_owners_applications(self):
+        response, content = self.export()
+
+        self.assertEqual(response['Content-Type'], 'text/csv')
+        self.assertIn('attachment;', response['Content-Disposition'])
+        rows = list(csv.DictReader(io.StringIO(content)))
+        self.assertEqual([row['center'] for row in rows], ['Mine', 'Mine'])
+        self.assertEqual(rows[0]['course'], 'Math, advanced')
+        self.assertEqual(rows[0]['content'], 'Call me "after" 6')
+        self.assertEqual(rows[0]['username'], 'student')
+
+    def test_ndjson(self):
+        response, content = self.export(format='ndjson', center='other')
+
+        self.assertEqual(response['Content-Type'], 'application/x-ndjson')
+        self.assertEqual(content, '')
+
+        response, content = self.export(format='ndjson', center='mine')
+        rows = [json.loads(line) for line in content.splitlines()]
+        self.assertEqual(len(rows), 2)
+        self.assertEqual(rows[0]['phone_number'], '+998900000001')
+
+    def test_rows_are_fetched_in_chunks(self):
+        with self.assertNumQueries(2):  # center ids, then the rows
+            self.export()
+
+    async def test_asgi_gets_an_async_stream(self):
+        token = await sync_to_async(AccessToken.for_user)(self.owner)
+        response = await self.async_client.get(
+            reverse('applications-export'), {'format': 'ndjson'}, headers={'Authorization': f'Bearer {token}'},
+        )
+
+        self.assertTrue(response.is_async)
+        lines = b''.join([chunk async for chunk in response.streaming_content]).decode().splitlines()
+        self.assertEqual([json.loads(line)['center'] for line in lines], ['Mine', 'Mine'])
+
+
+class ApplicationStatsTests(APITestBase):
+    def setUp(self):
+        super().setUp()
+        self.owner = CustomUser.objects.create_user(username='owner', password='pass12345', phone_number='+998900000002')
+        self.center = Educenters.objects.create(name='Mine', slug='mine', owner=self.owner)
+        self.math, self.physics = Courses.objects.bulk_create([
+            Courses(title='Math', slug='math'), Courses(title='Physics', slug='physics'),
+        ])
+
+    def apply(self, course, count=1):
+        return [Application.objects.create(owner=self.user, center=self.center, course=course) for _ in range(count)]
+
+    def rollup(self):
+        return {
+            course: count for course, count in
+            ApplicationDailyStats.objects.filter(count__gt=0).values_list('course__title', 'count')
+        }
+
+    def test_rollup_follows_writes(self):
+        math = self.apply(self.math, 3)
+        self.client.post(reverse('applications-bulk'), {'applications': [
+            {'center_id': self.center.id, 'course_id': self.physics.id},
+        ]}, format='json')
+        self.assertEqual(self.rollup(), {'Math': 3, 'Physics': 1})
+
+        math[0].delete()
+        math[1].course = self.physics
+        math[1].save()
+        self.assertEqual(self.rollup(), {'Math': 1, 'Physics': 2})
+
+        ApplicationDailyStats.objects.update(count=50)
+        call_command('rebuild_application_stats', stdout=io.StringIO())
+        self.assertEqual(self.rollup(), {'Math': 1, 'Physics': 2})
+
+    def test_stats_are_read_from_the_rollup(self):
+        today = timezone.localdate()
+        ApplicationDailyStats.objects.bulk_create([
+            ApplicationDailyStats(center=self.center, course=self.math, day=today, count=1000),
+            ApplicationDailyStats(center=self.center, course=self.physics, day=today - timedelta(days=1), count=500),
+            ApplicationDailyStats(center=self.center, course=self.math, day=today - timedelta(days=10), count=1000),
+            ApplicationDailyStats(center=self.center, course=self.math, day=today - timedelta(days=100), count=7),
+        ])
+        self.client.force_authenticate(self.owner)
+
+        with self.assertNumQueries(3):
+            response = self.client.get(reverse('educenters-stats', kwargs={'slug': 'mine'}), {'days': 7})
+
+        self.assertEqual(response.status_code, 200)
+        data = response.data
+        self.assertEqual((data['total'], data['period_total'], data['previous_period_total']), (2507, 1500, 1000))
+        self.assertEqual(data['trend'], 0.5)
+        self.assertEqual([course['course'] for course in data['courses']], ['Math', 'Physics'])
+        self.assertEqual(len(data['daily']), 7)
+        self.assertEqual(data['daily'][-1], {'day': today.isoformat(), 'count': 1000})
+
+    def test_only_the_owner_sees_stats(self):
+        response = self.client.get(reverse('educenters-stats', kwargs={'slug': 'mine'}))
+
+        self.assertEqual(response.status_code, 403)
+
+
+class AsyncReadViewTests(APITestBase):
+    def setUp(self):
+        super().setUp()
+        self.make_centers(25)
+        self.factory = APIRequestFactory()
+        self.token = f'Bearer {AccessToken.for_user(self.user)}'
+
+    def get(self, view, path, token=True, **kwargs):
+        request = self.factory.get(path, **({'HTTP_AUTHORIZATION': self.token} if token else {}))
+        return async_to_sync(view)(request, **kwargs)
+
+    def test_list_matches_the_drf_view(self):
+        url = reverse('educenters-list') + '?page_size=10'
+        expected = self.client.get(url).json()
+        cache.clear()
+
+        response = self.get(async_views.CentersListView.as_view(), url)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['X-Cache'], 'MISS')
+        self.assertEqual(json.loads(response.content), expected)
+        self.assertIn('cursor=', expected['next'])
+
+    def test_cache_is_shared_with_the_drf_view(self):
+        url = reverse('educenters-detail', kwargs={'slug': 'center-3'})
+        expected = self.client.get(url)
+
+        with self.assertNumQueries(1):  # the user, the response comes from the cache
+            response = self.get(async_views.CentersRetrieveView.as_view(), url, slug='center-3')
+
+        self.assertEqual(response['X-Cache'], 'HIT')
+        self.assertEqual(response.content, expected.content)
+
+    def test_unknown_slug_is_404(self):
+        url = reverse('courses-detail', kwargs={'slug': 'missing'})
+
+        response = self.get(async_views.CoursesRetrieveView.as_view(), url, slug='missing')
+
+        self.assertEqual(response.status_code, 404)
+
+    def test_anonymous_gets_401(self):
+        response = self.get(async_views.ApplicationsListView.as_view(), reverse('applications-list'), token=False)
+
+        self.assertEqual(response.status_code, 401)
+        self.assertIn('Bearer', response['WWW-Authenticate'])
+
+    def test_view_permissions_are_checked(self):
+        other = CustomUser.objects.create_user(username='other', password='pass12345', phone_number='+998900000002')
+        course = Courses.objects.create(title='Math')
+        center = Educenters.objects.first()
+        mine = Application.objects.create(owner=self.user, center=center, course=course)
+        Application.objects.create(owner=other, center=center, course=course)
+
+        response = self.get(async_views.ApplicationsListView.as_view(), reverse('applications-list'))
+        self.assertEqual([item['id'] for item in json.loads(response.content)['results']], [mine.id])
+
+        with mock.patch.object(async_views.ApplicationsListView, 'permission_classes', [permissions.IsAdminUser]):
+            response = self.get(async_views.ApplicationsListView.as_view(), reverse('applications-list'))
+        self.assertEqual(response.status_code, 403)
+
+    def test_permissions_that_query_run_in_a_thread(self):
+        class HasApplied(permissions.BasePermission):
+            def has_permission(self, request, view):
+                return Application.objects.filter(owner=request.user).exists()
+
+        with mock.patch.object(async_views.ApplicationsListView, 'permission_classes', [HasApplied]):
+            response = self.get(async_views.ApplicationsListView.as_view(), reverse('applications-list'))
+        self.assertEqual(response.status_code, 403)
+
+    def test_writes_go_to_the_drf_view(self):
+        view = read_async(ApplicationsView.as_view({'get': 'list', 'post': 'create'}),
+                          async_views.ApplicationsListView.as_view())
+        request = self.factory.post(reverse('applications-list'), {}, format='json', HTTP_AUTHORIZATION=self.token)
+
+        response = async_to_sync(view)(request)
+
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('center_id', response.data)
+
+
+class DatabaseProfileTests(SimpleTestCase):
+    databases = {'default'}  # only for the throw-away connections opened below, under that alias
+
+    def setUp(self):
+        self.router = ReplicaRouter()
+
+    def test_tuned_profile_applies_the_pragmas(self):
+        path = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, path)
+        primary, replica = (
+            ConnectionHandler({'default': settings_dict})['default']
+            for settings_dict in sqlite_databases(f'{path}/db.sqlite3', 'tuned').values()
+        )
+        self.addCleanup(primary.close)
+        self.addCleanup(replica.close)
+
+        with primary.cursor() as cursor:
+            self.assertEqual(cursor.execute('PRAGMA journal_mode').fetchone(), ('wal', ))
+            self.assertEqual(cursor.execute('PRAGMA busy_timeout').fetchone(), (5000, ))
+            cursor.execute('CREATE TABLE t (id integer)')
+
+        with replica.cursor() as cursor:
+            self.assertEqual(cursor.execute('SELECT count(*) FROM t').fetchone(), (0, ))
+            with self.assertRaises(OperationalError):
+                cursor.execute('INSERT INTO t VALUES (1)')
+
+    def test_reads_go_to_the_replica_unless_pinned(self):
+        self.assertEqual(self.router.db_for_read(Educenters), 'replica')
+        self.assertEqual(self.router.db_for_write(Educenters), 'default')
+        with use_primary():
+            self.assertEqual(self.router.db_for_read(Educenters), 'default')
+
+    def test_unsafe_requests_read_from_the_primary(self):
+        middleware = ReplicaMiddleware(lambda request: HttpResponse(self.router.db_for_read(Educenters)))
+        factory = RequestFactory()
+
+        self.assertEqual(middleware(factory.get('/')).content, b'replica')
+        self.assertEqual(middleware(factory.post('/')).content, b'default')
+
+
+class QueryPlanTests(QueryPlanMixin, APITestBase):
+    @classmethod
+    def setUpTestData(cls):
+        rng = random.Random(0)
+        cls.owner = CustomUser.objects.create_user(username='owner', password='pass12345', phone_number='+998900000002')
+        students = CustomUser.objects.bulk_create(
+            CustomUser(username=f'student-{i}', phone_number=f'+99891{i:07d}') for i in range(300)
+        )
+        courses = Courses.objects.bulk_create(Courses(title=f'Course {i}', slug=f'course-{i}') for i in range(100))
+        centers = Educenters.objects.bulk_create(
+            Educenters(name=f'Center {i}', slug=f'center-{i}', cost=rng.randint(100, 1000),
+                       owner=cls.owner if i < 5 else None)
+            for i in range(2000)
+        )
+        Educenters.courses.through.objects.bulk_create(
+            Educenters.courses.through(educenters=center, courses=course)
+            for center in centers for course in rng.sample(courses, 3)
+        )
+        Application.objects.bulk_create(
+            Application(owner=rng.choice(students), center=rng.choice(centers[:50]), course=rng.choice(courses), index=i)
+            for i in range(10_000)
+        )
+        cls.student = students[0]
+        call_command('rebuild_application_stats', stdout=io.StringIO())
+        call_command('rebuild_search_index', stdout=io.StringIO())
+        with connection.cursor() as cursor:
+            cursor.execute('ANALYZE')
+
+    def test_center_endpoints(self):
+        self.client.force_authenticate(self.owner)
+
+        self.assertIndexedPlans(reverse('educenters-list'))
+        self.assertIndexedPlans(reverse('educenters-detail', kwargs={'slug': 'center-3'}))
+        self.assertIndexedPlans(reverse('educenters-stats', kwargs={'slug': 'center-3'}))
+        self.assertIndexedPlans(reverse('applications-export'))
+
+    def test_search_only_sorts_the_matches(self):
+        ranking = ('USE TEMP B-TREE FOR ORDER BY', )
+
+        self.assertIndexedPlans(reverse('educenters-search'), {'q': 'center', 'cost_min': 200, 'cost_max': 300},
+                                allow=ranking)
+        self.assertIndexedPlans(reverse('educenters-search'), {'q': 'center', 'course': 'course-3'}, allow=ranking)
+
+    def test_nearby_reads_cell_ranges(self):
+        self.assertIndexedPlans(reverse('educenters-nearby'), {'lat': 41.31, 'lng': 69.28, 'radius': 5})
+
+    def test_course_endpoints(self):
+        self.assertIndexedPlans(reverse('courses-list'))
+        self.assertIndexedPlans(reverse('courses-list'), {'sort': 'popular'})
+        url = self.client.get(reverse('courses-list'), {'sort': 'popular', 'page_size': 5}).data['next']
+        self.assertIndexedPlans(url)
+        self.assertIndexedPlans(reverse('courses-detail', kwargs={'slug': 'course-3'}))
+
+    def test_applications_come_in_index_order(self):
+        self.client.force_authenticate(self.student)
+
+        self.assertIndexedPlans(reverse('applications-list'))
+        url = self.client.get(reverse('applications-list'), {'page_size': 5}).data['next']
+        self.assertIndexedPlans(url)
+
+    def test_centers_of_a_course_come_from_the_index(self):
+        sql, params = Educenters.objects.filter(courses__slug='course-3').values('id').query.sql_with_params()
+
+        self.assertIn('USING COVERING INDEX educenters_courses_course_center_idx', '\n'.join(self.query_plan(sql, params)))
+
+    def test_unindexed_filters_are_caught(self):
+        queryset = Educenters.objects.filter(info='Programming')
+        sql, params = queryset.query.sql_with_params()
+
+        self.assertTrue(self.plan_problems(sql, self.query_plan(sql, params)))
+
+    def test_limit_does_not_excuse_unindexed_filters(self):
+        for queryset in (
+            Educenters.objects.filter(info='Programming').order_by('-id')[:20],
+            Application.objects.filter(center__info='Programming').order_by('-id')[:20],
+        ):
+            sql, params = queryset.query.sql_with_params()
+            self.assertTrue(self.plan_problems(sql, self.query_plan(sql, params)), sql)
+
+        sql, params = Educenters.objects.order_by('-id')[:20].query.sql_with_params()
+        self.assertFalse(self.plan_problems(sql, self.query_plan(sql, params)))
+
+
+class RequestTimingTests(APITestBase):
+    def setUp(self):
+        super().setUp()
+        center = Educenters.objects.create(name='Coders hub')
+        center.courses.add(Courses.objects.create(title='Python'))
+        self.url = reverse('educenters-detail', kwargs={'slug': center.slug})
+
+    @override_settings(PERF_SAMPLE_RATE=1, PERF_SLOW_REQUEST_MS=10_000)
+    def test_timed_requests_get_server_timing(self):
+        self.client.force_authenticate(None)
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {AccessToken.for_user(self.user)}')
+
+        metrics = self.client.get(self.url)['Server-Timing'].split(', ')
+
+        self.assertEqual([metric.split(';')[0] for metric in metrics], ['db', 'auth', 'serialize', 'cache', 'total'])
+        self.assertIn('desc="3 queries"', metrics[0])  # user, center, courses
+        self.assertEqual(metrics[3], 'cache;desc="MISS"')
+
+    @override_settings(PERF_SAMPLE_RATE=1, PERF_SLOW_REQUEST_MS=0)
+    def test_slow_requests_are_logged_with_their_queries(self):
+        with self.assertLogs('config.timing', 'WARNING') as logs:
+            self.client.get(self.url)
+
+        record = json.loads(logs.records[0].getMessage())
+        self.assertEqual((record['method'], record['path'], record['status']), ('GET', self.url, 200))
+        self.assertEqual(record['queries'], 2)
+        self.assertTrue(any('learning_centers_educenters' in query['sql'] for query in record['slowest_queries']))
+
+    @override_settings(PERF_SAMPLE_RATE=0)
+    def test_unsampled_requests_are_not_timed(self):
+        self.assertNotIn('Server-Timing', self.client.get(self.url))
+
+
+
+@override_settings(SECURE_SSL_REDIRECT=False)
+class SchemaTests(SimpleTestCase):
+    def setUp(self):
+        openapi.clear()
+        self.addCleanup(openapi.clear)
+
+    def test_schema_is_built_once_and_revalidated_with_its_etag(self):
+        response = self.client.get(reverse('schema'))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['Content-Type'], 'application/vnd.oai.openapi')
+        self.assertTrue(response.content.startswith(b'openapi: 3.0.3'))
+        self.assertIs(openapi.get_document('yaml'), openapi.get_document('yaml'))
+
+        response = self.client.get(reverse('schema'), HTTP_IF_NONE_MATCH=response['ETag'])
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response.content, b'')
+
+    def test_gzip_and_json(self):
+        plain = self.client.get(reverse('schema'), {'format': 'json'})
+        zipped = self.client.get(reverse('schema'), HTTP_ACCEPT='application/json', HTTP_ACCEPT_ENCODING='gzip')
+
+        self.assertEqual(zipped['Content-Encoding'], 'gzip')
+        self.assertIn('Accept-Encoding', zipped['Vary'])
+        self.assertEqual(gzip.decompress(zipped.content), plain.content)
+        self.assertEqual(json.loads(plain.content)['info']['title'], 'lookedu API')
+
+        # each encoding has its own ETag, a client holding the identity bytes gets the gzip ones
+        self.assertEqual(zipped['ETag'], plain['ETag'][:-1] + '-gzip"')
+        for etag, status in ((zipped['ETag'], 304), (plain['ETag'], 200)):
+            response = self.client.get(reverse('schema'), HTTP_ACCEPT='application/json', HTTP_ACCEPT_ENCODING='gzip',
+                                       HTTP_IF_NONE_MATCH=etag)
+            self.assertEqual(response.status_code, status)
+            self.assertIn('Accept-Encoding', response['Vary'])
+
+    def test_refused_encodings_are_not_sent(self):
+        plain = self.client.get(reverse('schema'))
+        response = self.client.get(reverse('schema'), HTTP_ACCEPT_ENCODING='gzip;q=0, br;q=0')
+
+        self.assertNotIn('Content-Encoding', response)
+        self.assertEqual(response.content, plain.content)
+
+    def test_stored_file_is_served_as_is(self):
+        with tempfile.NamedTemporaryFile(suffix='.json') as f:
+            f.write(b'openapi: 3.0.3\ninfo:\n  title: Stored\n')
+            f.flush()
+            with override_settings(OPENAPI_SCHEMA_FILE=f.name):
+                self.assertEqual(self.client.get(reverse('schema')).content, b'openapi: 3.0.3\ninfo:\n  title: Stored\n')
+                self.assertEqual(self.client.get(reverse('schema'), {'format': 'json'}).json()['info']['title'], 'Stored')
+
+    def test_check_schema(self):
+        with GENERATOR_STATS.silence():
+            # the committed schema.json has to be regenerated along with API changes
+            call_command('check_schema', stdout=io.StringIO())
+
+            with tempfile.NamedTemporaryFile(suffix='.json') as f:
+                with self.assertRaisesMessage(CommandError, 'out of date'):
+                    call_command('check_schema', file=f.name, stdout=io.StringIO())
+                call_command('check_schema', file=f.name, write=True, stdout=io.StringIO())
+                call_command('check_schema', file=f.name, stdout=io.StringIO())
+
+
+class LeanBootTests(SimpleTestCase):
+    def test_lazy_view_is_imported_on_first_request(self):
+        view = lazy_view('django.views.generic.RedirectView', url='/api/educenters/')
+
+        response = view(RequestFactory().get('/'))
+
+        self.assertEqual((response.status_code, response.url), (302, '/api/educenters/'))
+
+    def test_admin_urls_are_built_on_first_use(self):
+        resolver = URLResolver(RegexPattern(r'^/'), [path('api/schema/', lazy_view('config.openapi.schema_view'), name='schema'),
+                                                     LazyAdminResolver('admin/')])
+        admin_resolver = resolver.url_patterns[1]
+
+        self.assertEqual(resolver.reverse('schema'), 'api/schema/')
+        self.assertNotIn('urlpatterns', vars(admin_resolver.urlconf_module))
+
+        self.assertEqual(resolver.resolve('/admin/').url_name, 'index')
+        self.assertEqual(resolver.namespace_dict['admin'][1].reverse('index'), '')
+
+    def test_profile_startup(self):
+        out = io.StringIO()
+        call_command('profile_startup', runs=1, json=True, stdout=out)
+
+        result = json.loads(out.getvalue())['current']
+        self.assertEqual(list(result['phases_ms']), ['settings', 'apps', 'middleware', 'first request'])
+        self.assertIn(['settings', 'django.conf'], [imported[:2] for imported in result['imports']])
+
+
+class NearbyTests(APITestBase):
+    TASHKENT = (41.3111, 69.2797)
+
+    def setUp(self):
+        super().setUp()
+        rng = random.Random(0)
+        lat, lng = self.TASHKENT
+        self.centers = [
+            Educenters.objects.create(name=f'Center {i}', latitude=lat + rng.uniform(-0.5, 0.5), longitude=lng + rng.uniform(-0.5, 0.5))
+            for i in range(90)
+        ]
+        Educenters.objects.create(name='Somewhere else', latitude=-33.86, longitude=151.2)  # Sydney
+        Educenters.objects.create(name='No location')
+
+    def distances(self, lat, lng):
+        return sorted(
+            (geo.distance_km(lat, lng, center.latitude, center.longitude), center.slug)
+            for center in Educenters.objects.exclude(latitude=None)
+        )
+
+    def test_geohash(self):
+        self.assertEqual(geo.encode(57.64911, 10.40744), 'u4pruydq')
+        self.assertEqual(geo.encode(-25.382708, -49.265506, precision=5), '6gkzw')
+        self.assertIsNone(geo.encode(None, 10))
+
+        center = self.centers[0]
+        self.assertEqual(center.geohash, geo.encode(center.latitude, center.longitude))
+        center.latitude, center.longitude = 57.64911, 10.40744
+        center.save(update_fields=['latitude', 'longitude'])
+        center.refresh_from_db()
+        self.assertEqual(center.geohash, 'u4pruydq')
+
+    def test_radius_matches_a_full_scan(self):
+        rng = random.Random(1)
+        for radius in (0.5, 3, 12, 40, 200):
+            lat, lng = self.TASHKENT[0] + rng.uniform(-0.3, 0.3), self.TASHKENT[1] + rng.uniform(-0.3, 0.3)
+            expected = [slug for distance, slug in self.distances(lat, lng) if distance <= radius]
+
+            rows = geo.within(Educenters.objects.all(), lat, lng, radius, fields=('slug', ))
+
+            self.assertEqual([row['slug'] for row in rows], expected)
+
+    def test_nearby_endpoint(self):
+        lat, lng = self.TASHKENT
+        expected = self.distances(lat, lng)
+
+        with self.assertNumQueries(1):
+            response = self.client.get(reverse('educenters-nearby'), {'lat': lat, 'lng': lng, 'radius': 15, 'limit': 5})
+        self.assertEqual([row['slug'] for row in response.data], [slug for distance, slug in expected[:5]])
+        self.assertLessEqual(expected[4][0], 15)
+        self.assertEqual(response.data[0]['distance_km'], round(expected[0][0], 3))
+        self.assertEqual(set(response.data[0]) - set(CentersListSerializer.Meta.fields), {'latitude', 'longitude', 'distance_km'})
+
+        # k nearest grows the radius until it holds k centers, here all the way to Sydney
+        response = self.client.get(reverse('educenters-nearby'), {'lat': lat, 'lng': lng, 'limit': 100})
+        self.assertEqual([row['slug'] for row in response.data], [slug for distance, slug in expected])
+
+        self.assertEqual(self.client.get(reverse('educenters-nearby'), {'lat': 91, 'lng': 0}).status_code, 400)
+
+    def test_location_is_set_in_pairs(self):
+        self.client.force_authenticate(CustomUser.objects.create_superuser(username='admin', password='pass12345', phone_number='+998900000009'))
+        url = reverse('educenters-detail', kwargs={'slug': self.centers[0].slug})
+
+        self.assertEqual(self.client.patch(url, {'latitude': 40.1}, format='json').status_code, 200)
+        self.assertEqual(self.client.patch(reverse('educenters-detail', kwargs={'slug': 'no-location'}), {'latitude': 40.1}, format='json').status_code, 400)
@@ -1,8 +1,13 @@
+from django.conf import settings
 from django.urls import path, include
 
 from rest_framework.routers import DefaultRouter
 
-from .views import CentersView, ApplicationsView, CoursesView
+from config.aio import serve_reads_async
+
+from . import async_views
+
+from .views import CentersView, ApplicationsView, CoursesView, ResponseCacheStatsView, ApplicationsExportView
 
 routers = DefaultRouter()
 
@@ -10,6 +15,18 @@ routers.register('educenters', CentersView, basename='educenters')
 routers.register('my-applications', ApplicationsView, basename='applications')
 routers.register('courses', CoursesView, basename='courses')
 
+router_urls = routers.urls
+if settings.ASYNC_READ_VIEWS:
+    router_urls = serve_reads_async(router_urls, {
+        'educenters-list': async_views.CentersListView.as_view(),
+        'educenters-detail': async_views.CentersRetrieveView.as_view(),
+        'courses-list': async_views.CoursesListView.as_view(),
+        'courses-detail': async_views.CoursesRetrieveView.as_view(),
+        'applications-list': async_views.ApplicationsListView.as_view(),
+    })
+
 urlpatterns = [
-    path('', include(routers.urls))
+    path('', include(router_urls)),
+    path('cache-stats/', ResponseCacheStatsView.as_view(), name='cache-stats'),
+    path('received-applications/export/', ApplicationsExportView.as_view(), name='applications-export'),
 ]
\ No newline at end of file
@@ -1,29 +1,74 @@
+from django.conf import settings
+from django.core.handlers.asgi import ASGIRequest
+from django.http import StreamingHttpResponse
 from django.shortcuts import render
+from django.utils import timezone
 
-from rest_framework import viewsets, permissions, parsers
+from rest_framework import viewsets, permissions, parsers, status
+from rest_framework.decorators import action
+from rest_framework.response import Response
+from rest_framework.views import APIView
 
+from drf_spectacular.types import OpenApiTypes
+from drf_spectacular.utils import extend_schema, extend_schema_view, OpenApiParameter
+
+from config.fieldsets import Fieldset, schema_parameters
+from config.throttling import UserBucketThrottle, IPBucketThrottle
+
+from . import geo
 from .models import Educenters, Application, Courses
-from .serializers import CentersListSerializer, CentersRetrieveSerializer, ApplicationsSerializer, CoursesSerializer
-from .permissions import IsOwnerOrAdmin, IsEduOwner, HaveARightToAdd
+from .serializers import (
+    CentersListSerializer, CentersFastListSerializer, CentersRetrieveSerializer, ApplicationsSerializer, CoursesDetailSerializer,
+    CentersSearchSerializer, CentersNearbyQuerySerializer, CentersNearbySerializer, ApplicationsBulkSerializer, ApplicationsBulkResultSerializer,
+    CenterStatsQuerySerializer, CenterStatsSerializer,
+)
+from .permissions import IsOwnerOrAdmin, IsEduOwner, HaveARightToAdd, IsCenterOwnerOrAdmin
+from .pagination import CentersPagination, ApplicationsPagination, CoursesPagination, SearchPagination
+from .search import CenterSearch
+from .caching import CachedReadMixin, get_stats
+from .stats import center_stats
+from .exports import (
+    received_applications, stream_csv, stream_ndjson, astream_csv, astream_ndjson, CSVRenderer, NDJSONRenderer,
+)
 
 # Create your views here.
 
 
-class CentersView(viewsets.ModelViewSet):
+@extend_schema_view(
+    list=extend_schema(parameters=schema_parameters(CentersListSerializer)),
+    retrieve=extend_schema(parameters=schema_parameters(CentersRetrieveSerializer)),
+)
+class CentersView(CachedReadMixin, viewsets.ModelViewSet):
     queryset = Educenters.objects.all()
+    cache_models = (Educenters, Courses)
     parser_classes = [parsers.MultiPartParser, parsers.FormParser, parsers.JSONParser]
+    pagination_class = CentersPagination
     lookup_field = 'slug'
 
     def get_serializer_class(self):
-        if self.action == 'list':
+        if self.action in ['list', 'search']:
             return CentersListSerializer
+        elif self.action == 'nearby':
+            return CentersNearbySerializer
         elif self.action == 'retrieve':
             return CentersRetrieveSerializer
         return CentersRetrieveSerializer
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        if self.action == 'list':
+            return queryset.values(*CentersFastListSerializer.VALUES)
+        if self.action == 'stats':
+            return queryset.only('id', 'slug', 'owner')
+        if self.action == 'retrieve' and not Fieldset.from_request(self.request).wants('courses'):
+            return queryset
+        return queryset.prefetch_related('courses')
     
     def get_permissions(self):
-        if self.action in ['list', 'retrieve']:
+        if self.action in ['list', 'retrieve', 'search', 'nearby']:
             permission_classes = [permissions.IsAuthenticated]
+        elif self.action == 'stats':
+            permission_classes = [permissions.IsAuthenticated, IsCenterOwnerOrAdmin]
         else:
             permission_classes = [permissions.IsAdminUser | IsEduOwner | HaveARightToAdd]
         return [permission() for permission in permission_classes]
@@ -31,22 +76,129 @@ class CentersView(viewsets.ModelViewSet):
     def perform_create(self, serializer):
         serializer.save(owner=self.request.user)
 
+    @extend_schema(parameters=[CentersSearchSerializer])
+    @action(detail=False, methods=['get'], pagination_class=SearchPagination)
+    def search(self, request):
+        params = CentersSearchSerializer(data=request.query_params)
+        params.is_valid(raise_exception=True)
+
+        filters = dict(params.validated_data)
+        page = self.paginate_queryset(CenterSearch(filters.pop('q'), **filters))
+        serializer = self.get_serializer(page, many=True)
+        return self.get_paginated_response(serializer.data)
+
+    @extend_schema(parameters=[CentersNearbyQuerySerializer], responses=CentersNearbySerializer(many=True))
+    @action(detail=False, methods=['get'], pagination_class=None)
+    def nearby(self, request):
+        """ Centers nearest to ``lat``/``lng``, the closest first, see geo.py. """
+        params = CentersNearbyQuerySerializer(data=request.query_params)
+        params.is_valid(raise_exception=True)
+
+        params = params.validated_data
+        rows = geo.nearby(
+            Educenters.objects.all(), params['lat'], params['lng'], params['limit'], params.get('radius'),
+            fields=CentersFastListSerializer.VALUES,
+        )
+        return Response(self.get_serializer(rows, many=True).data)
+
+    @extend_schema(parameters=[CenterStatsQuerySerializer], responses=CenterStatsSerializer)
+    @action(detail=True, methods=['get'])
+    def stats(self, request, slug=None):
+        params = CenterStatsQuerySerializer(data=request.query_params)
+        params.is_valid(raise_exception=True)
+
+        stats = center_stats(self.get_object(), params.validated_data['days'])
+        return Response(CenterStatsSerializer(stats).data)
+
 
+@extend_schema_view(
+    list=extend_schema(parameters=schema_parameters(ApplicationsSerializer)),
+    retrieve=extend_schema(parameters=schema_parameters(ApplicationsSerializer)),
+)
 class ApplicationsView(viewsets.ModelViewSet):
     queryset = Application.objects.all()
     serializer_class = ApplicationsSerializer
     permission_classes = [permissions.IsAuthenticated, IsOwnerOrAdmin]
+    pagination_class = ApplicationsPagination
     lookup_field = 'index'
+    throttle_scope = 'applications'
+
+    def get_throttles(self):
+        # reading your applications stays free, only creating them costs tokens
+        if self.action in ('create', 'bulk'):
+            return [UserBucketThrottle(), IPBucketThrottle()]
+        return super().get_throttles()
+
+    def get_throttle_cost(self, request):
+        # a bulk costs a token per application, oversized ones are rejected by the serializer anyway
+        if self.action != 'bulk' or not isinstance(request.data, dict):
+            return 1
+        applications = request.data.get('applications')
+        if isinstance(applications, list):
+            return max(1, min(len(applications), settings.APPLICATION_BULK_MAX_ITEMS))
+        return 1
 
     def perform_create(self, serializer):
         serializer.save(owner=self.request.user)
 
     def get_queryset(self):
-        return self.request.user.applies.all()
+        return ApplicationsSerializer.setup_eager_loading(self.request.user.applies.all(), Fieldset.from_request(self.request))
+
+    @extend_schema(responses={201: ApplicationsBulkResultSerializer, 400: ApplicationsBulkResultSerializer})
+    @action(detail=False, methods=['post'], serializer_class=ApplicationsBulkSerializer)
+    def bulk(self, request):
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+
+        results = serializer.save(owner=request.user)
+        created = sum(result['status'] == 'created' for result in results)
+        return Response(
+            {'created': created, 'failed': len(results) - created, 'results': results},
+            status=status.HTTP_201_CREATED if created else status.HTTP_400_BAD_REQUEST,
+        )
     
 
-class CoursesView(viewsets.ModelViewSet):
+@extend_schema_view(
+    list=extend_schema(parameters=[OpenApiParameter(
+        CoursesPagination.sort_query_param, str, enum=list(CoursesPagination.sorts),
+        description='popular: most applications first, centers: taught by the most centers first',
+    ), *schema_parameters(CoursesDetailSerializer)]),
+    retrieve=extend_schema(parameters=schema_parameters(CoursesDetailSerializer)),
+)
+class CoursesView(CachedReadMixin, viewsets.ModelViewSet):
     queryset = Courses.objects.all()
-    serializer_class = CoursesSerializer
+    cache_models = (Courses, Application)  # Application: applications_count
+    serializer_class = CoursesDetailSerializer
     permission_classes = [permissions.IsAuthenticated]
+    pagination_class = CoursesPagination
     lookup_field = 'slug'
+
+
+class ResponseCacheStatsView(APIView):
+    permission_classes = [permissions.IsAdminUser]
+
+    def get(self, request):
+        return Response(get_stats())
+
+
+class ApplicationsExportView(APIView):
+    """ Streams the applications received by the user's centers as CSV (default) or NDJSON. """
+    permission_classes = [permissions.IsAuthenticated]
+    renderer_classes = [CSVRenderer, NDJSONRenderer]
+    streams = {'csv': stream_csv, 'ndjson': stream_ndjson}
+    astreams = {'csv': astream_csv, 'ndjson': astream_ndjson}
+
+    @extend_schema(
+        parameters=[OpenApiParameter('center', str, description='Only the applications of this center (slug)')],
+        responses={(200, 'text/csv'): OpenApiTypes.STR, (200, 'application/x-ndjson'): OpenApiTypes.STR},
+    )
+    def get(self, request, format=None):
+        export_format = request.accepted_renderer.format
+        rows = received_applications(request.user, request.query_params.get('center'))
+        # under ASGI Django reads a sync iterator into a list before sending anything
+        streams = self.astreams if isinstance(request._request, ASGIRequest) else self.streams
+
+        response = StreamingHttpResponse(streams[export_format](rows), content_type=request.accepted_renderer.media_type)
+        filename = f'applications-{timezone.now():%Y%m%d}.{export_format}'
+        response['Content-Disposition'] = f'attachment; filename="{filename}"'
+        return response
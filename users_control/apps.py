@@ -1,5 +1,11 @@
 from django.apps import AppConfig
+from django.conf import settings
 
 
 class UsersControlConfig(AppConfig):
     name = 'users_control'
+
+    def ready(self):
+        from . import signals  # noqa: F401
+        if not settings.LEAN_BOOT:
+            from . import schema  # noqa: F401
@@ -0,0 +1,12 @@
+from rest_framework.response import Response
+
+from config.aio import AsyncAPIView
+
+from .serializers import UserShortSerializer
+
+# Async twin of MeView, routed in by urls.py when ASYNC_READ_VIEWS is on
+
+
+class MeView(AsyncAPIView):
+    async def get(self, request):
+        return Response(UserShortSerializer(request.user, context={'request': request}).data)
@@ -0,0 +1,137 @@
+from django.conf import settings
+from django.core.cache import caches
+from django.db import router
+from django.utils.translation import gettext_lazy as _
+
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.utils import get_md5_hash_password
+
+from config.aio import cache_call
+from config.timing import timed
+
+
+# What requests read from request.user. The password hash is never cached,
+# only the digest of it that tokens carry as their revocation claim
+USER_CACHE_FIELDS = (
+    'id', 'username', 'first_name', 'last_name', 'email', 'phone_number',
+    'is_active', 'is_staff', 'is_superuser', 'have_right_to_add', 'role_id',
+)
+
+
+def user_cache():
+    return caches[settings.AUTH_USER_CACHE_ALIAS]
+
+
+def user_cache_key(user_id):
+    # Not keyed by the token's revocation claim: it is the hash of the password
+    # the token was issued under, an entry keyed by the old one would outlive a
+    # password change and keep accepting the old tokens until it expires.
+    # Deleting the one entry per user revokes them at once.
+    return f'auth-user:{user_id}'
+
+
+def invalidate_users(user_ids):
+    user_cache().delete_many([user_cache_key(user_id) for user_id in user_ids])
+
+
+class CachedJWTAuthentication(JWTAuthentication):
+    """
+    simplejwt authentication that resolves the user and their role from the
+    cache instead of the database.
+
+    Entries live for ``AUTH_USER_CACHE_TIMEOUT`` seconds and are dropped by
+    the signals whenever the user or their role changes, so with a shared
+    cache backend most requests need no auth queries at all. The active and
+    revoked-token checks still run against the cached entry.
+
+    An entry holds ``USER_CACHE_FIELDS`` and the role, and the user is
+    rebuilt from it with the other fields deferred, like ``only()`` would:
+    reading them queries the database, saving writes the cached fields only.
+    """
+
+    def authenticate(self, request):
+        with timed('auth'):
+            return super().authenticate(request)
+
+    def get_user(self, validated_token):
+        user_id = self.get_user_id(validated_token)
+
+        key = user_cache_key(user_id)
+        entry = user_cache().get(key)
+        if entry is None:
+            try:
+                user = self.get_queryset().get(**{api_settings.USER_ID_FIELD: user_id})
+            except self.user_model.DoesNotExist as e:
+                raise AuthenticationFailed(_("User not found"), code="user_not_found") from e
+            entry = self.cache_entry(user)
+            user_cache().set(key, entry, settings.AUTH_USER_CACHE_TIMEOUT)
+
+        return self.check_user(entry, validated_token)
+
+    async def aauthenticate(self, request):
+        """ ``authenticate`` for async views, the user comes from the cache or the async ORM. """
+        with timed('auth'):
+            header = self.get_header(request)
+            if header is None:
+                return None
+
+            raw_token = self.get_raw_token(header)
+            if raw_token is None:
+                return None
+
+            validated_token = self.get_validated_token(raw_token)
+            return await self.aget_user(validated_token), validated_token
+
+    async def aget_user(self, validated_token):
+        user_id = self.get_user_id(validated_token)
+
+        key = user_cache_key(user_id)
+        entry = await cache_call(user_cache(), 'get', key)
+        if entry is None:
+            try:
+                user = await self.get_queryset().aget(**{api_settings.USER_ID_FIELD: user_id})
+            except self.user_model.DoesNotExist as e:
+                raise AuthenticationFailed(_("User not found"), code="user_not_found") from e
+            entry = self.cache_entry(user)
+            await cache_call(user_cache(), 'set', key, entry, settings.AUTH_USER_CACHE_TIMEOUT)
+
+        return self.check_user(entry, validated_token)
+
+    def get_user_id(self, validated_token):
+        try:
+            return validated_token[api_settings.USER_ID_CLAIM]
+        except KeyError as e:
+            raise InvalidToken(_("Token contained no recognizable user identification")) from e
+
+    def get_queryset(self):
+        return self.user_model.objects.select_related('role').only(*USER_CACHE_FIELDS, 'password', 'role__name')
+
+    def cache_entry(self, user):
+        return {
+            'user': {name: getattr(user, name) for name in USER_CACHE_FIELDS},
+            'role': (user.role.id, user.role.name) if user.role_id else None,
+            'revoke_claim': get_md5_hash_password(user.password),
+        }
+
+    def build_user(self, entry):
+        # the database saves go to, so that save() keeps to the loaded fields
+        db = router.db_for_write(self.user_model)
+        # from_db() takes the values in the model's field order
+        names = [field.attname for field in self.user_model._meta.concrete_fields if field.attname in entry['user']]
+        user = self.user_model.from_db(db, names, [entry['user'][name] for name in names])
+        if entry['role'] is not None:
+            role_model = self.user_model._meta.get_field('role').related_model
+            user.role = role_model.from_db(db, ['id', 'name'], list(entry['role']))
+        return user
+
+    def check_user(self, entry, validated_token):
+        if api_settings.CHECK_USER_IS_ACTIVE and not entry['user']['is_active']:
+            raise AuthenticationFailed(_("User is inactive"), code="user_inactive")
+
+        if api_settings.CHECK_REVOKE_TOKEN:
+            if validated_token.get(api_settings.REVOKE_TOKEN_CLAIM) != entry['revoke_claim']:
+                raise AuthenticationFailed(_("The user's password has been changed."), code="password_changed")
+
+        return self.build_user(entry)
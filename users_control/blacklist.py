@@ -0,0 +1,104 @@
+import hashlib
+import math
+import threading
+
+from django.conf import settings
+from django.core.cache import caches
+
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.token_blacklist.models import BlacklistedToken
+from rest_framework_simplejwt.tokens import RefreshToken
+from rest_framework_simplejwt.utils import aware_utcnow
+
+
+class BloomFilter:
+    """ Fixed-size Bloom filter over strings: no false negatives, ``error_rate`` false positives. """
+
+    def __init__(self, capacity, error_rate=0.001):
+        self.capacity = max(capacity, 1)
+        self.size = max(64, int(-self.capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.hashes = max(1, round(self.size / self.capacity * math.log(2)))
+        self.bits = bytearray((self.size + 7) // 8)
+        self.count = 0
+
+    def _positions(self, item):
+        digest = hashlib.blake2b(item.encode(), digest_size=16).digest()
+        first, second = int.from_bytes(digest[:8], 'little'), int.from_bytes(digest[8:], 'little') | 1
+        return [(first + i * second) % self.size for i in range(self.hashes)]
+
+    def add(self, item):
+        for position in self._positions(item):
+            self.bits[position >> 3] |= 1 << (position & 7)
+        self.count += 1
+
+    def __contains__(self, item):
+        return all(self.bits[position >> 3] & (1 << (position & 7)) for position in self._positions(item))
+
+
+class TokenBlacklist:
+    """
+    Negative cache in front of simplejwt's ``BlacklistedToken`` table.
+
+    Each process builds a Bloom filter of the unexpired blacklisted JTIs on
+    first use. Tokens blacklisted afterwards are added to it and marked in
+    the ``TOKEN_BLACKLIST_CACHE_ALIAS`` cache until they expire, which is
+    how other workers learn about them, so the cache has to be shared
+    between workers for ``TOKEN_BLACKLIST_FAST_CHECK`` to be safe.
+    ``might_contain`` never misses a blacklisted token; a hit still has to
+    be confirmed against the database.
+    """
+
+    def __init__(self):
+        self._filter = None
+        self._lock = threading.Lock()
+
+    def cache_key(self, jti):
+        return f'token-blacklist:{jti}'
+
+    def load(self):
+        jtis = list(
+            BlacklistedToken.objects.filter(token__expires_at__gt=aware_utcnow())
+            .values_list('token__jti', flat=True).iterator()
+        )
+        bloom = BloomFilter(2 * len(jtis) + 10_000)
+        for jti in jtis:
+            bloom.add(jti)
+        self._filter = bloom
+
+    def add(self, jti, expires_at):
+        with self._lock:
+            if self._filter is not None:
+                if self._filter.count >= self._filter.capacity:
+                    self._filter = None  # full, rebuilt bigger on the next check
+                else:
+                    self._filter.add(jti)
+
+        timeout = (expires_at - aware_utcnow()).total_seconds()
+        if timeout > 0:
+            caches[settings.TOKEN_BLACKLIST_CACHE_ALIAS].set(self.cache_key(jti), True, math.ceil(timeout))
+
+    def might_contain(self, jti):
+        if not settings.TOKEN_BLACKLIST_FAST_CHECK:
+            return True
+
+        with self._lock:
+            if self._filter is None:
+                self.load()
+            if jti in self._filter:
+                return True
+        return caches[settings.TOKEN_BLACKLIST_CACHE_ALIAS].get(self.cache_key(jti)) is not None
+
+    def reset(self):
+        with self._lock:
+            self._filter = None
+
+
+token_blacklist = TokenBlacklist()
+
+
+class FastRefreshToken(RefreshToken):
+    """ RefreshToken that only asks the database about JTIs the blacklist filter can't rule out. """
+
+    def check_blacklist(self):
+        if token_blacklist.might_contain(self.payload[api_settings.JTI_CLAIM]):
+            super().check_blacklist()
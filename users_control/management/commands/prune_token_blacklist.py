@@ -0,0 +1,47 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from rest_framework_simplejwt.token_blacklist.models import OutstandingToken, BlacklistedToken
+from rest_framework_simplejwt.utils import aware_utcnow
+
+
+class Command(BaseCommand):
+    help = (
+        'Deletes expired outstanding refresh tokens and their blacklist rows in small batches, '
+        'each in its own short transaction'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=1000)
+        parser.add_argument('--pause', type=float, default=0, help='Seconds to sleep between batches')
+
+    def handle(self, *args, **options):
+        now = aware_utcnow()
+        batch_size = options['batch_size']
+        self.stdout.write(
+            f'Before: {OutstandingToken.objects.count()} outstanding, {BlacklistedToken.objects.count()} blacklisted'
+        )
+
+        # Tokens expire in roughly the order they were issued, so walking the
+        # primary key finds the expired ones first without an expires_at index
+        last_id, deleted = 0, 0
+        while True:
+            ids = list(
+                OutstandingToken.objects.filter(id__gt=last_id, expires_at__lte=now)
+                .order_by('id').values_list('id', flat=True)[:batch_size]
+            )
+            if not ids:
+                break
+            with transaction.atomic():
+                BlacklistedToken.objects.filter(token_id__in=ids).delete()
+                deleted += OutstandingToken.objects.filter(id__in=ids).delete()[0]
+            last_id = ids[-1]
+            if options['pause']:
+                time.sleep(options['pause'])
+
+        self.stdout.write(self.style.SUCCESS(
+            f'Deleted {deleted} expired tokens. After: {OutstandingToken.objects.count()} outstanding, '
+            f'{BlacklistedToken.objects.count()} blacklisted'
+        ))
@@ -0,0 +1,44 @@
+# Generated by Django 5.2.11 on 2026-10-18 11:32
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users_control', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Roles',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(choices=[('admin', 'admin'), ('user', 'user'), ('edu_owner', 'edu_owner')], max_length=50)),
+            ],
+            options={
+                'verbose_name': 'Role',
+                'verbose_name_plural': 'Roles',
+            },
+        ),
+        migrations.AlterModelOptions(
+            name='customuser',
+            options={'verbose_name': 'User', 'verbose_name_plural': 'Users'},
+        ),
+        migrations.AddField(
+            model_name='customuser',
+            name='have_right_to_add',
+            field=models.BooleanField(default=False),
+        ),
+        migrations.AlterField(
+            model_name='customuser',
+            name='phone_number',
+            field=models.CharField(max_length=20, unique=True),
+        ),
+        migrations.AddField(
+            model_name='customuser',
+            name='role',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, to='users_control.roles'),
+        ),
+    ]
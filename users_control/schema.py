@@ -0,0 +1,42 @@
+from drf_spectacular.contrib.rest_framework_simplejwt import SimpleJWTScheme, TokenRefreshSerializerExtension
+from drf_spectacular.extensions import OpenApiSerializerExtension
+
+
+class CachedJWTScheme(SimpleJWTScheme):
+    target_class = 'users_control.authentication.CachedJWTAuthentication'
+
+
+class FastTokenRefreshSerializerExtension(TokenRefreshSerializerExtension):
+    target_class = 'users_control.serializers.TokenRefreshSerializer'
+
+
+class FieldsetSerializerExtension(OpenApiSerializerExtension):
+    """ Documents every ``Meta.expandable_fields`` relation as its id or, with ``?expand=``, the embedded object. """
+    target_class = 'config.fieldsets.FieldsetMixin'
+    match_subclasses = True
+
+    def map_serializer(self, auto_schema, direction):
+        schema = auto_schema._map_basic_serializer(self.target, direction)
+        # getdoc() would hand serializers without a docstring the mixin's
+        if not type(self.target).__doc__:
+            schema.pop('description', None)
+
+        properties = schema['properties']
+        for name, (serializer_class, kwargs) in getattr(self.target.Meta, 'expandable_fields', {}).items():
+            if name not in properties:
+                continue
+            ref = auto_schema.resolve_serializer(serializer_class, direction).ref
+            if kwargs.get('many'):
+                properties[name]['items'] = {'oneOf': [properties[name]['items'], ref]}
+            else:
+                field = properties[name]
+                properties[name] = {
+                    'oneOf': [{'type': field.pop('type')}, ref],
+                    **{key: value for key, value in field.items() if key in ('readOnly', 'nullable')},
+                }
+        return schema
+
+
+def load_extensions(endpoints, **kwargs):
+    """ Preprocessing hook of the lean boot mode, importing this module is what registers the extensions. """
+    return endpoints
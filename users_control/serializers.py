@@ -1,8 +1,13 @@
 from rest_framework import serializers
-from rest_framework_simplejwt.tokens import RefreshToken, TokenError
+from rest_framework_simplejwt import serializers as jwt_serializers
+from rest_framework_simplejwt.tokens import TokenError
 
 from django.contrib.auth import get_user_model
 
+from config.fieldsets import FieldsetMixin
+from config.timing import TimedSerializerMixin
+
+from .blacklist import FastRefreshToken
 from .models import CustomUser
 
 
@@ -41,17 +46,21 @@ class UserLogOutSerializer(serializers.Serializer):
 
     def validate_refresh(self, value):
         try:
-            RefreshToken(value)
+            FastRefreshToken(value)
         except TokenError:
-            return serializers.ValidationError("Invalid refresh token")
+            raise serializers.ValidationError("Invalid refresh token")
         return value
     
     def save(self, **kwargs):
-        token = RefreshToken(self.validated_data["refresh"])
+        token = FastRefreshToken(self.validated_data["refresh"])
         token.blacklist()
 
 
-class UserShortSerializer(serializers.ModelSerializer):
+class TokenRefreshSerializer(jwt_serializers.TokenRefreshSerializer):
+    token_class = FastRefreshToken
+
+
+class UserShortSerializer(FieldsetMixin, TimedSerializerMixin, serializers.ModelSerializer):
     class Meta:
         model = User
         fields = ('username', 'first_name', 'last_name', 'phone_number', 'email', 'have_right_to_add')
\ No newline at end of file
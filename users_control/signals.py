@@ -0,0 +1,30 @@
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+
+from rest_framework_simplejwt.token_blacklist.models import BlacklistedToken
+
+from .authentication import invalidate_users
+from .blacklist import token_blacklist
+from .models import CustomUser, Roles
+
+
+""" Cached JWT users """
+
+@receiver(post_save, sender=CustomUser)
+@receiver(post_delete, sender=CustomUser)
+def invalidate_cached_user(sender, instance, **kwargs):
+    invalidate_users([instance.pk])
+
+
+@receiver(post_save, sender=Roles)
+@receiver(post_delete, sender=Roles)
+def invalidate_cached_role_users(sender, instance, **kwargs):
+    invalidate_users(CustomUser.objects.filter(role_id=instance.pk).values_list('id', flat=True))
+
+
+""" Refresh token blacklist filter """
+
+@receiver(post_save, sender=BlacklistedToken)
+def add_to_blacklist_filter(sender, instance, created, **kwargs):
+    if created:
+        token_blacklist.add(instance.token.jti, instance.token.expires_at)
@@ -1,3 +1,199 @@
-from django.test import TestCase
+import io
+import json
+from datetime import timedelta
+from unittest import mock
+
+from asgiref.sync import async_to_sync
+from django.conf import settings
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import connection
+from django.test import SimpleTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from rest_framework.test import APITestCase, APIRequestFactory
+from rest_framework_simplejwt.settings import api_settings as jwt_settings
+from rest_framework_simplejwt.token_blacklist.models import OutstandingToken, BlacklistedToken
+from rest_framework_simplejwt.tokens import AccessToken, RefreshToken
+from rest_framework_simplejwt.utils import aware_utcnow, get_md5_hash_password
+
+from config import throttling
+
+from . import async_views, authentication
+from .blacklist import BloomFilter, token_blacklist
+from .models import CustomUser, Roles
 
 # Create your tests here.
+
+
+@override_settings(SECURE_SSL_REDIRECT=False)
+class JWTTestBase(APITestCase):
+    def setUp(self):
+        cache.clear()
+        throttling.reset()
+        self.role = Roles.objects.create(name='edu_owner')
+        self.user = CustomUser.objects.create_user(
+            username='owner', password='pass12345', phone_number='+998900000001', role=self.role
+        )
+        self.refresh = RefreshToken.for_user(self.user)
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {self.refresh.access_token}')
+
+
+class CachedJWTAuthenticationTests(JWTTestBase):
+    def test_user_and_role_come_from_the_cache(self):
+        with self.assertNumQueries(1):
+            self.client.get(reverse('me'))
+
+        with self.assertNumQueries(0):
+            response = self.client.get(reverse('me'))
+            response.wsgi_request.user.role.name
+
+        self.assertEqual(response.data['username'], 'owner')
+
+    def test_password_is_not_cached(self):
+        user = self.client.get(reverse('me')).wsgi_request.user
+
+        entry = authentication.user_cache().get(authentication.user_cache_key(self.user.id))
+        self.assertNotIn(self.user.password, repr(entry))
+        self.assertEqual(user.get_deferred_fields(), {'password', 'last_login', 'date_joined'})
+
+        user.first_name = 'Renamed'
+        user.save()
+        self.user.refresh_from_db()
+        self.assertEqual(self.user.first_name, 'Renamed')
+        self.assertTrue(self.user.check_password('pass12345'))
+
+    def test_user_changes_invalidate(self):
+        self.client.get(reverse('me'))
+
+        self.user.is_active = False
+        self.user.save()
+
+        self.assertEqual(self.client.get(reverse('me')).status_code, 401)
+
+    def test_password_change_revokes_tokens_of_the_cached_user(self):
+        access = AccessToken.for_user(self.user)
+        access[jwt_settings.REVOKE_TOKEN_CLAIM] = get_md5_hash_password(self.user.password)
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {access}')
+
+        with mock.patch.object(authentication.api_settings, 'CHECK_REVOKE_TOKEN', True):
+            self.assertEqual(self.client.get(reverse('me')).status_code, 200)
+            self.user.set_password('changed123')
+            self.user.save()
+
+            self.assertEqual(self.client.get(reverse('me')).status_code, 401)
+
+    def test_role_changes_invalidate(self):
+        self.client.get(reverse('me'))
+
+        self.role.name = 'user'
+        self.role.save()
+
+        response = self.client.get(reverse('me'))
+        self.assertEqual(response.wsgi_request.user.role.name, 'user')
+
+    def test_async_me_shares_the_user_cache(self):
+        expected = self.client.get(reverse('me')).json()
+        request = APIRequestFactory().get(reverse('me'), HTTP_AUTHORIZATION=f'Bearer {self.refresh.access_token}')
+
+        with self.assertNumQueries(0):
+            response = async_to_sync(async_views.MeView.as_view())(request)
+
+        self.assertEqual(json.loads(response.content), expected)
+
+
+class BloomFilterTests(SimpleTestCase):
+    def test_no_false_negatives_and_few_false_positives(self):
+        bloom = BloomFilter(1000, error_rate=0.01)
+        for i in range(1000):
+            bloom.add(f'jti-{i}')
+
+        self.assertTrue(all(f'jti-{i}' in bloom for i in range(1000)))
+        false_positives = sum(f'other-{i}' in bloom for i in range(10_000))
+        self.assertLess(false_positives, 300)
+
+
+@override_settings(TOKEN_BLACKLIST_FAST_CHECK=True)
+class TokenBlacklistTests(JWTTestBase):
+    def setUp(self):
+        super().setUp()
+        token_blacklist.reset()
+
+    def refresh_token(self, token):
+        return self.client.post('/api/token/refresh/', {'refresh': str(token)})
+
+    def test_fresh_token_skips_the_blacklist_query(self):
+        token_blacklist.might_contain('warm-up')  # builds the filter
+
+        with CaptureQueriesContext(connection) as ctx:
+            self.assertEqual(self.refresh_token(self.refresh).status_code, 200)
+
+        membership_checks = [
+            query['sql'] for query in ctx.captured_queries
+            if query['sql'].startswith('SELECT 1 AS "a" FROM "token_blacklist_blacklistedtoken"')
+        ]
+        self.assertEqual(membership_checks, [])
+
+    def test_rotated_token_is_rejected(self):
+        self.assertEqual(self.refresh_token(self.refresh).status_code, 200)
+
+        self.assertEqual(self.refresh_token(self.refresh).status_code, 401)
+
+    def test_filter_is_built_from_existing_rows(self):
+        self.refresh.blacklist()
+        token_blacklist.reset()
+        cache.clear()
+
+        self.assertEqual(self.refresh_token(self.refresh).status_code, 401)
+
+    def test_logged_out_token_is_rejected(self):
+        response = self.client.post('/user/logout/', {'refresh': str(self.refresh)})
+        self.assertEqual(response.status_code, 205)
+
+        self.assertEqual(self.refresh_token(self.refresh).status_code, 401)
+        self.assertEqual(self.client.post('/user/logout/', {'refresh': str(self.refresh)}).status_code, 400)
+
+
+class PruneTokenBlacklistTests(JWTTestBase):
+    def test_only_expired_tokens_are_deleted(self):
+        expired = OutstandingToken.objects.bulk_create(
+            OutstandingToken(jti=f'old-{i}', token='', expires_at=aware_utcnow() - timedelta(days=1))
+            for i in range(5)
+        )
+        BlacklistedToken.objects.bulk_create(BlacklistedToken(token=token) for token in expired[:3])
+        self.refresh.blacklist()
+
+        call_command('prune_token_blacklist', batch_size=2, stdout=io.StringIO())
+
+        self.assertEqual(list(OutstandingToken.objects.values_list('jti', flat=True)), [self.refresh['jti']])
+        self.assertEqual(BlacklistedToken.objects.count(), 1)
+
+
+class MeTests(JWTTestBase):
+    def test_sparse_fields(self):
+        response = self.client.get(reverse('me'), {'fields': 'username,email'})
+
+        self.assertEqual(response.data, {'username': 'owner', 'email': ''})
+
+
+@override_settings(REST_FRAMEWORK={
+    **settings.REST_FRAMEWORK, 'DEFAULT_THROTTLE_RATES': {'login_ip': '2/min', 'register_ip': '1/min'},
+})
+class ThrottlingTests(JWTTestBase):
+    def login(self, **extra):
+        return self.client.post(reverse('token_obtain_pair'), {'username': 'owner', 'password': 'wrong'}, **extra)
+
+    def test_login_is_throttled_per_address(self):
+        self.assertEqual([self.login().status_code for _ in range(3)], [401, 401, 429])
+        self.assertIn(int(self.login()['Retry-After']), range(1, 31))  # one of 2 tokens per minute
+        self.assertEqual(self.login(REMOTE_ADDR='10.0.0.2').status_code, 401)
+
+    def test_forwarded_for_is_not_trusted_without_proxies(self):
+        self.login(), self.login()
+
+        self.assertEqual(self.login(HTTP_X_FORWARDED_FOR='10.0.0.3').status_code, 429)
+
+    def test_registration_is_throttled_per_address(self):
+        self.assertEqual(self.client.post('/user/register/', {}).status_code, 400)
+        self.assertEqual(self.client.post('/user/register/', {}).status_code, 429)
@@ -1,5 +1,9 @@
+from django.conf import settings
 from django.urls import path
 
+from config.aio import serve_reads_async
+
+from . import async_views
 from .views import UserRegistrationView,  UserLogOutView, MeView
 
 urlpatterns = [
@@ -8,3 +12,5 @@ urlpatterns = [
     path('api/me/', MeView.as_view(), name='me'),
 ]
 
+if settings.ASYNC_READ_VIEWS:
+    urlpatterns = serve_reads_async(urlpatterns, {'me': async_views.MeView.as_view()})
@@ -6,6 +6,11 @@ from rest_framework import status, permissions
 
 from rest_framework_simplejwt.views import TokenObtainPairView
 
+from drf_spectacular.utils import extend_schema
+
+from config.fieldsets import schema_parameters
+from config.throttling import IPBucketThrottle
+
 from .serializers import UserRegistrationSerializer, UserLogOutSerializer, UserShortSerializer
 # Create your views here.
 
@@ -22,8 +27,15 @@ from .serializers import UserRegistrationSerializer, UserLogOutSerializer, UserS
 #             return Response({"detail": "Internal Server Error"}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
 
+class ThrottledTokenObtainPairView(TokenObtainPairView):
+    throttle_classes = [IPBucketThrottle]
+    throttle_scope = 'login'
+
+
 class UserRegistrationView(APIView):
     permission_classes = []
+    throttle_classes = [IPBucketThrottle]
+    throttle_scope = 'register'
 
     def post(self, request):
         serializer = UserRegistrationSerializer(data=request.data)
@@ -52,8 +64,9 @@ class UserLogOutView(APIView):
 class MeView(APIView):
     permission_classes = [permissions.IsAuthenticated]
 
+    @extend_schema(parameters=schema_parameters(UserShortSerializer), responses=UserShortSerializer)
     def get(self, request):
-        serializer = UserShortSerializer(request.user)
+        serializer = UserShortSerializer(request.user, context={'request': request})
         return Response(serializer.data)
 
 